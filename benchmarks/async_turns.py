@@ -0,0 +1,124 @@
+"""
+Async bot runtime: cost of a computational turn through handle_async
+against handle, and throughput of 1000 turns that each wait on a simulated
+10 ms I/O primitive, run sequentially and concurrently in one event loop.
+The concurrent turns await the primitive as a coroutine, and as a blocking
+function in the event loop's default executor and in a 100 thread one.
+
+Usage:
+    python benchmarks/async_turns.py
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botlang import BotlangSystem
+from botlang.evaluation.values import AsyncPrimitive
+from botlang.examples.example_bots import ExampleBots
+
+
+IO_DELAY = 0.01
+
+LOOKUP_BOT = """
+[define lookup-node
+    (bot-node (data message)
+        (node-result data (append "found: " (slow-lookup message)) lookup-node)
+    )
+]
+lookup-node
+"""
+
+
+def io_system(blocking=False):
+
+    async def slow_lookup(key):
+        await asyncio.sleep(IO_DELAY)
+        return key
+
+    def blocking_lookup(key):
+        time.sleep(IO_DELAY)
+        return key
+
+    system = BotlangSystem.bot_instance()
+    system.environment.update({
+        'slow-lookup': AsyncPrimitive(
+            blocking_lookup,
+            system.environment,
+            coroutine_function=None if blocking else slow_lookup
+        )
+    })
+    return system
+
+
+def computational_turns(repetitions=2000):
+
+    compiled_bot = BotlangSystem.bot_instance().compile_bot(
+        ExampleBots.bank_bot_code
+    )
+    first = compiled_bot.handle('hola')
+    turn = ('tengo una emergencia', first.next_node, first.data)
+
+    start = time.time()
+    for _ in range(repetitions):
+        compiled_bot.handle(*turn)
+    sync_seconds = time.time() - start
+
+    async def async_turns():
+        for _ in range(repetitions):
+            await compiled_bot.handle_async(*turn)
+
+    start = time.time()
+    asyncio.run(async_turns())
+    async_seconds = time.time() - start
+    return [
+        ('handle', sync_seconds * 1000 / repetitions),
+        ('handle_async', async_seconds * 1000 / repetitions)
+    ]
+
+
+def io_turns(turns=1000):
+
+    system = io_system()
+    compiled_bot = system.compile_bot(LOOKUP_BOT)
+
+    start = time.time()
+    for index in range(turns // 10):
+        compiled_bot.handle(str(index))
+    sequential_seconds = (time.time() - start) * 10
+
+    blocking_bot = io_system(blocking=True).compile_bot(LOOKUP_BOT)
+    executor = ThreadPoolExecutor(100)
+
+    def concurrent_throughput(bot, executor=None):
+
+        async def concurrent_turns():
+            await asyncio.gather(*[
+                bot.handle_async(str(index), executor=executor)
+                for index in range(turns)
+            ])
+
+        start = time.time()
+        asyncio.run(concurrent_turns())
+        return turns / (time.time() - start)
+
+    try:
+        return [
+            ('sequential', turns / sequential_seconds),
+            ('concurrent', concurrent_throughput(compiled_bot)),
+            ('default pool', concurrent_throughput(blocking_bot)),
+            ('100 threads', concurrent_throughput(blocking_bot, executor))
+        ]
+    finally:
+        executor.shutdown()
+
+
+def main():
+
+    for label, milliseconds in computational_turns():
+        print('{0:<14} {1:>10.3f} ms/turn'.format(label, milliseconds))
+    for label, throughput in io_turns():
+        print('{0:<14} {1:>10.0f} turns/s'.format(label, throughput))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Throughput of a batch of 500 turns spread over a few bots: one eval_bot
+call per message against a single eval_bot_batch call.
+
+Usage:
+    python benchmarks/batch_turns.py
+"""
+import time
+
+from botlang import BotlangSystem
+from botlang.examples.example_bots import ExampleBots
+
+
+ECHO_BOT = """
+[define echo-node
+    (bot-node (data message)
+        (node-result
+            (put data "turns" (+ 1 (get-or-nil data "turns")))
+            (append "echo: " message)
+            echo-node
+        )
+    )
+]
+[define start-node
+    (bot-node (data message)
+        (node-result (put data "turns" 1) "hi" echo-node)
+    )
+]
+start-node
+"""
+
+
+def batch(system, size=500):
+
+    first = system.eval_bot(ExampleBots.bank_bot_code, 'hola')
+    turns = []
+    for index in range(size):
+        if index % 3 == 0:
+            turns.append((
+                ExampleBots.bank_bot_code,
+                'tengo una emergencia',
+                first.next_node,
+                first.data
+            ))
+        else:
+            turns.append((
+                ECHO_BOT,
+                'message {0}'.format(index),
+                'echo-node',
+                {'turns': index}
+            ))
+    return turns
+
+
+def main():
+
+    system = BotlangSystem.bot_instance()
+    turns = batch(system)
+    system.eval_bot_batch(turns[:2])
+
+    start = time.time()
+    for turn in turns:
+        system.eval_bot(*turn)
+    loop_seconds = time.time() - start
+
+    start = time.time()
+    results = system.eval_bot_batch(turns)
+    batch_seconds = time.time() - start
+    assert not any(isinstance(result, Exception) for result in results)
+
+    for label, seconds in [
+        ('eval_bot loop', loop_seconds),
+        ('eval_bot_batch', batch_seconds)
+    ]:
+        print('{0:<16} {1:>10.1f} ms {2:>10.0f} turns/s'.format(
+            label,
+            seconds * 1000,
+            len(turns) / seconds
+        ))
+
+
+if __name__ == '__main__':
+    main()
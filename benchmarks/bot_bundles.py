@@ -0,0 +1,81 @@
+"""
+Size and cold load time of linked bot bundles, against compiling the bot
+with a module resolver that loads the bot helpers from disk.
+
+Usage:
+    python benchmarks/bot_bundles.py
+"""
+import time
+
+from botlang import BotlangSystem
+from botlang.modules.cache import ModuleCache
+from botlang.modules.resolver import ModuleResolver
+from botlang.parser import Parser
+from botlang.runtime_image import RuntimeImage
+
+
+BOTS = {
+    'validate-rut': """
+    (require "bot-helpers")
+    (bot-node (data)
+        (node-result
+            data
+            (if (validate-rut (input-message)) "valid" "invalid")
+            end-node
+        )
+    )
+    """,
+    'format-options': """
+    (require "bot-helpers")
+    (bot-node (data)
+        (node-result
+            data
+            (format-options data "Pick one" (list (option "a" "A" "n")))
+            end-node
+        )
+    )
+    """
+}
+
+
+def resolver_load(bot_code):
+
+    module_resolver = ModuleResolver(BotlangSystem.base_environment())
+    module_resolver.load_modules(RuntimeImage.bot_helpers_path())
+    BotlangSystem(module_resolver=module_resolver).compile_bot(bot_code)
+
+
+def cold_milliseconds(function, repetitions=20):
+
+    total = 0
+    for _ in range(repetitions):
+        Parser.asts_cache.clear()
+        ModuleCache.get().clear()
+        start = time.time()
+        function()
+        total += time.time() - start
+    return total * 1000 / repetitions
+
+
+def main():
+
+    print('{0:<16} {1:>12} {2:>12} {3:>12} {4:>12}'.format(
+        'bot', 'modules (B)', 'bundle (B)', 'resolver', 'bundle'
+    ))
+    for bot_name, bot_code in BOTS.items():
+        bundle = BotlangSystem.bot_instance().link_bot(bot_code)
+        report = bundle.report()
+        source_size = sum(
+            module['source_size'] for module in report['modules'].values()
+        ) + len(bot_code)
+        print('{0:<16} {1:>12} {2:>12} {3:>9.2f} ms {4:>9.2f} ms'.format(
+            bot_name,
+            source_size,
+            report['size'],
+            cold_milliseconds(lambda: resolver_load(bot_code)),
+            cold_milliseconds(bundle.load)
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Function call overhead on primitive-heavy code.
+
+Usage:
+    python benchmarks/call_protocol.py
+"""
+import timeit
+
+from botlang import BotlangSystem
+from botlang.evaluation.call_sites import CallSiteProfiler
+from botlang.examples.example_bots import ExampleBots
+
+
+ARITHMETIC_CODE = """
+(sum
+    (map
+        (function (n) (+ (* n n) (+ (mod n 7) (abs (- n 500)))))
+        (filter (function (n) (> n 10)) numbers)
+    )
+)
+"""
+
+CLOSEST_ATM_CODE = '(closest-atm -33.4245626 -70.5645574)'
+
+
+def bench(label, function, repetitions):
+
+    seconds = min(timeit.repeat(function, number=repetitions, repeat=5))
+    print('{0:<32} {1:>10.3f} ms/call'.format(
+        label,
+        seconds * 1000 / repetitions
+    ))
+
+
+def main():
+
+    system = BotlangSystem.bot_instance()
+    system.environment.update({'numbers': list(range(1000))})
+    system.eval(ExampleBots.bank_bot_code)
+
+    bench('arithmetic over 1000 numbers', lambda: system.eval(
+        ARITHMETIC_CODE
+    ), 50)
+    bench('closest-atm (bank bot)', lambda: system.eval(
+        CLOSEST_ATM_CODE
+    ), 50)
+
+    report = CallSiteProfiler.report(
+        system.parse(ExampleBots.bank_bot_code, None)
+    )
+    print('bank bot inline cache hit rate: {0:.1%}'.format(
+        report['hit_rate']
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Size and encode/decode time of conversation states with BotlangCodec,
+json and pickle. json loses OrderedDict and Nil, so it gets a default
+function that writes Nil as null.
+
+Usage:
+    python benchmarks/codec.py
+"""
+import json
+import pickle
+import time
+import zlib
+from collections import OrderedDict
+
+from botlang import BotlangSystem
+from botlang.evaluation.codec import BotlangCodec
+from botlang.evaluation.values import Nil
+from botlang.examples.example_bots import ExampleBots
+
+
+def bank_bot_state():
+
+    system = BotlangSystem.bot_instance()
+    first = system.eval_bot(ExampleBots.bank_bot_code, 'hola')
+    return system.eval_bot(
+        ExampleBots.bank_bot_code,
+        'tengo una emergencia',
+        first.next_node,
+        first.data
+    ).data
+
+
+def long_conversation_state(turns=60):
+
+    return OrderedDict([
+        ('user', OrderedDict([
+            ('id', 'U-1029384756'),
+            ('name', 'María José Fernández'),
+            ('social_network', 'facebook'),
+            ('language', 'es')
+        ])),
+        ('nodes-path', ['MENU', 'CUENTAS', 'SALDO', 'MENU', 'TARJETAS']),
+        ('ticket-open-time', 1476285917.250182),
+        ('pending-confirmation', Nil),
+        ('history', [
+            OrderedDict([
+                ('turn', turn),
+                ('message', 'mensaje del usuario número {0}'.format(turn)),
+                ('node', 'node-{0}'.format(turn % 7)),
+                ('intent', ['saldo', 'tarjetas', 'emergencia'][turn % 3]),
+                ('confidence', 0.5 + turn % 5 / 10.0)
+            ])
+            for turn in range(turns)
+        ])
+    ])
+
+
+def json_default(value):
+
+    if value is Nil:
+        return None
+    raise TypeError(value)
+
+
+CODECS = [
+    (
+        'botlang',
+        BotlangCodec.encode,
+        BotlangCodec.decode
+    ),
+    (
+        'json',
+        lambda value: json.dumps(value, default=json_default).encode('utf-8'),
+        lambda data: json.loads(data.decode('utf-8'))
+    ),
+    (
+        'json+zlib',
+        lambda value: zlib.compress(
+            json.dumps(value, default=json_default).encode('utf-8')
+        ),
+        lambda data: json.loads(zlib.decompress(data).decode('utf-8'))
+    ),
+    (
+        'pickle',
+        lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+        pickle.loads
+    )
+]
+
+
+def microseconds(function, argument, repetitions=2000):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function(argument)
+    return (time.time() - start) * 1e6 / repetitions
+
+
+def main():
+
+    for state_name, state in [
+        ('bank bot', bank_bot_state()),
+        ('long conversation', long_conversation_state())
+    ]:
+        print(state_name)
+        for codec_name, encode, decode in CODECS:
+            encoded = encode(state)
+            print('    {0:<10} {1:>6} B {2:>9.1f} us enc {3:>9.1f} us dec'
+                  .format(
+                      codec_name,
+                      len(encoded),
+                      microseconds(encode, state),
+                      microseconds(decode, encoded)
+                  ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-turn latency of eval_bot against a compiled bot, for growing bot sizes.
+
+Usage:
+    python benchmarks/compiled_bots.py
+"""
+import timeit
+
+from botlang import BotlangSystem
+from botlang.examples.example_bots import ExampleBots
+
+
+def padded_bot(extra_definitions):
+
+    padding = '\n'.join(
+        '[define helper-{0} (function (x) (+ x {0}))]'.format(i)
+        for i in range(extra_definitions)
+    )
+    return padding + '\n' + ExampleBots.bank_bot_code
+
+
+def bench(label, function, repetitions=20):
+
+    seconds = min(timeit.repeat(function, number=repetitions, repeat=3))
+    return seconds * 1000 / repetitions
+
+
+def main():
+
+    print('{0:>18} {1:>16} {2:>16}'.format(
+        'extra definitions', 'eval_bot (ms)', 'compiled (ms)'
+    ))
+    for extra_definitions in [0, 200, 1000]:
+        code = padded_bot(extra_definitions)
+        system = BotlangSystem.bot_instance()
+        first = system.eval_bot(code, 'hola')
+        compiled_bot = system.compile_bot(code)
+
+        eval_ms = bench('eval_bot', lambda: system.eval_bot(
+            code, 'tengo una emergencia', first.next_node, first.data
+        ))
+        compiled_ms = bench('compiled', lambda: compiled_bot.handle(
+            'tengo una emergencia', first.next_node, first.data
+        ))
+        print('{0:>18} {1:>16.3f} {2:>16.3f}'.format(
+            extra_definitions, eval_ms, compiled_ms
+        ))
+
+
+if __name__ == '__main__':
+    main()
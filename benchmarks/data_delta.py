@@ -0,0 +1,72 @@
+"""
+Storage write size and encoding time of the whole conversation data
+against the delta of a turn that changes two keys of a large context.
+Also reports the time of the turn itself, which includes tracking.
+
+Usage:
+    python benchmarks/data_delta.py
+"""
+import time
+from collections import OrderedDict
+
+from botlang import BotlangSystem
+from botlang.evaluation.codec import BotlangCodec
+
+
+BOT = """
+[define survey-node
+    (bot-node (data message)
+        (put! data "turns" (+ 1 (get data "turns")))
+        (node-result (put data "last-answer" message) "ok" survey-node)
+    )
+]
+survey-node
+"""
+
+
+def conversation_data(keys=300):
+
+    data = OrderedDict([('turns', 0)])
+    for index in range(keys):
+        data['answer-{0}'.format(index)] = OrderedDict([
+            ('question', 'Pregunta número {0} de la encuesta'.format(index)),
+            ('answer', 'respuesta {0}'.format(index * 7)),
+            ('score', index % 5)
+        ])
+    return data
+
+
+def milliseconds(function, repetitions=200):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    compiled_bot = BotlangSystem.bot_instance().compile_bot(BOT)
+    data = conversation_data()
+    result = compiled_bot.handle('yes', 'survey-node', data)
+    delta = result.data_delta
+
+    full = BotlangCodec.encode(result.data)
+    changes = BotlangCodec.encode([delta.set_items, delta.removed_keys])
+    print('turn:        {0:>8.3f} ms'.format(milliseconds(
+        lambda: compiled_bot.handle('yes', 'survey-node', data)
+    )))
+    print('full write:  {0:>8} B {1:>8.3f} ms to encode'.format(
+        len(full),
+        milliseconds(lambda: BotlangCodec.encode(result.data))
+    ))
+    print('delta write: {0:>8} B {1:>8.3f} ms to encode'.format(
+        len(changes),
+        milliseconds(lambda: BotlangCodec.encode(
+            [result.data_delta.set_items, result.data_delta.removed_keys]
+        ))
+    ))
+
+
+if __name__ == '__main__':
+    main()
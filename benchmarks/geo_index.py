@@ -0,0 +1,93 @@
+"""
+Nearest point among 10000 (latitude, longitude) records: a Botlang min-by
+over the haversine distance to every record, as the bank bot's
+closest-atm did, against queries to a geo-index built once at the top
+level of the bot.
+
+Usage:
+    python benchmarks/geo_index.py
+"""
+import random
+import time
+
+from botlang import BotlangSystem
+from botlang.evaluation.geo import GeoIndex
+
+
+POINTS = 10000
+
+BOT = """
+[define distance
+    (fun (lat1 lon1 lat2 lon2)
+        [define dlat (radians (- lat2 lat1))]
+        [define dlon (radians (- lon2 lon1))]
+        [define a
+            (+
+                (* (sin (/ dlat 2)) (sin (/ dlat 2)))
+                (*
+                    (* (sin (/ dlon 2)) (sin (/ dlon 2)))
+                    (* (cos (radians lat1)) (cos (radians lat2)))
+                )
+            )
+        ]
+        (* 12742 (atan2 (sqrt a) (sqrt (- 1 a))))
+    )
+]
+[define index (geo-index points)]
+(bot-node (data message)
+    [define lat (get message 0)]
+    [define lon (get message 1)]
+    (node-result data (head {0}) end-node)
+)
+"""
+
+MIN_BY = '(min-by (fun (p) (distance lat lon (get p 1) (get p 2))) points)'
+
+INDEX = '(geo-nearest index lat lon)'
+
+
+def milliseconds(function, repetitions=5):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    generator = random.Random(0)
+    points = [
+        ['point-{0}'.format(index),
+         generator.uniform(-56, -17), generator.uniform(-76, -66)]
+        for index in range(POINTS)
+    ]
+    query = [-33.42, -70.6]
+
+    print('build index:        {0:>8.2f} ms'.format(
+        milliseconds(lambda: GeoIndex(points))
+    ))
+    index = GeoIndex(points)
+    print('nearest (Python):   {0:>8.3f} ms'.format(
+        milliseconds(lambda: index.nearest(*query), 1000)
+    ))
+    print('k-nearest 10:       {0:>8.3f} ms'.format(
+        milliseconds(lambda: index.k_nearest(query[0], query[1], 10), 1000)
+    ))
+
+    bot = BotlangSystem.bot_instance()
+    bot.environment.update({'points': points})
+    min_by_bot = bot.compile_bot(BOT.format(MIN_BY))
+    index_bot = bot.compile_bot(BOT.format(INDEX))
+    assert min_by_bot.handle(query).message == \
+        index_bot.handle(query).message
+    print('bot turn, min-by:   {0:>8.2f} ms'.format(
+        milliseconds(lambda: min_by_bot.handle(query))
+    ))
+    print('bot turn, index:    {0:>8.3f} ms'.format(
+        milliseconds(lambda: index_bot.handle(query), 1000)
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Cost of requiring the bot helpers from a new module resolver, with and
+without the process-wide ModuleCache, and of a require once the module
+is evaluated.
+
+Usage:
+    python benchmarks/module_cache.py
+"""
+import time
+import timeit
+
+from botlang import BotlangSystem
+from botlang.modules.cache import ModuleCache
+from botlang.modules.resolver import ModuleResolver
+from botlang.runtime_image import RuntimeImage
+
+
+REQUIRE_CODE = '(require "bot-helpers") (validate-rut "16926695-6")'
+
+
+def resolver(module_cache):
+
+    module_resolver = ModuleResolver(
+        BotlangSystem.base_environment(),
+        module_cache=module_cache
+    )
+    module_resolver.load_modules(RuntimeImage.bot_helpers_path())
+    return module_resolver
+
+
+def first_require(module_cache, repetitions=50):
+    """
+    :return: milliseconds per require, excluding the resolver creation
+    """
+    systems = [
+        BotlangSystem(module_resolver=resolver(module_cache))
+        for _ in range(repetitions)
+    ]
+    start = time.time()
+    for system in systems:
+        system.eval(REQUIRE_CODE)
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    module_cache = ModuleCache()
+    first_require(module_cache, 1)
+
+    print('{0:<36} {1:>10.3f} ms'.format(
+        'first require, no module cache',
+        min(first_require(None) for _ in range(5))
+    ))
+    print('{0:<36} {1:>10.3f} ms'.format(
+        'first require, module cache',
+        min(first_require(module_cache) for _ in range(5))
+    ))
+
+    system = BotlangSystem(module_resolver=resolver(module_cache))
+    system.eval(REQUIRE_CODE)
+    seconds = min(timeit.repeat(
+        lambda: system.eval(REQUIRE_CODE),
+        number=1000,
+        repeat=5
+    ))
+    print('{0:<36} {1:>10.3f} ms'.format(
+        'require of an evaluated module',
+        seconds
+    ))
+
+
+if __name__ == '__main__':
+    main()
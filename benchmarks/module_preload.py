@@ -0,0 +1,111 @@
+"""
+Startup time of a library of generated modules: evaluating every file in
+directory order, against preloading them in dependency order with module
+files parsed sequentially or in a process pool.
+
+Usage:
+    python benchmarks/module_preload.py [modules] [workers]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from botlang import BotlangSystem
+from botlang.modules.resolver import ModuleResolver
+from botlang.parser import Parser
+
+
+MODULE_TEMPLATE = """
+(module "{name}"
+    {requires}
+    [define {name}-greeting "Hello from {name}"]
+    [define {name}-options (list "first" "second" "third" "fourth")]
+    [define {name}-describe
+        (fun (data)
+            (append
+                {name}-greeting
+                ": "
+                (get-or-nil data "user")
+                (reduce (fun (option text) (append text ", " option))
+                        "" {name}-options)
+            )
+        )
+    ]
+    [define {name}-score
+        (fun (values)
+            (sum (map (fun (n) (+ (* n n) {index})) values))
+        )
+    ]
+    (provide {name}-describe {name}-score)
+)
+"""
+
+
+def generate_library(path, modules):
+
+    random.seed(1)
+    for index in range(modules):
+        name = 'module-{0}'.format(index)
+        dependencies = random.sample(range(index), min(index, 3))
+        requires = ' '.join(
+            '(require "module-{0}")'.format(dependency)
+            for dependency in dependencies
+        )
+        file_name = os.path.join(path, '{0}.botlang'.format(name))
+        with open(file_name, 'w') as module_file:
+            module_file.write(MODULE_TEMPLATE.format(
+                name=name,
+                index=index,
+                requires=requires
+            ))
+
+
+def directory_order(path):
+
+    resolver = ModuleResolver(BotlangSystem.base_environment())
+    for file_name in sorted(os.listdir(path), reverse=True):
+        resolver.load_module(os.path.join(path, file_name))
+    resolver.preload()
+
+
+def preload(path, executor=None):
+
+    resolver = ModuleResolver(BotlangSystem.base_environment())
+    resolver.load_modules(path)
+    resolver.preload(executor)
+
+
+def bench(label, function):
+
+    Parser.asts_cache.clear()
+    start = time.time()
+    function()
+    print('{0:<36} {1:>10.1f} ms'.format(label, (time.time() - start) * 1000))
+
+
+def main():
+
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    path = tempfile.mkdtemp()
+    executor = ProcessPoolExecutor(workers)
+    try:
+        # Start the pool before anything is parsed in this process
+        list(executor.map(int, range(workers)))
+        generate_library(path, modules)
+        print('{0} modules, {1} workers'.format(modules, workers))
+        bench('directory order', lambda: directory_order(path))
+        bench('preload, sequential parse', lambda: preload(path))
+        bench('preload, process pool parse', lambda: preload(path, executor))
+    finally:
+        executor.shutdown()
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Nearest branch to a location among 10k points: the haversine distance as
+a Botlang function applied to each point (as the bank bot does), against
+the same formula on numeric arrays, with the NumPy backend (if installed)
+and with the array module backend.
+
+Usage:
+    python benchmarks/numeric_arrays.py [points]
+"""
+import random
+import sys
+import time
+
+from botlang import BotlangSystem
+from botlang.evaluation.numeric import ArrayBackend, NumericArray, \
+    NumpyBackend, numpy
+
+
+DEFINITIONS = """
+[define distance
+    (fun (lat1 lon1 lat2 lon2)
+        [define dLat (radians (- lat2 lat1))]
+        [define dLon (radians (- lon2 lon1))]
+        [define a
+            (+
+                (* (sin (/ dLat 2)) (sin (/ dLat 2)))
+                (*
+                    (* (sin (/ dLon 2)) (sin (/ dLon 2)))
+                    (* (cos (radians lat1)) (cos (radians lat2)))
+                )
+            )
+        ]
+        (* 6371 (* 2 (atan2 (sqrt a) (sqrt (- 1 a)))))
+    )
+]
+[define array-distance
+    (fun (lat lon lats lons)
+        [define dLat (array-radians (array-sub lats lat))]
+        [define dLon (array-radians (array-sub lons lon))]
+        [define a
+            (+
+                (array-pow (array-sin (/ dLat 2)) 2)
+                (*
+                    (array-pow (array-sin (/ dLon 2)) 2)
+                    (* (cos (radians lat)) (array-cos (array-radians lats)))
+                )
+            )
+        ]
+        (* 6371 (* 2 (array-atan2 (array-sqrt a) (array-sqrt (- 1 a)))))
+    )
+]
+"""
+
+SCALAR = """
+(min-by (fun (i) (distance -33.42 -70.6 (get lats i) (get lons i))) indexes)
+"""
+
+VECTORIZED = """
+(array-argmin (array-distance -33.42 -70.6 lats-array lons-array))
+"""
+
+
+def milliseconds(function, repetitions=3):
+
+    function()
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    points = random.Random(0)
+    lats = [points.uniform(-56, -17) for _ in range(size)]
+    lons = [points.uniform(-76, -66) for _ in range(size)]
+
+    system = BotlangSystem.bot_instance()
+    system.eval(DEFINITIONS)
+    system.environment.update({
+        'lats': lats,
+        'lons': lons,
+        'indexes': list(range(size))
+    })
+    expected = system.eval(SCALAR)
+    print('botlang function per point: {0:>9.1f} ms'.format(
+        milliseconds(lambda: system.eval(SCALAR))
+    ))
+
+    backends = [ArrayBackend] + ([NumpyBackend] if numpy is not None else [])
+    for backend in backends:
+        NumericArray.backend = backend
+        system.environment.update({
+            'lats-array': NumericArray.from_iterable(lats),
+            'lons-array': NumericArray.from_iterable(lons)
+        })
+        assert system.eval(VECTORIZED) == expected
+        print('arrays ({0:<5}):             {1:>9.1f} ms'.format(
+            backend.name,
+            milliseconds(lambda: system.eval(VECTORIZED))
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+1000 successive puts into a dict, with the OrderedDict copy that put made
+before against PersistentDict, both called directly and from a bot that
+builds its conversation data with put (the message is the list of keys).
+
+Usage:
+    python benchmarks/persistent_dict.py
+"""
+import time
+from collections import OrderedDict
+
+from botlang import BotlangSystem
+from botlang.evaluation.persistent import PersistentDict
+
+
+PUTS = 1000
+
+BOT = """
+(bot-node (data message)
+    (node-result
+        (fold data (fun (data key) (put data key #t)) message)
+        "done"
+        end-node
+    )
+)
+"""
+
+
+def ordered_dict_puts():
+
+    data = OrderedDict()
+    for index in range(PUTS):
+        data = OrderedDict(list(data.items()) + [(index, index)])
+    return data
+
+
+def persistent_dict_puts():
+
+    data = PersistentDict()
+    for index in range(PUTS):
+        data = data.put(index, index)
+    return data
+
+
+def milliseconds(function, repetitions=5):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    print('OrderedDict copy: {0:>8.2f} ms'.format(
+        milliseconds(ordered_dict_puts)
+    ))
+    print('PersistentDict:   {0:>8.2f} ms'.format(
+        milliseconds(persistent_dict_puts)
+    ))
+    persistent_dict = persistent_dict_puts()
+    print('  to_dict:        {0:>8.2f} ms'.format(
+        milliseconds(persistent_dict.to_dict)
+    ))
+
+    compiled_bot = BotlangSystem.bot_instance().compile_bot(BOT)
+    keys = ['key-{0}'.format(index) for index in range(PUTS)]
+    print('bot turn:         {0:>8.2f} ms'.format(
+        milliseconds(lambda: compiled_bot.handle(keys, data={'user': 'ana'}))
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Recursive map and filter written in Botlang, over lists of growing size.
+Each step takes the head and recurses on the tail, and the result is
+built with cons, the usual way to walk a list without loops.
+
+Usage:
+    python benchmarks/persistent_list.py
+"""
+import sys
+import time
+
+from botlang import BotlangSystem
+
+
+CODE = """
+[define my-map
+    (fun (f lst)
+        (if (equal? (length lst) 0)
+            (list)
+            (cons (f (head lst)) (my-map f (tail lst)))
+        )
+    )
+]
+[define my-filter
+    (fun (f lst)
+        (if (equal? (length lst) 0)
+            (list)
+            (if (f (head lst))
+                (cons (head lst) (my-filter f (tail lst)))
+                (my-filter f (tail lst))
+            )
+        )
+    )
+]
+[define numbers (map (fun (x) x) input)]
+(list
+    (my-map (fun (x) (* x 2)) numbers)
+    (my-filter (fun (x) (equal? (mod x 3) 0)) numbers)
+)
+"""
+
+
+def milliseconds(function, repetitions=5):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    sys.setrecursionlimit(100000)
+    system = BotlangSystem.bot_instance()
+    for size in [500, 2000, 8000]:
+        system.environment.update({'input': list(range(size))})
+        result = system.eval(CODE)
+        assert result[0][-1] == (size - 1) * 2
+        print('{0:>5} elements: {1:>8.2f} ms'.format(
+            size,
+            milliseconds(lambda: system.eval(CODE))
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+First-turn latency and memory of forked workers: cold workers that load
+the runtime and compile the bot after forking, against warm workers
+forked by WorkerSupervisor after preloading and gc.freeze().
+
+Linux only (reads /proc/self/smaps_rollup).
+
+Usage:
+    python benchmarks/prefork_workers.py
+"""
+import gc
+import json
+import os
+import time
+
+from botlang.examples.example_bots import ExampleBots
+from botlang.workers.supervisor import WorkerSupervisor
+
+WORKERS = 4
+
+
+def memory_kib():
+
+    usage = {}
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:', 'Private_Dirty:'):
+                usage[parts[0][:-1]] = int(parts[1])
+    return usage
+
+
+def first_turn(compiled_bots):
+
+    start = time.time()
+    if compiled_bots is None:
+        from botlang import BotlangSystem
+        compiled_bot = BotlangSystem.bot_instance().compile_bot(
+            ExampleBots.bank_bot_code
+        )
+    else:
+        compiled_bot = compiled_bots['bank']
+    compiled_bot.handle('hola')
+    latency = time.time() - start
+    gc.collect()
+    return latency
+
+
+def report_to(write_fd, compiled_bots):
+
+    latency = first_turn(compiled_bots)
+    report = dict(memory_kib(), latency_ms=latency * 1000)
+    os.write(write_fd, json.dumps(report).encode('utf-8'))
+    os.close(write_fd)
+
+
+def collect(pipes):
+
+    reports = []
+    for read_fd in pipes:
+        with os.fdopen(read_fd) as pipe:
+            reports.append(json.loads(pipe.read()))
+    return reports
+
+
+def cold_workers():
+
+    pipes, pids = [], []
+    for _ in range(WORKERS):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            report_to(write_fd, None)
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append(read_fd)
+        pids.append(pid)
+    reports = collect(pipes)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return reports
+
+
+def warm_workers():
+
+    pipes = [os.pipe() for _ in range(WORKERS)]
+
+    def worker_main(worker_index, compiled_bots):
+        read_fd, write_fd = pipes[worker_index]
+        os.close(read_fd)
+        report_to(write_fd, compiled_bots)
+
+    supervisor = WorkerSupervisor(
+        {'bank': ExampleBots.bank_bot_code},
+        WORKERS,
+        worker_main
+    )
+    supervisor.start()
+    for _, write_fd in pipes:
+        os.close(write_fd)
+    reports = collect([read_fd for read_fd, _ in pipes])
+    supervisor.wait()
+    return reports
+
+
+def print_reports(label, reports):
+
+    def average(key):
+        return sum(report[key] for report in reports) / len(reports)
+
+    print('{0:<6} {1:>16.1f} {2:>10.0f} {3:>10.0f} {4:>18.0f}'.format(
+        label,
+        average('latency_ms'),
+        average('Rss'),
+        average('Pss'),
+        average('Private_Dirty')
+    ))
+
+
+def main():
+
+    print('{0:<6} {1:>16} {2:>10} {3:>10} {4:>18}'.format(
+        'worker', 'first turn (ms)', 'RSS KiB', 'PSS KiB', 'private dirty KiB'
+    ))
+    print_reports('cold', cold_workers())
+    print_reports('warm', warm_workers())
+
+
+if __name__ == '__main__':
+    main()
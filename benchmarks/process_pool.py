@@ -0,0 +1,116 @@
+"""
+Throughput of CPU-bound turns of the example bots in one process against
+a BotlangPool of 1 to N worker processes (default N: 4, or the CPU count
+if larger). Turns are spread over 8 bot ids, so every worker gets bots.
+
+Usage:
+    python benchmarks/process_pool.py [N]
+"""
+import multiprocessing
+import sys
+import time
+
+from botlang import BotlangSystem
+from botlang.examples.example_bots import ExampleBots
+from botlang.workers.pool import BotlangPool
+
+
+DISTANCE_BOT = """
+[define branches (list {0})]
+[define nearest-node
+    (bot-node (data message)
+        [define distances
+            (map
+                (function (branch)
+                    (hypot (- (head branch) 0.5) (- (last branch) 0.3))
+                )
+                branches
+            )
+        ]
+        (node-result data (min distances) nearest-node)
+    )
+]
+nearest-node
+""".format(' '.join(
+    '(list {0} {1})'.format(i * 0.013, i * 0.007) for i in range(400)
+))
+
+
+def bot_sources():
+
+    sources = {}
+    for index in range(4):
+        sources['bank-{0}'.format(index)] = ExampleBots.bank_bot_code
+        sources['distance-{0}'.format(index)] = DISTANCE_BOT
+    return sources
+
+
+def workload(size=2000):
+
+    first = BotlangSystem.bot_instance().eval_bot(
+        ExampleBots.bank_bot_code,
+        'hola'
+    )
+    turns = []
+    for index in range(size):
+        if index % 2 == 0:
+            turns.append((
+                'bank-{0}'.format(index % 4),
+                'tengo una emergencia',
+                first.next_node,
+                first.data
+            ))
+        else:
+            turns.append(('distance-{0}'.format(index % 4), 'near'))
+    return turns
+
+
+def single_process(turns):
+
+    system = BotlangSystem.bot_instance()
+    compiled_bots = {
+        bot_id: system.compile_bot(code, source_id=bot_id)
+        for bot_id, code in bot_sources().items()
+    }
+    start = time.time()
+    for turn in turns:
+        compiled_bots[turn[0]].handle(*turn[1:])
+    return time.time() - start
+
+
+def pooled(turns, worker_count):
+
+    with BotlangPool(bot_sources(), worker_count) as pool:
+        start = time.time()
+        results = pool.handle_batch(turns)
+        seconds = time.time() - start
+    assert not any(isinstance(result, Exception) for result in results)
+    return seconds
+
+
+def main():
+
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 \
+        else max(4, multiprocessing.cpu_count())
+    turns = workload()
+
+    print('{0} CPUs, {1} turns'.format(
+        multiprocessing.cpu_count(),
+        len(turns)
+    ))
+    rows = [('single process', single_process(turns))]
+    for worker_count in range(1, max_workers + 1):
+        rows.append((
+            'pool, {0} workers'.format(worker_count),
+            pooled(turns, worker_count)
+        ))
+    for label, seconds in rows:
+        print('{0:<18} {1:>10.1f} ms {2:>10.0f} turns/s'.format(
+            label,
+            seconds * 1000,
+            len(turns) / seconds
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Bot instance creation time and memory: building a fresh base environment
+and module resolver per instance against overlays over the shared
+RuntimeImage.
+
+Usage:
+    python benchmarks/runtime_image.py
+"""
+import timeit
+import tracemalloc
+
+from botlang import BotlangSystem
+
+
+def fresh_instance():
+
+    environment = BotlangSystem.base_environment()
+    module_resolver = BotlangSystem.bot_modules_resolver(environment)
+    return BotlangSystem(module_resolver=module_resolver)
+
+
+def overlay_instance():
+
+    return BotlangSystem.bot_instance()
+
+
+def retained_bytes(factory, instances=100):
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    systems = [factory() for _ in range(instances)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del systems
+    return float(after - before) / instances
+
+
+def main():
+
+    overlay_instance()  # Builds the shared image
+
+    print('{0:<18} {1:>14} {2:>18}'.format(
+        'strategy', 'creation (ms)', 'memory (KiB/bot)'
+    ))
+    for label, factory in [
+        ('fresh environment', fresh_instance),
+        ('runtime image', overlay_instance)
+    ]:
+        seconds = min(timeit.repeat(factory, number=20, repeat=3)) / 20
+        print('{0:<18} {1:>14.3f} {2:>18.1f}'.format(
+            label,
+            seconds * 1000,
+            retained_bytes(factory) / 1024
+        ))
+
+
+if __name__ == '__main__':
+    main()
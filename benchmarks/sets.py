@@ -0,0 +1,72 @@
+"""
+Membership checks and lookups against a 100000 element collection: member?
+and find over a list, against a set built with make-set and a dict built
+with index-by, both defined once at the top level of the bot. Each turn
+checks 10 ids.
+
+Usage:
+    python benchmarks/sets.py
+"""
+import time
+
+from botlang import BotlangSystem
+
+
+SIZE = 100000
+CHECKS = 10
+
+BOT = """
+[define id-set (make-set ids)]
+[define by-id (index-by head accounts)]
+(bot-node (data message)
+    (node-result data (length (filter (fun (id) {0}) message)) end-node)
+)
+"""
+
+QUERIES = [
+    ('membership', '(member? ids id)', '(set-member? id-set id)'),
+    (
+        'lookup by id',
+        '(not (nil? (find (fun (a) (equal? (head a) id)) accounts)))',
+        '(not (nil? (get-or-nil by-id id)))'
+    )
+]
+
+
+def milliseconds(function, repetitions=3):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    ids = list(range(SIZE))
+    accounts = [[index, 'account-{0}'.format(index)] for index in ids]
+    # Half of the checked ids are missing, half are near the end
+    message = [SIZE - CHECKS // 2 + index for index in range(CHECKS)]
+
+    bot = BotlangSystem.bot_instance()
+    bot.environment.update({'ids': ids, 'accounts': accounts})
+    start = time.time()
+    bot.compile_bot(BOT.format('#t'))
+    print('make-set + index-by: {0:>8.2f} ms'.format(
+        (time.time() - start) * 1000
+    ))
+
+    for name, list_code, set_code in QUERIES:
+        list_bot = bot.compile_bot(BOT.format(list_code))
+        set_bot = bot.compile_bot(BOT.format(set_code))
+        assert list_bot.handle(message).message == \
+            set_bot.handle(message).message
+        print('{0:<14} list: {1:>9.2f} ms   indexed: {2:>7.3f} ms'.format(
+            name,
+            milliseconds(lambda: list_bot.handle(message), 1),
+            milliseconds(lambda: set_bot.handle(message), 100)
+        ))
+
+
+if __name__ == '__main__':
+    main()
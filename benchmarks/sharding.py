@@ -0,0 +1,88 @@
+"""
+Per-worker compiled bot caches of a BotlangPool with round-robin routing
+against consistent hashing by bot id: bots compiled by each worker, cache
+hit rate, peak memory and throughput, for 4000 turns over 40 tenant bots.
+
+Usage:
+    python benchmarks/sharding.py [workers]
+"""
+import random
+import sys
+import time
+
+from botlang.examples.example_bots import ExampleBots
+from botlang.workers.pool import BotlangPool
+from botlang.workers.sharding import ConsistentHashRouter, RoundRobinRouter
+
+
+TENANT_BOT = """
+[define tenant-node
+    (bot-node (data message)
+        (node-result data (append "tenant {0}: " message) tenant-node)
+    )
+]
+tenant-node
+"""
+
+
+def bot_sources(tenants=40):
+
+    sources = {}
+    for tenant in range(tenants):
+        if tenant % 4 == 0:
+            # Same behaviour, distinct code: each tenant compiles its own
+            sources['tenant-{0}'.format(tenant)] = '{0}\n; tenant {1}'.format(
+                ExampleBots.bank_bot_code,
+                tenant
+            )
+        else:
+            sources['tenant-{0}'.format(tenant)] = TENANT_BOT.format(tenant)
+    return sources
+
+
+def workload(sources, size=4000):
+
+    bot_ids = sorted(sources)
+    shuffle = random.Random(0)
+    return [
+        (shuffle.choice(bot_ids), 'message {0}'.format(index))
+        for index in range(size)
+    ]
+
+
+def run(router, worker_count, sources, turns):
+
+    with BotlangPool(sources, worker_count, router) as pool:
+        start = time.time()
+        results = pool.handle_batch(turns)
+        seconds = time.time() - start
+        statistics = pool.statistics()
+    assert not any(isinstance(result, Exception) for result in results)
+    return seconds, statistics
+
+
+def main():
+
+    worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    sources = bot_sources()
+    turns = workload(sources)
+
+    for label, router in [
+        ('round-robin', RoundRobinRouter()),
+        ('consistent hashing', ConsistentHashRouter())
+    ]:
+        seconds, statistics = run(router, worker_count, sources, turns)
+        print('{0}: {1:.0f} turns/s'.format(label, len(turns) / seconds))
+        for worker_id, stats in sorted(statistics.items()):
+            lookups = stats['hits'] + stats['misses']
+            print('    worker {0}: {1:>3} bots {2:>6.1%} hits {3:>8} KiB'
+                  .format(
+                      worker_id,
+                      len(stats['bots']),
+                      float(stats['hits']) / lookups if lookups else 0,
+                      stats['max_rss']
+                  ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Sorting 10000 records (id, name, score): sort with a Botlang comparator,
+which is called on every comparison, against sort-by, which calls its key
+function once per record, plus the native paths of sort for numbers.
+
+Usage:
+    python benchmarks/sorting.py
+"""
+import random
+import time
+
+from botlang import BotlangSystem
+
+
+RECORDS = 10000
+
+BOT = """
+(bot-node (data message)
+    (node-result data (head {0}) end-node)
+)
+"""
+
+SORTS = [
+    (
+        'comparator',
+        '(sort (fun (a b) (< (get a 2) (get b 2))) records)'
+    ),
+    ('sort-by', '(sort-by (fun (r) (get r 2)) records)'),
+    (
+        'comparator, 2 keys',
+        '(sort (fun (a b) (or (> (get a 2) (get b 2))'
+        ' (and (= (get a 2) (get b 2)) (< (get a 1) (get b 1))))) records)'
+    ),
+    (
+        'sort-by, 2 keys',
+        '(sort-by (list (fun (r) (get r 2)) (fun (r) (get r 1))) records'
+        ' (list #t #f))'
+    ),
+    ('numbers, comparator', '(sort (fun (a b) (< a b)) scores)'),
+    ('numbers, <', '(sort < scores)'),
+    ('numbers, no comparator', '(sort scores)')
+]
+
+
+def milliseconds(function, repetitions=3):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    generator = random.Random(0)
+    records = [
+        [index, 'name-{0}'.format(generator.randint(0, 999)),
+         generator.randint(0, 100)]
+        for index in range(RECORDS)
+    ]
+    bot = BotlangSystem.bot_instance()
+    bot.environment.update({
+        'records': records,
+        'scores': [record[2] for record in records]
+    })
+    for name, code in SORTS:
+        compiled_bot = bot.compile_bot(BOT.format(code))
+        print('{0:<24} {1:>9.2f} ms'.format(
+            name,
+            milliseconds(lambda: compiled_bot.handle(''))
+        ))
+
+
+if __name__ == '__main__':
+    main()
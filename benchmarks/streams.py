@@ -0,0 +1,70 @@
+"""
+Latency and peak memory of a map/filter/map pipeline reduced with min,
+built with the eager list primitives against the stream primitives, and
+of finding the first match with filter + head against first-where.
+
+Usage:
+    python benchmarks/streams.py [elements]
+"""
+import sys
+import time
+import tracemalloc
+
+from botlang import BotlangSystem
+
+
+PIPELINES = [
+    (
+        'eager min',
+        '(min (map (fun (x) (* x 3)) (filter (fun (x) (> x 0)) '
+        '(map (fun (x) (- x 7)) numbers))))'
+    ),
+    (
+        'stream min',
+        '(min (stream-map (fun (x) (* x 3)) (stream-filter (fun (x) (> x 0)) '
+        '(stream-map (fun (x) (- x 7)) numbers))))'
+    ),
+    (
+        'eager first',
+        '(head (filter (fun (x) (equal? (mod x 1000) 999)) numbers))'
+    ),
+    (
+        'stream first',
+        '(first-where (fun (x) (equal? (mod x 1000) 999)) numbers)'
+    )
+]
+
+
+def measure(system, code, repetitions=3):
+    """
+    :return: (milliseconds per run, peak KiB allocated)
+    """
+    system.eval(code)
+    start = time.time()
+    for _ in range(repetitions):
+        system.eval(code)
+    milliseconds = (time.time() - start) * 1000 / repetitions
+
+    tracemalloc.start()
+    system.eval(code)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return milliseconds, peak / 1024.0
+
+
+def main():
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    system = BotlangSystem.bot_instance()
+    system.environment.update({'numbers': list(range(size))})
+    for label, code in PIPELINES:
+        milliseconds, peak = measure(system, code)
+        print('{0:<14} {1:>9.1f} ms {2:>10.0f} KiB peak'.format(
+            label,
+            milliseconds,
+            peak
+        ))
+
+
+if __name__ == '__main__':
+    main()
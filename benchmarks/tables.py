@@ -0,0 +1,93 @@
+"""
+Queries on a 10000 row product catalog: the filter, find, sort and map
+code that bots write over a list of records, against the same queries on
+a table built once at the top level of the bot. Each query is one bot
+turn whose message is the number of rows (or the row) found.
+
+Usage:
+    python benchmarks/tables.py
+"""
+import random
+import time
+
+from botlang import BotlangSystem
+
+
+ROWS = 10000
+
+BOT = """
+[define catalog
+    (make-table (list "sku" "category" "price" "stock") products)
+]
+(bot-node (data message)
+    (node-result data {0} end-node)
+)
+"""
+
+QUERIES = [
+    (
+        'equality lookup',
+        '(length (filter (fun (p) (equal? (get p 1) "toys")) products))',
+        '(length (table-lookup catalog "category" "toys"))'
+    ),
+    (
+        'find by key',
+        '(find (fun (p) (equal? (get p 0) "sku-9000")) products)',
+        '(table-find catalog "sku" "sku-9000")'
+    ),
+    (
+        'range filter',
+        '(length (filter (fun (p) (and (>= (get p 2) 100) (<= (get p 2) 120)))'
+        ' products))',
+        '(length (table-range catalog "price" 100 120))'
+    ),
+    (
+        'sort by column',
+        '(head (sort (fun (a b) (< (get a 2) (get b 2))) products))',
+        '(get (table-sort catalog "price") 0)'
+    ),
+    (
+        'projection',
+        '(length (map (fun (p) (list (get p 0) (get p 2))) products))',
+        '(length (table-select catalog "sku" "price"))'
+    )
+]
+
+
+def milliseconds(function, repetitions=5):
+
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) * 1000 / repetitions
+
+
+def main():
+
+    generator = random.Random(0)
+    products = [
+        ['sku-{0}'.format(index),
+         generator.choice(['food', 'toys', 'books', 'games']),
+         generator.randint(1, 1000),
+         generator.randint(0, 50)]
+        for index in range(ROWS)
+    ]
+    bot = BotlangSystem.bot_instance()
+    bot.environment.update({'products': products})
+
+    for name, list_code, table_code in QUERIES:
+        list_bot = bot.compile_bot(BOT.format(list_code))
+        table_bot = bot.compile_bot(BOT.format(table_code))
+        list_message = list_bot.handle('').message
+        # The first turn builds the index of the column
+        table_message = table_bot.handle('').message
+        assert list_message == table_message, (list_message, table_message)
+        print('{0:<16} list: {1:>8.2f} ms   table: {2:>8.3f} ms'.format(
+            name,
+            milliseconds(lambda: list_bot.handle('')),
+            milliseconds(lambda: table_bot.handle(''), 100)
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -274,6 +274,10 @@ class App(ASTNode):
         super(ASTNode, self).__init__()
         self.fun_expr = fun_expr
         self.arg_exprs = arg_exprs
+        self.call_site_cacheable = None
+        self.inline_cache = None
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def accept(self, visitor, env):
         return visitor.visit_app(self, env)
@@ -281,6 +285,12 @@ class App(ASTNode):
     def print_node_type(self):
         return 'function application'
 
+    def __getstate__(self):
+        # Inline caches reference runtime values of this process
+        state = self.__dict__.copy()
+        state['inline_cache'] = None
+        return state
+
     def copy(self):
         return App(
             self.fun_expr.copy(),
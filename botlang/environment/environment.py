@@ -1,25 +1,48 @@
+import itertools
+import weakref
+
 from botlang.evaluation.values import *
 
 
+class FrozenEnvironmentException(Exception):
+
+    def __init__(self):
+        super(FrozenEnvironmentException, self).__init__(
+            'Frozen environments can not be updated'
+        )
+
+
 class Environment(object):
     """
     Environment (scope)
+
+    Every environment belongs to a global scope: its own, for root and
+    host-created environments, or its creator's, for the lexical scopes
+    created by function application and local definitions.
+
+    Each global scope has a bindings version, which the evaluator's inline
+    caches check. Updating a global scope bumps its version and the ones of
+    the global scopes created from it, which see its bindings; the caches
+    of unrelated scopes (e.g. of other systems) stay valid.
     """
-    def __init__(self, bindings=None, previous=None):
+    versions = itertools.count(1)
+    bindings_version = 0
+
+    def __init__(self, bindings=None, previous=None, global_env=None):
         self.previous = previous
         self.bindings = bindings if bindings is not None else {}
-        self.function_names = {
-            id(obj): name for name, obj in self.bindings.items()
-        }
-        self.last_input_message = None
-
-    def get_last_input_message(self):
-
-        msg = self.last_input_message
-        if msg is not None:
-            return msg
-        if self.previous:
-            return self.previous.get_last_input_message()
+        if global_env is None:
+            self.global_env = self
+            self.bindings_version = next(Environment.versions)
+            self.inner_global_envs = weakref.WeakSet()
+            if previous is not None:
+                previous.global_env.inner_global_envs.add(self)
+        else:
+            self.global_env = global_env
+        # Built on the first get_function_name, which only error messages
+        # and printing call: most scopes are never asked for it
+        self.function_names = None
+        self.frozen = False
 
     def lookup(self, var_name):
         result = self.bindings.get(var_name, None)
@@ -30,6 +53,11 @@ class Environment(object):
         raise NameError("name '{0}' is not defined".format(var_name))
 
     def get_function_name(self, obj):
+        if self.function_names is None:
+            self.function_names = {
+                value: name for name, value in self.bindings.items()
+                if isinstance(value, FunVal)
+            }
         name = self.function_names.get(obj)
         if name is not None:
             return name
@@ -37,11 +65,25 @@ class Environment(object):
             return self.previous.get_function_name(obj)
 
     def update(self, bindings):
+        if self.frozen:
+            raise FrozenEnvironmentException()
         self.bindings.update(bindings)
-        self.function_names.update({
-            obj: name for name, obj in bindings.items()
-            if isinstance(obj, FunVal)
-        })
+        self.function_names = None
+        if self.global_env is self:
+            self.bump_bindings_version()
+        return self
+
+    def bump_bindings_version(self):
+
+        self.bindings_version = next(Environment.versions)
+        for inner_global_env in list(self.inner_global_envs):
+            inner_global_env.bump_bindings_version()
+
+    def freeze(self):
+        """
+        Forbids any further update of this environment's bindings
+        """
+        self.frozen = True
         return self
 
     def add_primitives(self, bindings):
@@ -54,6 +96,11 @@ class Environment(object):
             {k: ReflectivePrimitive(v, self) for k, v in bindings.items()}
         )
 
+    def add_async_primitives(self, bindings):
+        return self.update(
+            {k: AsyncPrimitive(v, self) for k, v in bindings.items()}
+        )
+
     def add_terminal_nodes(self, node_states):
 
         return self.add_primitives(
@@ -65,3 +112,13 @@ class Environment(object):
             bindings if bindings is not None else {},
             previous=self
         )
+
+    def new_local_environment(self, bindings=None):
+        """
+        Lexical scope, which shares this environment's global scope
+        """
+        return Environment(
+            bindings if bindings is not None else {},
+            previous=self,
+            global_env=self.global_env
+        )
@@ -0,0 +1,57 @@
+from botlang.evaluation.numeric import NumericArray
+
+
+def array_primitive(values):
+    return NumericArray.from_iterable(values)
+
+
+def array_operand(value):
+    if isinstance(value, NumericArray):
+        return value
+    return NumericArray.from_iterable(value)
+
+
+def unary_primitive(name):
+    return lambda values: array_operand(values).unary(name)
+
+
+def binary_primitive(name):
+    return lambda values, other: array_operand(values).binary(name, other)
+
+
+def comparison_primitive(name):
+    return lambda values, other: array_operand(values).compare(name, other)
+
+
+ARRAY_PRIMITIVES = {
+    'array': array_primitive,
+    'array?': lambda value: isinstance(value, NumericArray),
+    'array->list': lambda values: array_operand(values).to_list(),
+    'array-add': binary_primitive('add'),
+    'array-sub': binary_primitive('sub'),
+    'array-mul': binary_primitive('mul'),
+    'array-div': binary_primitive('div'),
+    'array-pow': binary_primitive('pow'),
+    'array-atan2': binary_primitive('atan2'),
+    'array-abs': unary_primitive('abs'),
+    'array-sin': unary_primitive('sin'),
+    'array-cos': unary_primitive('cos'),
+    'array-tan': unary_primitive('tan'),
+    'array-sqrt': unary_primitive('sqrt'),
+    'array-radians': unary_primitive('radians'),
+    'array<': comparison_primitive('lt'),
+    'array<=': comparison_primitive('le'),
+    'array>': comparison_primitive('gt'),
+    'array>=': comparison_primitive('ge'),
+    'array=': comparison_primitive('eq'),
+    'array-and': comparison_primitive('and'),
+    'array-or': comparison_primitive('or'),
+    'array-not': lambda mask: array_operand(mask).logical_not(),
+    'array-select': lambda values, mask: array_operand(values).select(mask),
+    'array-count': lambda mask: array_operand(mask).count(),
+    'array-sum': lambda values: array_operand(values).sum(),
+    'array-min': lambda values: array_operand(values).min(),
+    'array-max': lambda values: array_operand(values).max(),
+    'array-argmin': lambda values: array_operand(values).argmin(),
+    'array-argmax': lambda values: array_operand(values).argmax()
+}
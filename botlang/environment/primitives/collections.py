@@ -2,22 +2,84 @@ import operator as op
 from collections import OrderedDict
 from functools import reduce, cmp_to_key
 
-from botlang.evaluation.values import Nil, NativeException
+from botlang.evaluation.hash_set import HashSet
+from botlang.evaluation.persistent import PersistentDict, PersistentList
+from botlang.evaluation.values import Nil, NativeException, Primitive, \
+    TrackedDict
 
 
 def append(*values):
     return reduce(op.add, values)
 
 
-def extend(lst, value):
-    if isinstance(value, list):
-        return lst + value
-    return lst + [value]
+def is_list(value):
+    return isinstance(value, (list, PersistentList))
+
+
+def as_persistent_list(value):
+    if isinstance(value, PersistentList):
+        return value
+    return PersistentList.from_iterable(value)
 
 
-def sort_function(comparator_function, lst):
+def extend(lst, value):
+    if is_list(value):
+        return PersistentList.from_iterable(list(lst) + list(value))
+    return PersistentList.from_iterable(list(lst) + [value])
+
+
+# Primitive comparators that sorted can apply itself, as "reverse" flags
+NATIVE_COMPARATORS = {op.lt: False, op.le: False, op.gt: True, op.ge: True}
+
+
+def sort_function(comparator_function, lst=None):
+    """
+    Sorts with a comparator that tells whether its first argument goes
+    before the second. Without a comparator, (sort lst), and with < <= >
+    or >=, the sort runs natively and is stable.
+    """
+    if lst is None:
+        return PersistentList.from_iterable(sorted(comparator_function))
+    if isinstance(comparator_function, Primitive):
+        reverse = NATIVE_COMPARATORS.get(comparator_function.proc)
+        if reverse is not None:
+            return PersistentList.from_iterable(sorted(lst, reverse=reverse))
     cmp_fun = lambda a, b: -1 if comparator_function(a, b) else 1
-    return list(sorted(lst, key=cmp_to_key(cmp_fun)))
+    return PersistentList.from_iterable(sorted(lst, key=cmp_to_key(cmp_fun)))
+
+
+def sort_key(value):
+    # Lists of keys compare element by element
+    if isinstance(value, PersistentList):
+        return tuple(sort_key(item) for item in value)
+    return value
+
+
+def sort_by(key_functions, lst, descending=False):
+    """
+    Stable sort by the key each function gives an element, computed once
+    per element. key_functions is a function or a list of them, the
+    first one the most significant; descending is a boolean for all the
+    keys or a list with one per key.
+    """
+    elements = list(lst)
+    if not is_list(key_functions):
+        key_functions = [key_functions]
+    if not is_list(descending):
+        descending = [descending] * len(key_functions)
+    if len(descending) != len(key_functions):
+        raise ValueError(
+            'sort-by got {0} sort orders for {1} keys'.format(
+                len(descending), len(key_functions)
+            )
+        )
+    order = list(range(len(elements)))
+    # One stable pass per key, from the least significant one
+    for key_function, reverse in reversed(list(
+            zip(key_functions, descending))):
+        keys = [sort_key(key_function(element)) for element in elements]
+        order.sort(key=keys.__getitem__, reverse=bool(reverse))
+    return PersistentList.from_iterable(elements[index] for index in order)
 
 
 def find_in_list(find_function, lst):
@@ -29,15 +91,22 @@ def find_in_list(find_function, lst):
 
 def cons(head, tail):
 
-    if isinstance(tail, list):
-        return [head] + tail
-    return [head, tail]
+    if is_list(tail):
+        return as_persistent_list(tail).cons(head)
+    return PersistentList.from_iterable([head, tail])
+
+
+def tail(sequence):
+
+    if is_list(sequence):
+        return as_persistent_list(sequence).tail()
+    return sequence[1:]
 
 
 def dict_put(ordered_dict, key, value):
-    return OrderedDict(
-        list(ordered_dict.items()) + [(key, value)]
-    )
+    if isinstance(ordered_dict, (PersistentDict, TrackedDict)):
+        return ordered_dict.put(key, value)
+    return PersistentDict.from_items(ordered_dict.items()).put(key, value)
 
 
 def dict_put_mutate(ordered_dict, key, value):
@@ -70,7 +139,37 @@ def dict_remove_mutable(data_dict, key):
 
 
 def make_dict(bindings):
-    return OrderedDict(bindings)
+    return PersistentDict.from_items(bindings)
+
+
+def index_by(key_function, lst):
+    """
+    Dict from the key of each element to the first element with that key
+    """
+    index = OrderedDict()
+    for element in lst:
+        key = key_function(element)
+        if key not in index:
+            index[key] = element
+    return PersistentDict.from_items(index.items())
+
+
+def group_by(key_function, lst):
+    """
+    Dict from each key to the list of elements with that key, in order
+    """
+    groups = OrderedDict()
+    for element in lst:
+        key = key_function(element)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [element]
+        else:
+            group.append(element)
+    return PersistentDict.from_items(
+        (key, PersistentList.from_iterable(group))
+        for key, group in groups.items()
+    )
 
 
 COMMON_OPERATIONS = {
@@ -86,7 +185,9 @@ DICT_OPERATIONS = {
     'put!': dict_put_mutate,
     'associations': lambda d: list(d.items()),
     'keys': lambda d: list(d.keys()),
-    'values': lambda d: list(d.values())
+    'values': lambda d: list(d.values()),
+    'index-by': index_by,
+    'group-by': group_by
 }
 
 
@@ -94,21 +195,38 @@ LIST_OPERATIONS = {
     'append': append,
     'extend': extend,
     'head': lambda x: x[0],
-    'tail': lambda x: x[1:],
+    'tail': tail,
     'init': lambda x: x[:-1],
     'last': lambda x: x[-1],
     'length': len,
-    'list': lambda *x: list(x),
-    'map': lambda f, l: list(map(f, l)),
+    'list': lambda *x: PersistentList.from_iterable(x),
+    'map': lambda f, l: PersistentList.from_iterable(map(f, l)),
     'reduce': lambda f, l: reduce(f, l),
     'fold': lambda v, f, l: reduce(f, l, v),
-    'filter': lambda f, l: list(filter(f, l)),
+    'filter': lambda f, l: PersistentList.from_iterable(filter(f, l)),
     'sort': sort_function,
+    'sort-by': sort_by,
     'max': max,
     'min': min,
     'find': find_in_list,
     'cons': cons,
     'reverse': lambda l: l[::-1],
-    'enumerate': lambda l: list(enumerate(l)),
+    'enumerate': lambda l: PersistentList.from_iterable(enumerate(l)),
     'sum': sum
 }
+
+
+SET_OPERATIONS = {
+    'make-set': HashSet.from_iterable,
+    'set?': lambda value: isinstance(value, HashSet),
+    'set-member?': lambda collection, element: element in collection,
+    'set-add': lambda s, element: HashSet.from_iterable(s).add(element),
+    'set-remove':
+        lambda s, element: HashSet.from_iterable(s).remove(element),
+    'set-union': lambda s, other: HashSet.from_iterable(s).union(other),
+    'set-intersection':
+        lambda s, other: HashSet.from_iterable(s).intersection(other),
+    'set-difference':
+        lambda s, other: HashSet.from_iterable(s).difference(other),
+    'set->list': PersistentList.from_iterable
+}
@@ -0,0 +1,16 @@
+from botlang.evaluation.geo import GeoIndex, haversine_km
+
+
+def geo_index(records, latitude_key=1, longitude_key=2):
+    return GeoIndex(records, latitude_key, longitude_key)
+
+
+GEO_PRIMITIVES = {
+    'geo-index': geo_index,
+    'geo-index?': lambda value: isinstance(value, GeoIndex),
+    'geo-nearest': lambda index, lat, lon: index.nearest(lat, lon),
+    'geo-k-nearest': lambda index, lat, lon, k: index.k_nearest(lat, lon, k),
+    'geo-within-radius':
+        lambda index, lat, lon, km: index.within_radius(lat, lon, km),
+    'geo-distance': haversine_km
+}
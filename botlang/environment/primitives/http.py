@@ -1,5 +1,7 @@
 import requests
 
+from botlang.evaluation.persistent import to_host_value
+
 
 def build_response_dict(request_response):
 
@@ -19,18 +21,26 @@ def build_response_dict(request_response):
 
 def http_get(url, headers=None):
 
-    response = requests.get(url, headers=headers)
+    response = requests.get(url, headers=to_host_value(headers))
     return build_response_dict(response)
 
 
 def http_post_form(url, data, headers=None):
-    response = requests.post(url, data=data, headers=headers)
+    response = requests.post(
+        url,
+        data=to_host_value(data),
+        headers=to_host_value(headers)
+    )
     return build_response_dict(response)
 
 
 def http_post_json(url, json, headers=None):
 
-    response = requests.post(url, json=json, headers=headers)
+    response = requests.post(
+        url,
+        json=to_host_value(json),
+        headers=to_host_value(headers)
+    )
     return build_response_dict(response)
 
 
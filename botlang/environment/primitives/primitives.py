@@ -2,7 +2,9 @@ import operator as op
 
 
 from botlang.environment.primitives import math, http, collections, strings, \
-    compression, base64, random, datetime, reflection, exceptions
+    compression, base64, random, datetime, reflection, exceptions, streams, \
+    arrays, geo, tables
+from botlang.evaluation.turn_context import TurnContext
 from botlang.evaluation.values import Nil, TerminalNode
 
 
@@ -58,7 +60,7 @@ class BotlangPrimitives(object):
         'num?': lambda n:
             isinstance(n, (float, int)) and not isinstance(n, bool),
         'int?': lambda i: isinstance(i, int) and not isinstance(i, bool),
-        'list?': lambda l: isinstance(l, list)
+        'list?': collections.is_list
     }
 
     TERMINAL_NODES = {
@@ -77,10 +79,14 @@ class BotlangPrimitives(object):
         collections.COMMON_OPERATIONS,
         collections.DICT_OPERATIONS,
         collections.LIST_OPERATIONS,
+        collections.SET_OPERATIONS,
+        streams.STREAM_OPERATIONS,
         math.MATH_PRIMITIVES,
+        arrays.ARRAY_PRIMITIVES,
+        geo.GEO_PRIMITIVES,
+        tables.TABLE_PRIMITIVES,
         random.RANDOM_PRIMITIVES,
         datetime.DATETIME_PRIMITIVES,
-        http.HTTP_PRIMITIVES,
         base64.EXPORT_FUNCTIONS,
         compression.EXPORT_FUNCTIONS,
         exceptions.EXCEPTION_PRIMITIVES
@@ -93,10 +99,11 @@ class BotlangPrimitives(object):
 
         for primitives_group in cls.PRIMITIVE_GROUPS:
             environment.add_primitives(primitives_group)
+        environment.add_async_primitives(http.HTTP_PRIMITIVES)
 
         environment.update({'end-node': make_terminal_node('BOT_ENDED')})
         environment.add_primitives({
-            'input-message': environment.get_last_input_message     # Legacy
+            'input-message': TurnContext.current_input_message
         })
         environment.add_reflective_primitives(reflection.REFLECTIVE_PRIMITIVES)
 
@@ -0,0 +1,67 @@
+from botlang.environment.primitives.collections import find_in_list
+from botlang.evaluation.persistent import PersistentList
+from botlang.evaluation.stream import Stream, MAP, FILTER, ENUMERATE, \
+    TAKE, DROP
+from botlang.evaluation.values import Nil
+
+
+def stream_map(function, collection):
+    return Stream(collection).with_stage(MAP, function)
+
+
+def stream_filter(function, collection):
+    return Stream(collection).with_stage(FILTER, function)
+
+
+def stream_enumerate(collection):
+    return Stream(collection).with_stage(ENUMERATE, None)
+
+
+def take(count, collection):
+    return Stream(collection).with_stage(TAKE, count)
+
+
+def drop(count, collection):
+    return Stream(collection).with_stage(DROP, count)
+
+
+def min_by(key_function, collection):
+    """
+    First element with the smallest key, or nil if there are none
+    """
+    best = Nil
+    best_key = None
+    for element in collection:
+        key = key_function(element)
+        if best is Nil or key < best_key:
+            best = element
+            best_key = key
+    return best
+
+
+def max_by(key_function, collection):
+    """
+    First element with the largest key, or nil if there are none
+    """
+    best = Nil
+    best_key = None
+    for element in collection:
+        key = key_function(element)
+        if best is Nil or key > best_key:
+            best = element
+            best_key = key
+    return best
+
+
+STREAM_OPERATIONS = {
+    'stream': Stream,
+    'stream-map': stream_map,
+    'stream-filter': stream_filter,
+    'stream-enumerate': stream_enumerate,
+    'take': take,
+    'drop': drop,
+    'stream->list': PersistentList.from_iterable,
+    'first-where': find_in_list,
+    'min-by': min_by,
+    'max-by': max_by
+}
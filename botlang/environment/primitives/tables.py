@@ -0,0 +1,30 @@
+from botlang.evaluation.persistent import PersistentList
+from botlang.evaluation.table import Table
+from botlang.evaluation.values import Nil
+
+
+def table_range(table, column, low=Nil, high=Nil):
+    return table.range(column, low, high)
+
+
+def table_sort(table, column, descending=False):
+    return table.sort(column, descending)
+
+
+TABLE_PRIMITIVES = {
+    'make-table': Table.from_records,
+    'table?': lambda value: isinstance(value, Table),
+    'table-columns': lambda table: PersistentList.from_iterable(
+        table.columns
+    ),
+    'table-type': lambda table, column: table.column_type(column),
+    'table-column': lambda table, column: PersistentList.from_iterable(
+        table.column(column)
+    ),
+    'table-rows': lambda table: PersistentList.from_iterable(table),
+    'table-lookup': lambda table, column, value: table.lookup(column, value),
+    'table-find': lambda table, column, value: table.find(column, value),
+    'table-range': table_range,
+    'table-select': lambda table, *columns: table.select(columns),
+    'table-sort': table_sort
+}
@@ -0,0 +1,351 @@
+from botlang.ast.ast_visitor import ASTVisitor
+from botlang.evaluation.evaluator import Evaluator
+from botlang.evaluation.persistent import to_host_value
+from botlang.evaluation.turn_context import TurnContext
+from botlang.evaluation.values import *
+
+
+class SuspensionAnalyzer(ASTVisitor):
+    """
+    Marks every AST node with may_suspend: whether evaluating it may await
+    an asynchronous primitive. A call suspends unless its callee is a
+    global identifier bound to a synchronous primitive or to a closure
+    whose body does not suspend; calls to local functions, and to names
+    the environment does not bind (e.g. functions a module does not
+    export, or that the bot defines later), always may.
+
+    Global names are resolved in the environment given to the analyzer.
+    Mutually recursive closures are assumed not to suspend while their
+    bodies are being analyzed. A node wrongly marked as not suspending
+    (e.g. after that assumption, or when ASTs are shared by systems with
+    different environments) is still evaluated correctly, but its
+    asynchronous primitives block the event loop.
+    """
+    def __init__(self, environment):
+        self.environment = environment
+        self.visiting = set()
+
+    def mark(self, node, may_suspend):
+        node.may_suspend = may_suspend
+        return may_suspend
+
+    def any_suspends(self, nodes):
+        return any([node.accept(self, None) for node in nodes])
+
+    def callee_may_suspend(self, identifier):
+
+        try:
+            value = self.environment.lookup(identifier)
+        except NameError:
+            return True
+        if isinstance(value, AsyncPrimitive):
+            return True
+        if isinstance(value, Primitive):
+            return False
+        if isinstance(value, Closure):
+            return self.closure_may_suspend(value)
+        return True
+
+    def closure_may_suspend(self, closure):
+
+        may_suspend = getattr(closure.body, 'may_suspend', None)
+        if may_suspend is not None:
+            return may_suspend
+        if closure.body in self.visiting:
+            return False
+        self.visiting.add(closure.body)
+        return closure.body.accept(self, None)
+
+    def visit_val(self, val_node, env):
+        return self.mark(val_node, False)
+
+    def visit_list(self, literal_list, env):
+        return self.mark(
+            literal_list,
+            self.any_suspends(literal_list.elements)
+        )
+
+    def visit_if(self, if_node, env):
+        return self.mark(if_node, self.any_suspends(
+            [if_node.cond, if_node.if_true, if_node.if_false]
+        ))
+
+    def visit_cond(self, cond_node, env):
+        return self.mark(
+            cond_node,
+            self.any_suspends(cond_node.cond_clauses)
+        )
+
+    def visit_cond_predicate_clause(self, predicate_node, env):
+        return self.mark(predicate_node, self.any_suspends(
+            [predicate_node.predicate, predicate_node.then_body]
+        ))
+
+    def visit_cond_else_clause(self, else_node, env):
+        return self.mark(else_node, else_node.then_body.accept(self, env))
+
+    def visit_and(self, and_node, env):
+        return self.mark(
+            and_node,
+            self.any_suspends([and_node.cond1, and_node.cond2])
+        )
+
+    def visit_or(self, or_node, env):
+        return self.mark(
+            or_node,
+            self.any_suspends([or_node.cond1, or_node.cond2])
+        )
+
+    def visit_id(self, id_node, env):
+        return self.mark(id_node, False)
+
+    def visit_fun(self, fun_node, env):
+        fun_node.body.accept(self, env)
+        return self.mark(fun_node, False)
+
+    def visit_bot_node(self, bot_node, env):
+        bot_node.body.accept(self, env)
+        return self.mark(bot_node, False)
+
+    def visit_bot_result(self, bot_result, env):
+        return self.mark(bot_result, self.any_suspends(
+            [bot_result.data, bot_result.message, bot_result.next_node]
+        ))
+
+    def visit_app(self, app_node, env):
+        subexpressions_suspend = self.any_suspends(
+            [app_node.fun_expr] + app_node.arg_exprs
+        )
+        if app_node.call_site_cacheable:
+            callee_may_suspend = self.callee_may_suspend(
+                app_node.fun_expr.identifier
+            )
+        else:
+            callee_may_suspend = True
+        return self.mark(
+            app_node,
+            subexpressions_suspend or callee_may_suspend
+        )
+
+    def visit_body(self, body_node, env):
+        return self.mark(
+            body_node,
+            self.any_suspends(body_node.expressions)
+        )
+
+    def visit_definition(self, def_node, env):
+        return self.mark(def_node, def_node.expr.accept(self, env))
+
+    def visit_local(self, local_node, env):
+        return self.mark(local_node, self.any_suspends(
+            local_node.definitions + [local_node.body]
+        ))
+
+    def visit_module_definition(self, module_node, env):
+        return self.mark(module_node, False)
+
+    def visit_module_import(self, require_node, env):
+        return self.mark(require_node, False)
+
+    def visit_module_function_export(self, provide_node, env):
+        return self.mark(provide_node, False)
+
+    def visit_define_syntax(self, define_syntax_node, env):
+        return self.mark(define_syntax_node, False)
+
+
+class AsyncEvaluator(object):
+    """
+    Evaluates bot turns as coroutines. Only the AST nodes that may await an
+    asynchronous primitive are evaluated here; every other subtree is
+    delegated to a synchronous Evaluator, so purely computational code runs
+    through the same code path as a synchronous turn.
+    """
+    def __init__(self, module_resolver, environment, executor=None):
+        """
+        :param module_resolver: ModuleResolver
+        :param environment: environment whose primitives decide which calls
+            may suspend
+        :param executor: concurrent.futures executor for the asynchronous
+            primitives without a coroutine function. By default, the event
+            loop's
+        """
+        self.evaluator = Evaluator(module_resolver=module_resolver)
+        self.execution_stack = self.evaluator.execution_stack
+        self.environment = environment
+        self.executor = executor
+
+    async def evaluate(self, node, env):
+
+        may_suspend = getattr(node, 'may_suspend', None)
+        if may_suspend is None:
+            analyzer = SuspensionAnalyzer(self.environment)
+            may_suspend = node.accept(analyzer, None)
+        if may_suspend:
+            return await node.accept(self, env)
+        return node.accept(self.evaluator, env)
+
+    async def handle(self, compiled_bot, input_msg, next_node, data):
+        """
+        Asynchronous counterpart of CompiledBot.handle
+        """
+        from botlang import BotlangSystem
+
+        node = compiled_bot.entry_node(next_node)
+        if node is None:
+            return to_host_value(compiled_bot.result)
+
+        with TurnContext(input_msg, self.evaluator):
+            try:
+                return to_host_value(
+                    await self.apply_node(node, data, input_msg)
+                )
+            except Exception as e:
+                raise BotlangSystem.wrap_exception(e, self.evaluator)
+
+    async def apply_node(self, node, data, input_msg=None):
+        """
+        Asynchronous counterpart of BotNodeValue.apply
+        """
+        if input_msg is not None and len(node.params) == 2:
+            return await self.apply_closure(node, [data, input_msg])
+        return await self.apply_closure(node, [data])
+
+    async def apply_closure(self, closure, arg_vals):
+
+        if len(closure.params) != len(arg_vals):
+            raise InvalidArgumentsException(len(closure.params), len(arg_vals))
+        return await self.evaluate(
+            closure.body,
+            closure.env.new_local_environment(
+                dict(zip(closure.params, arg_vals))
+            )
+        )
+
+    async def visit_list(self, literal_list, env):
+        return [
+            await self.evaluate(element, env)
+            for element in literal_list.elements
+        ]
+
+    async def visit_if(self, if_node, env):
+
+        self.execution_stack.append(if_node)
+        condition = await self.evaluate(if_node.cond, env)
+        self.execution_stack.pop()
+        if condition:
+            return await self.evaluate(if_node.if_true, env)
+        return await self.evaluate(if_node.if_false, env)
+
+    async def visit_cond(self, cond_node, env):
+
+        self.execution_stack.append(cond_node)
+        value = None
+        for clause in cond_node.cond_clauses:
+            value = await self.evaluate(clause, env)
+            if value is not None:
+                break
+        self.execution_stack.pop()
+        return value
+
+    async def visit_cond_predicate_clause(self, predicate_node, env):
+
+        self.execution_stack.append(predicate_node)
+        value = None
+        if await self.evaluate(predicate_node.predicate, env):
+            value = await self.evaluate(predicate_node.then_body, env)
+        self.execution_stack.pop()
+        return value
+
+    async def visit_cond_else_clause(self, else_node, env):
+
+        self.execution_stack.append(else_node)
+        value = await self.evaluate(else_node.then_body, env)
+        self.execution_stack.pop()
+        return value
+
+    async def visit_and(self, and_node, env):
+
+        self.execution_stack.append(and_node)
+        result = await self.evaluate(and_node.cond1, env)
+        if result:
+            result = await self.evaluate(and_node.cond2, env)
+        self.execution_stack.pop()
+        return result
+
+    async def visit_or(self, or_node, env):
+
+        self.execution_stack.append(or_node)
+        result = await self.evaluate(or_node.cond1, env)
+        if not result:
+            result = await self.evaluate(or_node.cond2, env)
+        self.execution_stack.pop()
+        return result
+
+    async def visit_bot_result(self, bot_result_node, env):
+
+        self.execution_stack.append(bot_result_node)
+        data = await self.evaluate(bot_result_node.data, env)
+        message = await self.evaluate(bot_result_node.message, env)
+        next_node = await self.evaluate(bot_result_node.next_node, env)
+        self.execution_stack.pop()
+        return BotResultValue(data, message, next_node)
+
+    async def visit_app(self, app_node, env):
+
+        self.execution_stack.append(app_node)
+        if app_node.call_site_cacheable:
+            fun_val = self.evaluator.cached_callee(app_node, env)
+        else:
+            fun_val = await self.evaluate(app_node.fun_expr, env)
+        arg_vals = [
+            await self.evaluate(arg, env) for arg in app_node.arg_exprs
+        ]
+
+        if isinstance(fun_val, AsyncPrimitive):
+            result = await fun_val.apply_async(
+                *arg_vals,
+                executor=self.executor
+            )
+        elif isinstance(fun_val, BotNodeValue):
+            result = await self.apply_node(fun_val, *arg_vals)
+        elif type(fun_val) is Closure:
+            result = await self.apply_closure(fun_val, arg_vals)
+        elif isinstance(fun_val, FunVal):
+            if fun_val.is_reflective():
+                result = fun_val.apply(env, *arg_vals)
+            else:
+                result = fun_val.apply(*arg_vals)
+        else:
+            raise Exception(
+                'Invalid function application: {0} is not a function'.format(
+                    fun_val
+                )
+            )
+        self.execution_stack.pop()
+        return result
+
+    async def visit_body(self, body_node, env):
+
+        self.execution_stack.append(body_node)
+        for expr in body_node.expressions[0:-1]:
+            await self.evaluate(expr, env)
+        result = await self.evaluate(body_node.expressions[-1], env)
+        self.execution_stack.pop()
+        return result
+
+    async def visit_definition(self, def_node, env):
+
+        self.execution_stack.append(def_node)
+        env.update({def_node.name: await self.evaluate(def_node.expr, env)})
+        self.execution_stack.pop()
+
+    async def visit_local(self, local_node, env):
+
+        self.execution_stack.append(local_node)
+        new_env = env.new_local_environment()
+        for definition in local_node.definitions:
+            await self.evaluate(definition, new_env)
+        result = await self.evaluate(local_node.body, new_env)
+        self.execution_stack.pop()
+        return result
@@ -0,0 +1,159 @@
+from botlang.ast.ast import Id
+from botlang.ast.ast_visitor import ASTVisitor
+
+
+class CallSiteAnalyzer(ASTVisitor):
+    """
+    Marks the function applications whose callee is an identifier that no
+    enclosing lexical scope binds. Those callees are always resolved in a
+    global scope, so their call sites can keep an inline cache.
+
+    The environment argument is the set of locally bound names, or None
+    when a local scope may bind arbitrary names (e.g. a local 'require').
+    """
+    def visit_app(self, app_node, local_names):
+
+        if app_node.call_site_cacheable is not None:
+            return app_node
+
+        app_node.call_site_cacheable = \
+            local_names is not None \
+            and isinstance(app_node.fun_expr, Id) \
+            and app_node.fun_expr.identifier not in local_names
+
+        app_node.fun_expr.accept(self, local_names)
+        for arg in app_node.arg_exprs:
+            arg.accept(self, local_names)
+        return app_node
+
+    def visit_fun(self, fun_node, local_names):
+
+        scope = self.inner_scope(local_names, fun_node.params, [fun_node.body])
+        fun_node.body.accept(self, scope)
+        return fun_node
+
+    def visit_bot_node(self, bot_node, local_names):
+
+        scope = self.inner_scope(local_names, bot_node.params, [bot_node.body])
+        bot_node.body.accept(self, scope)
+        return bot_node
+
+    def visit_local(self, local_node, local_names):
+
+        scope = self.inner_scope(
+            local_names,
+            [],
+            local_node.definitions + [local_node.body]
+        )
+        for definition in local_node.definitions:
+            definition.accept(self, scope)
+        local_node.body.accept(self, scope)
+        return local_node
+
+    @classmethod
+    def inner_scope(cls, local_names, params, nodes):
+
+        finder = LocalDefinitionsFinder()
+        for node in nodes:
+            node.accept(finder, None)
+
+        if local_names is None or finder.has_imports:
+            return None
+        return local_names.union(params, finder.names)
+
+    @classmethod
+    def analyze(cls, ast_seq):
+
+        analyzer = cls()
+        for ast in ast_seq:
+            ast.accept(analyzer, frozenset())
+        return ast_seq
+
+
+class LocalDefinitionsFinder(ASTVisitor):
+    """
+    Finds the names a scope's own definitions bind, without entering
+    nested scopes
+    """
+    def __init__(self):
+        self.names = set()
+        self.has_imports = False
+
+    def visit_definition(self, def_node, env):
+        self.names.add(def_node.name)
+        def_node.expr.accept(self, env)
+        return def_node
+
+    def visit_module_import(self, require_node, env):
+        self.has_imports = True
+        return require_node
+
+    def visit_fun(self, fun_node, env):
+        return fun_node
+
+    def visit_bot_node(self, bot_node, env):
+        return bot_node
+
+    def visit_local(self, local_node, env):
+        return local_node
+
+    def visit_module_definition(self, module_node, env):
+        return module_node
+
+
+class CallSiteProfiler(ASTVisitor):
+    """
+    Collects inline cache statistics from analyzed call sites
+    """
+    def __init__(self):
+        self.call_sites = []
+        self.visited = set()
+
+    def visit_app(self, app_node, env):
+
+        if id(app_node) in self.visited:
+            return app_node
+        self.visited.add(id(app_node))
+
+        if app_node.call_site_cacheable:
+            self.call_sites.append(app_node)
+        app_node.fun_expr.accept(self, env)
+        for arg in app_node.arg_exprs:
+            arg.accept(self, env)
+        return app_node
+
+    @classmethod
+    def report(cls, ast_seq):
+        """
+        :param ast_seq: list[ASTNode]
+        :return: dict with global and per call site hits, misses and hit rate
+        """
+        profiler = cls()
+        for ast in ast_seq:
+            ast.accept(profiler, None)
+
+        call_sites = [
+            {
+                'source_id': app.s_expr.source_reference.source_id,
+                'line': app.s_expr.source_reference.start_line,
+                'code': app.s_expr.code.split('\n')[0],
+                'hits': app.cache_hits,
+                'misses': app.cache_misses,
+                'hit_rate': cls.hit_rate(app.cache_hits, app.cache_misses)
+            }
+            for app in profiler.call_sites
+        ]
+        hits = sum(site['hits'] for site in call_sites)
+        misses = sum(site['misses'] for site in call_sites)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': cls.hit_rate(hits, misses),
+            'call_sites': call_sites
+        }
+
+    @classmethod
+    def hit_rate(cls, hits, misses):
+
+        total = hits + misses
+        return float(hits) / total if total > 0 else 0.0
@@ -0,0 +1,291 @@
+import struct
+import zlib
+from collections import OrderedDict
+
+from botlang.evaluation.persistent import PersistentDict, PersistentList
+from botlang.evaluation.values import BotResultValue, NativeException, Nil, \
+    TerminalNode, TrackedDict
+
+
+class CodecException(Exception):
+
+    def __init__(self, message):
+        super(CodecException, self).__init__(message)
+
+
+# Tags followed by a varint: a length, index or (zigzag) integer
+STRING_REF = 0
+STRING = 1
+DICT = 2
+ORDERED_DICT = 3
+LIST = 4
+TUPLE = 5
+INT = 6
+BYTES = 7
+# Tags followed by a fixed size value, nested values or nothing
+FLOAT = 8
+TRUE = 9
+FALSE = 10
+NONE = 11
+NIL = 12
+NATIVE_EXCEPTION = 13
+TERMINAL_NODE = 14
+BOT_RESULT = 15
+
+MAGIC = 0xB1
+COMPRESSED = 0x01
+
+DOUBLE = struct.Struct('>d')
+
+
+class Encoder(object):
+    """
+    Writes values in tag-length-value form. Every string is written once;
+    repetitions (e.g. the keys of similar dicts) are references to it.
+    The most frequent types are tested first.
+    """
+    def __init__(self):
+
+        self.buffer = bytearray()
+        self.strings = {}
+
+    def write(self, value):
+
+        buffer = self.buffer
+        value_type = type(value)
+        if value_type is str:
+            index = self.strings.get(value)
+            if index is not None:
+                buffer.append(STRING_REF)
+                self.write_length(index)
+            else:
+                self.strings[value] = len(self.strings)
+                encoded = value.encode('utf-8')
+                buffer.append(STRING)
+                self.write_length(len(encoded))
+                buffer.extend(encoded)
+        elif value_type is dict or value_type is OrderedDict:
+            buffer.append(DICT if value_type is dict else ORDERED_DICT)
+            self.write_length(len(value))
+            write = self.write
+            for key, item in value.items():
+                write(key)
+                write(item)
+        elif value_type is PersistentDict or value_type is TrackedDict:
+            self.write(value.to_dict())
+        elif value_type is PersistentList:
+            self.write(value.to_list())
+        elif value_type is list or value_type is tuple:
+            buffer.append(LIST if value_type is list else TUPLE)
+            self.write_length(len(value))
+            write = self.write
+            for item in value:
+                write(item)
+        elif value_type is bool:
+            buffer.append(TRUE if value else FALSE)
+        elif value_type is int:
+            buffer.append(INT)
+            self.write_length(value * 2 if value >= 0 else -value * 2 - 1)
+        elif value_type is float:
+            buffer.append(FLOAT)
+            buffer.extend(DOUBLE.pack(value))
+        elif value is None:
+            buffer.append(NONE)
+        elif value is Nil:
+            buffer.append(NIL)
+        elif value_type is bytes:
+            buffer.append(BYTES)
+            self.write_varint(len(value))
+            buffer.extend(value)
+        elif value_type is NativeException:
+            buffer.append(NATIVE_EXCEPTION)
+            self.write(value.name)
+            self.write(value.description)
+        elif value_type is TerminalNode:
+            buffer.append(TERMINAL_NODE)
+            self.write(value.state)
+        elif value_type is BotResultValue:
+            buffer.append(BOT_RESULT)
+            self.write(value.data)
+            self.write(value.message)
+            self.write(value.next_node)
+            self.write(value.bot_state)
+        elif hasattr(value_type, 'to_list'):
+            # Streams and numeric arrays
+            self.write(value.to_list())
+        else:
+            raise CodecException(
+                'Values of type {0} can not be encoded'.format(
+                    value_type.__name__
+                )
+            )
+
+    def write_length(self, number):
+
+        if number > 0x7F:
+            self.write_varint(number)
+        else:
+            self.buffer.append(number)
+
+    def write_varint(self, number):
+
+        buffer = self.buffer
+        while number > 0x7F:
+            buffer.append((number & 0x7F) | 0x80)
+            number >>= 7
+        buffer.append(number)
+
+
+class Decoder(object):
+    """
+    Reads values written by the Encoder. Positions are passed along
+    instead of kept in the decoder, the most frequent tags are tested
+    first and one-byte varints are read inline.
+    """
+    def __init__(self, data):
+
+        self.data = data
+        self.strings = []
+
+    def read(self, position):
+        """
+        :return: (value, position after the value)
+        """
+        data = self.data
+        tag = data[position]
+        if tag < FLOAT:
+            length = data[position + 1]
+            if length < 0x80:
+                position += 2
+            else:
+                length, position = self.read_varint(position + 1)
+
+            if tag == STRING_REF:
+                return self.strings[length], position
+            if tag == STRING:
+                end = position + length
+                value = data[position:end].decode('utf-8')
+                self.strings.append(value)
+                return value, end
+            if tag == DICT or tag == ORDERED_DICT:
+                read = self.read
+                pairs = []
+                for _ in range(length):
+                    key, position = read(position)
+                    value, position = read(position)
+                    pairs.append((key, value))
+                return dict(pairs) if tag == DICT else OrderedDict(pairs), \
+                    position
+            if tag == LIST or tag == TUPLE:
+                read = self.read
+                items = []
+                for _ in range(length):
+                    value, position = read(position)
+                    items.append(value)
+                return items if tag == LIST else tuple(items), position
+            if tag == INT:
+                value = length >> 1 if not length & 1 \
+                    else -((length + 1) >> 1)
+                return value, position
+            end = position + length
+            return bytes(data[position:end]), end
+
+        position += 1
+        if tag == FLOAT:
+            return DOUBLE.unpack_from(data, position)[0], position + 8
+        if tag == TRUE:
+            return True, position
+        if tag == FALSE:
+            return False, position
+        if tag == NONE:
+            return None, position
+        if tag == NIL:
+            return Nil, position
+        if tag == NATIVE_EXCEPTION:
+            name, position = self.read(position)
+            description, position = self.read(position)
+            return NativeException(name, description), position
+        if tag == TERMINAL_NODE:
+            state, position = self.read(position)
+            return TerminalNode(state), position
+        if tag == BOT_RESULT:
+            result = BotResultValue.__new__(BotResultValue)
+            result.data, position = self.read(position)
+            result.message, position = self.read(position)
+            result.next_node, position = self.read(position)
+            result.bot_state, position = self.read(position)
+            result.tracked_data = None
+            return result, position
+        raise CodecException('Unknown value tag {0}'.format(tag))
+
+    def read_varint(self, position):
+        """
+        :return: (number, position after the varint)
+        """
+        data = self.data
+        number = 0
+        shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return number, position
+            shift += 7
+
+
+class BotlangCodec(object):
+    """
+    Compact binary serialization of Botlang runtime values: conversation
+    data (dicts, OrderedDicts, lists, strings, numbers, Nil), native
+    exceptions, terminal nodes and bot results. Functions and bot nodes
+    can not be serialized. PersistentDicts are decoded as OrderedDicts, and
+    PersistentLists, streams and numeric arrays as lists.
+
+    Encoded values start with a two byte header: a magic byte and flags.
+    Bodies larger than the compression threshold are zlib-compressed when
+    that makes them smaller.
+    """
+    COMPRESSION_THRESHOLD = 1024
+
+    @classmethod
+    def encode(cls, value, compression_threshold=COMPRESSION_THRESHOLD):
+        """
+        :param compression_threshold: body size (bytes) above which the
+            body is compressed, or None to never compress
+        :rtype: bytes
+        """
+        encoder = Encoder()
+        encoder.write(value)
+        body = encoder.buffer
+        flags = 0
+        if compression_threshold is not None \
+                and len(body) > compression_threshold:
+            compressed = zlib.compress(bytes(body))
+            if len(compressed) < len(body):
+                body = compressed
+                flags |= COMPRESSED
+        return bytes(bytearray([MAGIC, flags]) + body)
+
+    @classmethod
+    def decode(cls, data):
+        """
+        :raises CodecException: if the data is not a complete encoded value
+        """
+        data = bytearray(data)
+        if len(data) < 3 or data[0] != MAGIC:
+            raise CodecException('Not an encoded Botlang value')
+        try:
+            if data[1] & COMPRESSED:
+                data = bytearray(zlib.decompress(bytes(data[2:])))
+                position = 0
+            else:
+                position = 2
+            value, position = Decoder(data).read(position)
+        except (IndexError, UnicodeDecodeError, struct.error, zlib.error):
+            raise CodecException('Truncated or corrupt encoded value')
+        if position > len(data):
+            raise CodecException('Truncated or corrupt encoded value')
+        if position < len(data):
+            raise CodecException('Trailing bytes after the encoded value')
+        return value
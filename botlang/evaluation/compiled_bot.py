@@ -0,0 +1,185 @@
+import threading
+
+from botlang.evaluation.evaluator import Evaluator
+from botlang.evaluation.persistent import to_host_value
+from botlang.evaluation.turn_context import TurnContext
+from botlang.evaluation.values import BotNodeValue, TrackedDict
+from botlang.modules.dependencies import ModuleDependencyFinder
+from botlang.parser import Parser
+
+
+class CompiledBot(object):
+    """
+    Bot whose top-level forms are evaluated once, into a frozen environment.
+    Each incoming message is dispatched straight to the bot node that must
+    handle it.
+    """
+    def __init__(self, system, bot_ast):
+        """
+        :param system: BotlangSystem
+        :param bot_ast: list[ASTNode]
+        """
+        from botlang import BotlangSystem
+
+        self.system = system
+        self.ast = bot_ast
+        self.environment = system.environment.new_environment()
+        self.evaluator = Evaluator(module_resolver=system.module_resolver)
+        self.result = BotlangSystem.interpret(
+            bot_ast,
+            self.evaluator,
+            self.environment
+        )
+        self.environment.freeze()
+        self.nodes = {
+            name: value
+            for name, value in self.environment.bindings.items()
+            if isinstance(value, BotNodeValue)
+        }
+        self.modules = system.module_resolver.module_closure(set(
+            module_name for ast in bot_ast
+            for module_name in ModuleDependencyFinder.required_by(ast)
+        ))
+
+    def is_current(self):
+        """
+        :return: False if a module the bot transitively requires was
+            reloaded after the bot was compiled
+        """
+        module_resolver = self.system.module_resolver
+        return all(
+            module_resolver.find_module(module_name) is module
+            for module_name, module in self.modules.items()
+        )
+
+    def get_node(self, node_name):
+
+        node = self.nodes.get(node_name)
+        if node is not None:
+            return node
+        return self.environment.lookup(node_name)
+
+    def handle(self, input_msg, next_node=None, data=None):
+        """
+        :param input_msg: incoming message
+        :param next_node: name of the node that must handle the message, or
+            None to use the bot's entry node
+        :param data: conversation data
+        :rtype: BotResultValue
+        """
+        from botlang import BotlangSystem
+
+        data = TrackedDict.track({} if data is None else data)
+
+        node = self.entry_node(next_node)
+        if node is None:
+            return to_host_value(self.result)
+
+        evaluator = Evaluator(module_resolver=self.system.module_resolver)
+        with TurnContext(input_msg, evaluator):
+            return BotlangSystem.apply_node(node, data, input_msg, evaluator)
+
+    def handle_async(
+            self,
+            input_msg,
+            next_node=None,
+            data=None,
+            executor=None
+    ):
+        """
+        Same as handle, but asynchronous primitives (e.g. storage and HTTP)
+        are awaited instead of blocking, so many turns can run concurrently
+        in one event loop. Requires Python 3.5+.
+        :param executor: concurrent.futures executor that runs the blocking
+            functions of asynchronous primitives without a coroutine
+            function. The event loop's default one runs few of them at once
+        :return: coroutine with the BotResultValue
+        """
+        from botlang.evaluation.async_evaluator import AsyncEvaluator
+
+        data = TrackedDict.track({} if data is None else data)
+        evaluator = AsyncEvaluator(
+            self.system.module_resolver,
+            self.environment,
+            executor
+        )
+        return evaluator.handle(self, input_msg, next_node, data)
+
+    def entry_node(self, next_node):
+        """
+        :return: node that must handle the message, or None if the bot
+            evaluates to a value that is not a bot node
+        """
+        if next_node:
+            return self.get_node(next_node)
+        if isinstance(self.result, BotNodeValue):
+            return self.result
+        return None
+
+    def inline_cache_report(self):
+
+        from botlang.evaluation.call_sites import CallSiteProfiler
+        return CallSiteProfiler.report(self.ast)
+
+
+class CompiledBotCache(object):
+    """
+    Compiled bots by bot id. A bot is compiled again when its code changes
+    or when a module it transitively requires is reloaded; the other bots
+    stay compiled. Turns already running keep the CompiledBot they got.
+    """
+    def __init__(self, system):
+
+        self.system = system
+        self.bots = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, bot_id, bot_code, code_hash=None):
+        """
+        :param code_hash: hash of bot_code, if already known
+        :rtype: CompiledBot
+        """
+        if code_hash is None:
+            code_hash = Parser.generate_string_hash(bot_code)
+        entry = self.bots.get(bot_id)
+        if entry is not None and entry[0] == code_hash \
+                and entry[1].is_current():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        compiled_bot = self.system.compile_bot(bot_code, source_id=bot_id)
+        with self.lock:
+            self.bots[bot_id] = (code_hash, compiled_bot)
+        return compiled_bot
+
+    def invalidate_modules(self, module_names):
+        """
+        Drops the bots that transitively require any of the modules
+        :return: set of the dropped bot ids
+        """
+        module_names = set(module_names)
+        with self.lock:
+            invalidated = set(
+                bot_id for bot_id, (code_hash, compiled_bot)
+                in self.bots.items()
+                if module_names.intersection(compiled_bot.modules)
+            )
+            self.bots = {
+                bot_id: entry for bot_id, entry in self.bots.items()
+                if bot_id not in invalidated
+            }
+        return invalidated
+
+    def reload_module(self, module_name, path=None):
+        """
+        Reloads a module (see ModuleResolver.reload_module)
+        :return: set of the bot ids that must be compiled again
+        """
+        reloaded_modules = self.system.module_resolver.reload_module(
+            module_name,
+            path
+        )
+        return self.invalidate_modules(reloaded_modules)
@@ -169,24 +169,105 @@ class Evaluator(ASTVisitor):
     def visit_app(self, app_node, env):
         """
         Function application evaluation.
+
+        Plain primitives and closures are called through arity-specialized
+        fast paths; any other function value goes through its apply method.
         """
         self.execution_stack.append(app_node)
-        fun_val = app_node.fun_expr.accept(self, env)
-        if not isinstance(fun_val, FunVal):
+        if app_node.call_site_cacheable:
+            fun_val = self.cached_callee(app_node, env)
+        else:
+            fun_val = app_node.fun_expr.accept(self, env)
+        fun_type = type(fun_val)
+
+        if fun_type is Primitive:
+            result = self.call_procedure(fun_val.proc, app_node.arg_exprs, env)
+        elif fun_type is Closure:
+            result = self.call_closure(fun_val, app_node.arg_exprs, env)
+        elif isinstance(fun_val, FunVal):
+            arg_vals = [arg.accept(self, env) for arg in app_node.arg_exprs]
+            if fun_val.is_reflective():
+                result = fun_val.apply(env, *arg_vals)
+            else:
+                result = fun_val.apply(*arg_vals)
+        else:
             raise Exception(
                 'Invalid function application: {0} is not a function'.format(
                     fun_val
                 )
             )
-
-        arg_vals = [arg.accept(self, env) for arg in app_node.arg_exprs]
-        if fun_val.is_reflective():
-            result = fun_val.apply(env, *arg_vals)
-        else:
-            result = fun_val.apply(*arg_vals)
         self.execution_stack.pop()
         return result
 
+    def cached_callee(self, app_node, env):
+        """
+        Inline cache of a call site whose callee is a global binding.
+        Entries are valid for one global scope and bindings version.
+        """
+        cache = app_node.inline_cache
+        global_env = env.global_env
+        if cache is not None \
+                and cache[0] == global_env.bindings_version \
+                and cache[1] is global_env:
+            app_node.cache_hits += 1
+            return cache[2]
+
+        version = global_env.bindings_version
+        callee = app_node.fun_expr.accept(self, env)
+        app_node.inline_cache = (version, global_env, callee)
+        app_node.cache_misses += 1
+        return callee
+
+    def call_procedure(self, proc, arg_exprs, env):
+        """
+        Direct invocation of a primitive's Python callable
+        """
+        argc = len(arg_exprs)
+        if argc == 0:
+            return proc()
+        if argc == 1:
+            return proc(arg_exprs[0].accept(self, env))
+        if argc == 2:
+            return proc(
+                arg_exprs[0].accept(self, env),
+                arg_exprs[1].accept(self, env)
+            )
+        if argc == 3:
+            return proc(
+                arg_exprs[0].accept(self, env),
+                arg_exprs[1].accept(self, env),
+                arg_exprs[2].accept(self, env)
+            )
+        return proc(*[arg.accept(self, env) for arg in arg_exprs])
+
+    def call_closure(self, closure, arg_exprs, env):
+        """
+        Closure application. The body is evaluated by this evaluator.
+        """
+        params = closure.params
+        argc = len(arg_exprs)
+        if len(params) != argc:
+            raise InvalidArgumentsException(len(params), argc)
+
+        if argc == 0:
+            bindings = {}
+        elif argc == 1:
+            bindings = {params[0]: arg_exprs[0].accept(self, env)}
+        elif argc == 2:
+            bindings = {
+                params[0]: arg_exprs[0].accept(self, env),
+                params[1]: arg_exprs[1].accept(self, env)
+            }
+        else:
+            bindings = dict(zip(
+                params,
+                [arg.accept(self, env) for arg in arg_exprs]
+            ))
+        return closure.body.accept(
+            self,
+            closure.env.new_local_environment(bindings)
+        )
+
     def visit_body(self, body_node, env):
         """
         Evaluation of a sequence of expressions
@@ -218,7 +299,7 @@ class Evaluator(ASTVisitor):
         Local definition evaluation
         """
         self.execution_stack.append(local_node)
-        new_env = env.new_environment()
+        new_env = env.new_local_environment()
         for definition in local_node.definitions:
             definition.accept(self, new_env)
         result = local_node.body.accept(self, new_env)
@@ -0,0 +1,176 @@
+import heapq
+import math
+
+from botlang.evaluation.persistent import PersistentList
+from botlang.evaluation.values import Nil
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def unit_vector(latitude, longitude):
+    """
+    Point of the unit sphere at a latitude and longitude (degrees)
+    """
+    latitude = math.radians(latitude)
+    longitude = math.radians(longitude)
+    cos_latitude = math.cos(latitude)
+    return (
+        cos_latitude * math.cos(longitude),
+        cos_latitude * math.sin(longitude),
+        math.sin(latitude)
+    )
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km):
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def haversine_km(latitude1, longitude1, latitude2, longitude2):
+
+    d_latitude = math.radians(latitude2 - latitude1)
+    d_longitude = math.radians(longitude2 - longitude1)
+    a = math.sin(d_latitude / 2) ** 2 + \
+        math.cos(math.radians(latitude1)) * \
+        math.cos(math.radians(latitude2)) * \
+        math.sin(d_longitude / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class GeoIndex(object):
+    """
+    KD-tree over records with a latitude and a longitude, for nearest,
+    k-nearest and radius queries in O(log n) instead of a distance
+    computation per record.
+
+    Records are indexed by their point on the unit sphere: the straight
+    line (chord) distance between two such points grows with their great
+    circle distance, so the 3-d tree finds exactly the nearest records on
+    the Earth's surface. Leaves hold up to LEAF_SIZE records. Ties are
+    broken in favour of the record that comes first.
+
+    An index is immutable; built at the top level of a bot, it is computed
+    once per compiled bot and shared by all its turns.
+    """
+    LEAF_SIZE = 8
+
+    def __init__(self, records, latitude_key=1, longitude_key=2):
+        """
+        :param records: lists or dicts with the latitude and longitude
+            (degrees) of each record
+        :param latitude_key: index or key of the latitude in a record
+        :param longitude_key: index or key of the longitude in a record
+        """
+        self.records = list(records)
+        self.points = [
+            unit_vector(
+                float(record[latitude_key]),
+                float(record[longitude_key])
+            )
+            for record in self.records
+        ]
+        self.root = self.build(list(range(len(self.records))))
+
+    def build(self, indexes):
+        """
+        :return: a leaf (list of record indexes) or an inner node (tuple of
+            axis, split coordinate, lower subtree, upper subtree)
+        """
+        if len(indexes) <= self.LEAF_SIZE:
+            return indexes
+        points = self.points
+        axis = max(range(3), key=lambda coordinate: (
+            max(points[index][coordinate] for index in indexes) -
+            min(points[index][coordinate] for index in indexes)
+        ))
+        indexes.sort(key=lambda index: points[index][axis])
+        middle = len(indexes) // 2
+        return (
+            axis,
+            points[indexes[middle]][axis],
+            self.build(indexes[:middle]),
+            self.build(indexes[middle:])
+        )
+
+    def search(self, latitude, longitude, count=None, max_km=None):
+        """
+        :param count: maximum number of records, or None for no limit
+        :param max_km: maximum distance, or None for no limit
+        :return: list of (chord distance, record index), nearest first
+        """
+        if max_km is not None and max_km < 0:
+            raise ValueError('Negative radius {0} km'.format(max_km))
+        point = unit_vector(latitude, longitude)
+        points = self.points
+        # Max-heap of the best matches so far: (-squared distance, -index)
+        best = []
+        bound = [float('inf') if max_km is None else km_to_chord(max_km) ** 2]
+
+        def visit(node):
+
+            if type(node) is list:
+                for index in node:
+                    other = points[index]
+                    distance = (point[0] - other[0]) ** 2 + \
+                        (point[1] - other[1]) ** 2 + \
+                        (point[2] - other[2]) ** 2
+                    if distance > bound[0]:
+                        continue
+                    entry = (-distance, -index)
+                    if count is None or len(best) < count:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+                    else:
+                        continue
+                    if count is not None and len(best) == count:
+                        bound[0] = -best[0][0]
+                return
+
+            axis, split, lower, upper = node
+            difference = point[axis] - split
+            near, far = (lower, upper) if difference < 0 else (upper, lower)
+            visit(near)
+            if difference * difference <= bound[0]:
+                visit(far)
+
+        if count is None or count > 0:
+            visit(self.root)
+        return sorted(
+            (math.sqrt(-distance), -index) for distance, index in best
+        )
+
+    def nearest(self, latitude, longitude):
+        """
+        :return: nearest record, or nil if the index is empty
+        """
+        found = self.search(latitude, longitude, 1)
+        return self.records[found[0][1]] if found else Nil
+
+    def k_nearest(self, latitude, longitude, count):
+        """
+        :return: the count nearest records, nearest first
+        """
+        return PersistentList.from_iterable(
+            self.records[index]
+            for chord, index in self.search(latitude, longitude, count)
+        )
+
+    def within_radius(self, latitude, longitude, km):
+        """
+        :return: records at most km away, nearest first
+        """
+        return PersistentList.from_iterable(
+            self.records[index]
+            for chord, index in self.search(latitude, longitude, None, km)
+        )
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return '<geo index of {0} records>'.format(len(self.records))
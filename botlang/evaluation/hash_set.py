@@ -0,0 +1,122 @@
+from collections.abc import Set
+
+
+class HashSet(Set):
+    """
+    Immutable set with O(1) membership checks. It iterates in insertion
+    order, so results converted to lists are deterministic; operations
+    keep the order of their first operand followed by the new elements of
+    the second.
+
+    Adding or removing one element copies the set: sets are meant to be
+    built once from a collection (e.g. at the top level of a bot) and then
+    queried.
+    """
+    __slots__ = ('elements', 'members')
+
+    @classmethod
+    def from_iterable(cls, iterable):
+
+        if isinstance(iterable, HashSet):
+            return iterable
+        elements = []
+        members = set()
+        for element in iterable:
+            if element not in members:
+                members.add(element)
+                elements.append(element)
+        return cls(tuple(elements), frozenset(members))
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Used by the & | - ^ operators of Set
+        return cls.from_iterable(iterable)
+
+    def __init__(self, elements=(), members=None):
+        """
+        :param elements: distinct elements, in order
+        :param members: frozenset of the elements
+        """
+        self.elements = elements
+        self.members = frozenset(elements) if members is None else members
+
+    def add(self, element):
+
+        if element in self.members:
+            return self
+        return HashSet(self.elements + (element,), self.members | {element})
+
+    def remove(self, element):
+
+        if element not in self.members:
+            return self
+        return HashSet(
+            tuple(other for other in self.elements if other != element),
+            self.members - {element}
+        )
+
+    def union(self, other):
+
+        members = self.members
+        new_elements = []
+        new_members = set()
+        for element in other:
+            if element not in members and element not in new_members:
+                new_members.add(element)
+                new_elements.append(element)
+        if not new_elements:
+            return self
+        return HashSet(
+            self.elements + tuple(new_elements),
+            members | new_members
+        )
+
+    def intersection(self, other):
+
+        other = HashSet.from_iterable(other)
+        return HashSet(tuple(
+            element for element in self.elements if element in other.members
+        ))
+
+    def difference(self, other):
+
+        other = HashSet.from_iterable(other)
+        return HashSet(tuple(
+            element for element in self.elements
+            if element not in other.members
+        ))
+
+    def __contains__(self, element):
+        try:
+            return element in self.members
+        except TypeError:   # Unhashable elements are never members
+            return False
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def to_list(self):
+        return list(self.elements)
+
+    def __hash__(self):
+        return hash(self.members)
+
+    def __eq__(self, other):
+
+        if isinstance(other, HashSet):
+            return self.members == other.members
+        return Set.__eq__(self, other)
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __reduce__(self):
+        return HashSet, (self.elements,)
+
+    def __repr__(self):
+        return 'set({0!r})'.format(list(self.elements))
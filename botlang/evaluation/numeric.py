@@ -0,0 +1,488 @@
+import itertools
+import math
+import operator as op
+from array import array
+
+from botlang.evaluation.values import Nil
+
+try:
+    import numpy
+except ImportError:     # Optional: pip install botlang[numpy]
+    numpy = None
+
+
+NAN = float('nan')
+INF = float('inf')
+
+
+def is_odd_integer(number):
+    return math.isfinite(number) and float(number).is_integer() \
+        and int(number) % 2 == 1
+
+
+def ieee_div(a, b):
+    """
+    Division with NumPy's results when dividing by zero
+    """
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return NAN
+        return math.copysign(INF, a) * math.copysign(1.0, b)
+
+
+def ieee_pow(a, b):
+    """
+    math.pow with NumPy's results instead of domain and overflow errors
+    """
+    try:
+        return math.pow(a, b)
+    except ValueError:
+        if a == 0:
+            # Zero to a negative power
+            return math.copysign(INF, a) if is_odd_integer(b) else INF
+        return NAN
+    except OverflowError:
+        return -INF if a < 0 and is_odd_integer(b) else INF
+
+
+def nan_on_domain_error(function):
+
+    def ieee_function(value):
+        try:
+            return function(value)
+        except ValueError:
+            return NAN
+    return ieee_function
+
+
+def ieee_sum(values):
+    """
+    Correctly rounded sum, so both backends give the same result
+    """
+    try:
+        return math.fsum(values)
+    except ValueError:      # inf - inf
+        return NAN
+    except OverflowError:
+        return sum(values)
+
+
+def first_nan(values):
+    """
+    :return: index of the first NaN, or None
+    """
+    if not any(map(math.isnan, values)):
+        return None
+    for index, value in enumerate(values):
+        if value != value:
+            return index
+
+
+class ArrayBackend(object):
+    """
+    Pure Python storage: array.array of doubles for numbers and of bytes
+    for masks. Operations loop in Python, but over unboxed values and
+    without calling Botlang functions.
+
+    Results follow NumPy's: division by zero, domain errors and overflows
+    give infinities and NaNs instead of raising, and argmin and argmax
+    return the first NaN if there is one. Operations first run the plain
+    math functions, and only run the IEEE versions above when those
+    raise.
+    """
+    name = 'array'
+
+    BINARY = {
+        'add': op.add,
+        'sub': op.sub,
+        'mul': op.mul,
+        'div': op.truediv,
+        'pow': math.pow,
+        'atan2': math.atan2
+    }
+    UNARY = {
+        'neg': op.neg,
+        'abs': abs,
+        'sin': math.sin,
+        'cos': math.cos,
+        'tan': math.tan,
+        'sqrt': math.sqrt,
+        'radians': math.radians
+    }
+    IEEE_BINARY = {
+        'div': ieee_div,
+        'pow': ieee_pow
+    }
+    COMPARISONS = {
+        'lt': op.lt,
+        'le': op.le,
+        'gt': op.gt,
+        'ge': op.ge,
+        'eq': op.eq,
+        'and': lambda a, b: bool(a) and bool(b),
+        'or': lambda a, b: bool(a) or bool(b)
+    }
+
+    @classmethod
+    def numbers(cls, values):
+        return array('d', values)
+
+    @classmethod
+    def mask(cls, values):
+        return array('b', [1 if value else 0 for value in values])
+
+    @classmethod
+    def to_list(cls, values, is_mask):
+
+        if is_mask:
+            return [value == 1 for value in values]
+        return values.tolist()
+
+    @classmethod
+    def pairs(cls, a, b):
+
+        if isinstance(a, array) and isinstance(b, array):
+            return zip(a, b)
+        if isinstance(a, array):
+            return zip(a, itertools.repeat(b))
+        return zip(itertools.repeat(a), b)
+
+    @classmethod
+    def binary(cls, name, a, b):
+
+        function = cls.BINARY[name]
+        try:
+            return array('d', [function(x, y) for x, y in cls.pairs(a, b)])
+        except (ZeroDivisionError, ValueError, OverflowError):
+            function = cls.IEEE_BINARY[name]
+            return array('d', [function(x, y) for x, y in cls.pairs(a, b)])
+
+    @classmethod
+    def unary(cls, name, a):
+
+        try:
+            return array('d', map(cls.UNARY[name], a))
+        except ValueError:
+            return array('d', map(nan_on_domain_error(cls.UNARY[name]), a))
+
+    @classmethod
+    def compare(cls, name, a, b):
+
+        function = cls.COMPARISONS[name]
+        return array(
+            'b',
+            [1 if function(x, y) else 0 for x, y in cls.pairs(a, b)]
+        )
+
+    @classmethod
+    def logical_not(cls, a):
+        return array('b', [0 if value else 1 for value in a])
+
+    @classmethod
+    def select(cls, a, mask):
+        return array('d', itertools.compress(a, mask))
+
+    @classmethod
+    def count(cls, a):
+        return len(a) - a.count(0)
+
+    @classmethod
+    def sum(cls, a):
+        return ieee_sum(a)
+
+    @classmethod
+    def argmin(cls, a):
+
+        nan_index = first_nan(a)
+        if nan_index is not None:
+            return nan_index
+        return min(range(len(a)), key=a.__getitem__)
+
+    @classmethod
+    def argmax(cls, a):
+
+        nan_index = first_nan(a)
+        if nan_index is not None:
+            return nan_index
+        return max(range(len(a)), key=a.__getitem__)
+
+
+class NumpyBackend(object):
+    """
+    NumPy storage: float64 and bool ndarrays, operated on by ufuncs. Its
+    floating point warnings are silenced: infinities and NaNs are the
+    results, as in ArrayBackend.
+    """
+    name = 'numpy'
+
+    BINARY = {
+        'add': 'add',
+        'sub': 'subtract',
+        'mul': 'multiply',
+        'div': 'true_divide',
+        'pow': 'power',
+        'atan2': 'arctan2'
+    }
+    UNARY = {
+        'neg': 'negative',
+        'abs': 'absolute',
+        'sin': 'sin',
+        'cos': 'cos',
+        'tan': 'tan',
+        'sqrt': 'sqrt',
+        'radians': 'radians'
+    }
+    COMPARISONS = {
+        'lt': 'less',
+        'le': 'less_equal',
+        'gt': 'greater',
+        'ge': 'greater_equal',
+        'eq': 'equal',
+        'and': 'logical_and',
+        'or': 'logical_or'
+    }
+
+    @classmethod
+    def numbers(cls, values):
+        return numpy.array(values, dtype=numpy.float64)
+
+    @classmethod
+    def mask(cls, values):
+        return numpy.array(values, dtype=numpy.bool_)
+
+    @classmethod
+    def to_list(cls, values, is_mask):
+        return values.tolist()
+
+    @classmethod
+    def binary(cls, name, a, b):
+
+        with numpy.errstate(all='ignore'):
+            return getattr(numpy, cls.BINARY[name])(a, b)
+
+    @classmethod
+    def unary(cls, name, a):
+
+        with numpy.errstate(all='ignore'):
+            return getattr(numpy, cls.UNARY[name])(a)
+
+    @classmethod
+    def compare(cls, name, a, b):
+        return getattr(numpy, cls.COMPARISONS[name])(a, b)
+
+    @classmethod
+    def logical_not(cls, a):
+        return numpy.logical_not(a)
+
+    @classmethod
+    def select(cls, a, mask):
+        return a[mask]
+
+    @classmethod
+    def count(cls, a):
+        return int(numpy.count_nonzero(a))
+
+    @classmethod
+    def sum(cls, a):
+        return ieee_sum(a.tolist())
+
+    @classmethod
+    def argmin(cls, a):
+        return int(a.argmin())
+
+    @classmethod
+    def argmax(cls, a):
+        return int(a.argmax())
+
+
+class NumericArray(object):
+    """
+    Array of floats, or of booleans (a mask), with element-wise operations
+    and reductions that run in the backend instead of calling a Botlang
+    function per element. + - * / also work element-wise on arrays, with
+    arrays or numbers as the other operand.
+
+    The backend is NumPy when it is installed, and the array module
+    otherwise.
+    """
+    backend = NumpyBackend if numpy is not None else ArrayBackend
+
+    @classmethod
+    def from_iterable(cls, values, is_mask=False):
+        """
+        :param values: numbers (booleans for a mask), or a NumericArray
+        """
+        if isinstance(values, NumericArray):
+            return values
+        values = list(values)
+        if is_mask:
+            return cls(cls.backend.mask(values), True)
+        return cls(cls.backend.numbers(values))
+
+    @classmethod
+    def operand(cls, value):
+        """
+        :return: backend storage of an array or list, or a number as it is
+        """
+        if isinstance(value, NumericArray):
+            return value.values
+        if isinstance(value, (int, float)):
+            return value
+        return cls.from_iterable(value).values
+
+    def __init__(self, values, is_mask=False):
+        """
+        :param values: backend storage
+        """
+        self.values = values
+        self.is_mask = is_mask
+
+    def same_length_operand(self, other):
+        """
+        :return: operand of an element-wise operation with this array.
+            Arrays must have the same length: none is broadcast.
+        """
+        operand = self.operand(other)
+        if not isinstance(operand, (int, float)) \
+                and len(operand) != len(self):
+            raise ValueError(
+                'Arrays of length {0} and {1} can not be combined'.format(
+                    len(self), len(operand)
+                )
+            )
+        return operand
+
+    def binary(self, name, other):
+
+        return NumericArray(self.backend.binary(
+            name,
+            self.values,
+            self.same_length_operand(other)
+        ))
+
+    def reflected(self, name, other):
+
+        return NumericArray(self.backend.binary(
+            name,
+            self.same_length_operand(other),
+            self.values
+        ))
+
+    def unary(self, name):
+        return NumericArray(self.backend.unary(name, self.values))
+
+    def compare(self, name, other):
+
+        return NumericArray(
+            self.backend.compare(
+                name,
+                self.values,
+                self.same_length_operand(other)
+            ),
+            True
+        )
+
+    def logical_not(self):
+        return NumericArray(self.backend.logical_not(self.values), True)
+
+    def select(self, mask):
+        """
+        :return: array with the elements where the mask is true
+        """
+        if not isinstance(mask, NumericArray):
+            mask = NumericArray.from_iterable(mask, True)
+        if len(mask) != len(self):
+            raise ValueError(
+                'A mask of length {0} can not select from an array of '
+                'length {1}'.format(len(mask), len(self))
+            )
+        return NumericArray(self.backend.select(self.values, mask.values))
+
+    def sum(self):
+        return self.backend.sum(self.values) if len(self) else 0.0
+
+    def min(self):
+        return self[self.backend.argmin(self.values)] if len(self) else Nil
+
+    def max(self):
+        return self[self.backend.argmax(self.values)] if len(self) else Nil
+
+    def argmin(self):
+        """
+        :return: index of the first smallest element (or of the first
+            NaN), or nil if empty
+        """
+        return self.backend.argmin(self.values) if len(self) else Nil
+
+    def argmax(self):
+        return self.backend.argmax(self.values) if len(self) else Nil
+
+    def count(self):
+        """
+        :return: number of true (non-zero) elements
+        """
+        return self.backend.count(self.values)
+
+    def __add__(self, other):
+        return self.binary('add', other)
+
+    def __radd__(self, other):
+        return self.reflected('add', other)
+
+    def __sub__(self, other):
+        return self.binary('sub', other)
+
+    def __rsub__(self, other):
+        return self.reflected('sub', other)
+
+    def __mul__(self, other):
+        return self.binary('mul', other)
+
+    def __rmul__(self, other):
+        return self.reflected('mul', other)
+
+    def __truediv__(self, other):
+        return self.binary('div', other)
+
+    def __rtruediv__(self, other):
+        return self.reflected('div', other)
+
+    def __neg__(self):
+        return self.unary('neg')
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+
+        value = self.values[index]
+        return bool(value) if self.is_mask else float(value)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self):
+        return self.backend.to_list(self.values, self.is_mask)
+
+    __hash__ = None
+
+    def __eq__(self, other):
+
+        if isinstance(other, NumericArray):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __reduce__(self):
+        return NumericArray.from_iterable, (self.to_list(), self.is_mask)
+
+    def __repr__(self):
+        return 'array({0!r})'.format(self.to_list())
@@ -0,0 +1,535 @@
+import operator
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping, Sequence
+from operator import itemgetter
+
+
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+BITS = 5
+BRANCH_MASK = (1 << BITS) - 1
+
+# Leaves are tuples (hash, key, value, insertion index)
+LEAF_HASH = 0
+LEAF_KEY = 1
+LEAF_VALUE = 2
+LEAF_INDEX = 3
+
+leaf_index = itemgetter(LEAF_INDEX)
+
+
+def popcount(number):
+    return bin(number).count('1')
+
+
+class HamtNode(object):
+    """
+    Node of a hash array mapped trie. Each bit of the bitmap marks a
+    present branch; children holds, in branch order, a leaf or a subnode
+    for each of them. Nodes are never modified once built.
+    """
+    __slots__ = ('bitmap', 'children')
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+
+class CollisionNode(object):
+    """
+    Leaves whose keys have the same hash
+    """
+    __slots__ = ('hash', 'leaves')
+
+    def __init__(self, key_hash, leaves):
+        self.hash = key_hash
+        self.leaves = leaves
+
+
+EMPTY_NODE = HamtNode(0, [])
+
+
+def entry_hash(entry):
+    return entry[LEAF_HASH] if type(entry) is tuple else entry.hash
+
+
+def find(node, key_hash, key):
+    """
+    :return: leaf of the key, or None
+    """
+    shift = 0
+    while True:
+        if type(node) is CollisionNode:
+            for leaf in node.leaves:
+                if leaf[LEAF_KEY] == key:
+                    return leaf
+            return None
+        bit = 1 << ((key_hash >> shift) & BRANCH_MASK)
+        if not node.bitmap & bit:
+            return None
+        child = node.children[popcount(node.bitmap & (bit - 1))]
+        if type(child) is tuple:
+            if child[LEAF_HASH] == key_hash and (
+                    child[LEAF_KEY] is key or child[LEAF_KEY] == key):
+                return child
+            return None
+        node = child
+        shift += BITS
+
+
+def join(shift, entry, other_entry):
+    """
+    Node holding two entries (leaves or collision nodes) of different keys
+    """
+    entry_key_hash = entry_hash(entry)
+    other_key_hash = entry_hash(other_entry)
+    if entry_key_hash == other_key_hash:
+        return CollisionNode(entry_key_hash, [entry, other_entry])
+    branch = (entry_key_hash >> shift) & BRANCH_MASK
+    other_branch = (other_key_hash >> shift) & BRANCH_MASK
+    if branch == other_branch:
+        return HamtNode(1 << branch, [join(shift + BITS, entry, other_entry)])
+    children = [entry, other_entry] if branch < other_branch \
+        else [other_entry, entry]
+    return HamtNode((1 << branch) | (1 << other_branch), children)
+
+
+def insert(node, shift, leaf):
+    """
+    :return: (new node, replaced leaf or None). A replaced key keeps its
+        insertion index.
+    """
+    if type(node) is CollisionNode:
+        if node.hash != leaf[LEAF_HASH]:
+            return join(shift, node, leaf), None
+        leaves = list(node.leaves)
+        for position, old_leaf in enumerate(leaves):
+            if old_leaf[LEAF_KEY] == leaf[LEAF_KEY]:
+                leaves[position] = leaf[:LEAF_INDEX] + (old_leaf[LEAF_INDEX],)
+                return CollisionNode(node.hash, leaves), old_leaf
+        leaves.append(leaf)
+        return CollisionNode(node.hash, leaves), None
+
+    bit = 1 << ((leaf[LEAF_HASH] >> shift) & BRANCH_MASK)
+    position = popcount(node.bitmap & (bit - 1))
+    children = list(node.children)
+    if not node.bitmap & bit:
+        children.insert(position, leaf)
+        return HamtNode(node.bitmap | bit, children), None
+
+    child = children[position]
+    replaced = None
+    if type(child) is tuple:
+        if child[LEAF_HASH] == leaf[LEAF_HASH] \
+                and child[LEAF_KEY] == leaf[LEAF_KEY]:
+            children[position] = leaf[:LEAF_INDEX] + (child[LEAF_INDEX],)
+            replaced = child
+        else:
+            children[position] = join(shift + BITS, child, leaf)
+    else:
+        children[position], replaced = insert(child, shift + BITS, leaf)
+    return HamtNode(node.bitmap, children), replaced
+
+
+def delete(node, shift, key_hash, key):
+    """
+    :return: (new node or None if it is left empty, removed leaf or None).
+        The node itself is returned when the key is not in it.
+    """
+    if type(node) is CollisionNode:
+        leaves = [leaf for leaf in node.leaves if leaf[LEAF_KEY] != key]
+        if len(leaves) == len(node.leaves):
+            return node, None
+        removed = [leaf for leaf in node.leaves if leaf[LEAF_KEY] == key][0]
+        if len(leaves) == 1:
+            return HamtNode(
+                1 << ((key_hash >> shift) & BRANCH_MASK),
+                leaves
+            ), removed
+        return CollisionNode(node.hash, leaves), removed
+
+    bit = 1 << ((key_hash >> shift) & BRANCH_MASK)
+    if not node.bitmap & bit:
+        return node, None
+    position = popcount(node.bitmap & (bit - 1))
+    child = node.children[position]
+    if type(child) is tuple:
+        if child[LEAF_HASH] != key_hash or child[LEAF_KEY] != key:
+            return node, None
+        new_child, removed = None, child
+    else:
+        new_child, removed = delete(child, shift + BITS, key_hash, key)
+        if removed is None:
+            return node, None
+
+    children = list(node.children)
+    if new_child is None:
+        del children[position]
+        if not children:
+            return None, removed
+        return HamtNode(node.bitmap & ~bit, children), removed
+    children[position] = new_child
+    return HamtNode(node.bitmap, children), removed
+
+
+def collect_leaves(node, leaves):
+
+    if type(node) is CollisionNode:
+        leaves.extend(node.leaves)
+        return
+    for child in node.children:
+        if type(child) is tuple:
+            leaves.append(child)
+        else:
+            collect_leaves(child, leaves)
+
+
+class PersistentDict(MutableMapping):
+    """
+    Insertion-ordered hash map with structural sharing, stored in a hash
+    array mapped trie. put and remove return a new dict that shares all
+    but O(log n) nodes with this one, instead of copying every binding.
+
+    put! and remove! (item assignment and deletion) are also supported:
+    they rebind this dict to a new trie, so the dicts it was put into or
+    derived from do not see the change.
+
+    Iteration follows insertion order; the ordered leaves are cached
+    until the dict changes. to_dict converts it to an OrderedDict for
+    code outside Botlang.
+    """
+    __hash__ = None
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        :param items: iterable of (key, value) pairs
+        """
+        root = EMPTY_NODE
+        size = 0
+        index = 0
+        for key, value in items:
+            root, replaced = insert(
+                root,
+                0,
+                (hash(key) & HASH_MASK, key, value, index)
+            )
+            size += replaced is None
+            index += 1
+        persistent_dict = cls()
+        persistent_dict.root = root
+        persistent_dict.size = size
+        persistent_dict.next_index = index
+        return persistent_dict
+
+    def __init__(self):
+
+        self.root = EMPTY_NODE
+        self.size = 0
+        self.next_index = 0
+        self.ordered_leaves = None
+
+    def derive(self, root, size):
+
+        persistent_dict = PersistentDict.__new__(PersistentDict)
+        persistent_dict.root = root
+        persistent_dict.size = size
+        persistent_dict.next_index = self.next_index + 1
+        persistent_dict.ordered_leaves = None
+        return persistent_dict
+
+    def put(self, key, value):
+        """
+        :return: new dict with the binding added or replaced
+        """
+        root, replaced = insert(
+            self.root,
+            0,
+            (hash(key) & HASH_MASK, key, value, self.next_index)
+        )
+        return self.derive(root, self.size + (replaced is None))
+
+    def remove(self, key):
+        """
+        :return: new dict without the key (this one if it is not there)
+        """
+        root, removed = delete(self.root, 0, hash(key) & HASH_MASK, key)
+        if removed is None:
+            return self
+        return self.derive(
+            EMPTY_NODE if root is None else root,
+            self.size - 1
+        )
+
+    def __getitem__(self, key):
+
+        leaf = find(self.root, hash(key) & HASH_MASK, key)
+        if leaf is None:
+            raise KeyError(key)
+        return leaf[LEAF_VALUE]
+
+    def get(self, key, default=None):
+
+        leaf = find(self.root, hash(key) & HASH_MASK, key)
+        return default if leaf is None else leaf[LEAF_VALUE]
+
+    def __contains__(self, key):
+        return find(self.root, hash(key) & HASH_MASK, key) is not None
+
+    def __len__(self):
+        return self.size
+
+    def __setitem__(self, key, value):
+
+        changed = self.put(key, value)
+        self.root, self.size, self.next_index = \
+            changed.root, changed.size, changed.next_index
+        self.ordered_leaves = None
+
+    def __delitem__(self, key):
+
+        changed = self.remove(key)
+        if changed is self:
+            raise KeyError(key)
+        self.root, self.size = changed.root, changed.size
+        self.ordered_leaves = None
+
+    def clear(self):
+
+        self.root = EMPTY_NODE
+        self.size = 0
+        self.ordered_leaves = None
+
+    def leaves(self):
+        """
+        :return: leaves in insertion order
+        """
+        if self.ordered_leaves is None:
+            leaves = []
+            collect_leaves(self.root, leaves)
+            leaves.sort(key=leaf_index)
+            self.ordered_leaves = leaves
+        return self.ordered_leaves
+
+    def __iter__(self):
+        return iter([leaf[LEAF_KEY] for leaf in self.leaves()])
+
+    def keys(self):
+        return [leaf[LEAF_KEY] for leaf in self.leaves()]
+
+    def values(self):
+        return [leaf[LEAF_VALUE] for leaf in self.leaves()]
+
+    def items(self):
+        return [(leaf[LEAF_KEY], leaf[LEAF_VALUE]) for leaf in self.leaves()]
+
+    def copy(self):
+        return self.derive(self.root, self.size)
+
+    def to_dict(self):
+        """
+        :return: OrderedDict with the bindings, whose dict values are
+            converted as well (see to_host_value)
+        """
+        return OrderedDict(
+            (leaf[LEAF_KEY], to_host_value(leaf[LEAF_VALUE]))
+            for leaf in self.leaves()
+        )
+
+    def __eq__(self, other):
+
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for key, value in self.items():
+            if key not in other or other[key] != value:
+                return False
+        return True
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __reduce__(self):
+        return PersistentDict.from_items, (self.items(),)
+
+    def __repr__(self):
+        # Same text as the OrderedDict that make-dict and put used to build
+        return repr(OrderedDict(self.items()))
+
+
+class PersistentList(Sequence):
+    """
+    Immutable sequence with O(1) cons, head, tail and indexing, so walking
+    a list recursively does not copy it at every step.
+
+    The elements are stored in reverse order in a Python list that is
+    shared with the sequences consed onto this one and with its tails:
+    the sequence is the first `length` items of that list, read
+    backwards. cons appends to the shared list when no other sequence has
+    used the slot after this one's items; otherwise it copies them.
+
+    to_list converts it to a Python list for code outside Botlang.
+    """
+    __hash__ = None
+
+    @classmethod
+    def from_iterable(cls, iterable):
+
+        items = list(iterable)
+        items.reverse()
+        return cls(items, len(items))
+
+    def __init__(self, items=None, length=None):
+        """
+        :param items: elements in reverse order
+        :param length: number of items, from the start, in the sequence
+        """
+        self.items = [] if items is None else items
+        self.length = len(self.items) if length is None else length
+
+    def cons(self, value):
+        """
+        :return: new sequence with value before this one's elements
+        """
+        items = self.items
+        length = self.length
+        if len(items) == length:
+            items.append(value)
+            # Another sequence may have appended to the list first
+            if items[length] is value:
+                return PersistentList(items, length + 1)
+        items = items[:length]
+        items.append(value)
+        return PersistentList(items, length + 1)
+
+    def head(self):
+
+        if not self.length:
+            raise IndexError('head of an empty list')
+        return self.items[self.length - 1]
+
+    def tail(self):
+
+        return PersistentList(self.items, max(self.length - 1, 0))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            if index.start is not None and index.start >= 0 \
+                    and index.stop is None and index.step is None:
+                return PersistentList(
+                    self.items,
+                    max(self.length - index.start, 0)
+                )
+            return PersistentList.from_iterable(self.to_list()[index])
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('list index out of range')
+        return self.items[self.length - 1 - index]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __reversed__(self):
+        return iter(self.items[:self.length])
+
+    def __contains__(self, value):
+        return value in self.items[:self.length]
+
+    def to_list(self):
+        return self.items[self.length - 1::-1] if self.length else []
+
+    def __add__(self, other):
+
+        if not isinstance(other, (list, PersistentList)):
+            return NotImplemented
+        return PersistentList.from_iterable(self.to_list() + list(other))
+
+    def __radd__(self, other):
+
+        if not isinstance(other, list):
+            return NotImplemented
+        return PersistentList.from_iterable(other + self.to_list())
+
+    def __eq__(self, other):
+
+        if isinstance(other, PersistentList):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def compare(self, other, comparison):
+        """
+        Lexicographic comparison, as between Python lists
+        """
+        if isinstance(other, PersistentList):
+            return comparison(self.to_list(), other.to_list())
+        if isinstance(other, (list, tuple)):
+            return comparison(self.to_list(), list(other))
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self.compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self.compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self.compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self.compare(other, operator.ge)
+
+    def __reduce__(self):
+        return PersistentList.from_iterable, (self.to_list(),)
+
+    def __repr__(self):
+        return repr(self.to_list())
+
+
+SCALAR_TYPES = frozenset([str, type(u''), int, float, bool, type(None)])
+
+
+def to_host_value(value):
+    """
+    Replaces the PersistentDicts in a value, also inside dicts and lists,
+    with OrderedDicts, and the sequences with a to_list method
+    (PersistentList, Stream) with lists. Dicts and lists without any are
+    returned as they are, not copied.
+    """
+    value_type = type(value)
+    if value_type in SCALAR_TYPES:
+        return value
+    to_list = getattr(value_type, 'to_list', None)
+    if to_list is not None:
+        return [to_host_value(item) for item in to_list(value)]
+    if value_type is list:
+        converted = [to_host_value(item) for item in value]
+        for item, converted_item in zip(value, converted):
+            if item is not converted_item:
+                return converted
+        return value
+    if isinstance(value, dict):
+        converted = [
+            (key, to_host_value(item)) for key, item in value.items()
+        ]
+        for (key, converted_item), item in zip(converted, value.values()):
+            if item is not converted_item:
+                return value.__class__(converted)
+        return value
+    if isinstance(value, MutableMapping):
+        # PersistentDict, or TrackedDict conversation data
+        return value.to_dict()
+    return value
@@ -0,0 +1,93 @@
+MAP = 0
+FILTER = 1
+ENUMERATE = 2
+TAKE = 3
+DROP = 4
+
+
+class Stream(object):
+    """
+    Lazy sequence: a source collection plus the stages (map, filter,
+    enumerate, take, drop) to apply to its elements. Chaining stages does
+    not build intermediate lists: each stage is added to a new stream over
+    the same source, and iterating the stream runs every element through
+    all the stages in a single loop.
+
+    Streams are materialized only by the functions that consume them
+    (e.g. stream->list, min, fold or first-where). Each iteration reads
+    the source again, so a stream can be consumed more than once.
+    """
+    def __init__(self, source, stages=()):
+
+        if isinstance(source, Stream):
+            stages = source.stages + tuple(stages)
+            source = source.source
+        self.source = source
+        self.stages = tuple(stages)
+
+    def with_stage(self, kind, argument):
+        return Stream(self.source, self.stages + ((kind, argument),))
+
+    def __iter__(self):
+
+        if not self.stages:
+            return iter(self.source)
+        for kind, argument in self.stages:
+            if kind != MAP and kind != FILTER:
+                return self.counting_generator()
+        return self.generator()
+
+    def generator(self):
+        """
+        Loop for maps and filters only
+        """
+        stages = [(kind == MAP, function) for kind, function in self.stages]
+        for value in self.source:
+            for is_map, function in stages:
+                if is_map:
+                    value = function(value)
+                elif not function(value):
+                    break
+            else:
+                yield value
+
+    def counting_generator(self):
+        """
+        Loop for any stages. Each enumerate, take and drop stage counts
+        the elements that reach it; the loop ends as soon as a take stage
+        has let its last element through.
+        """
+        stages = self.stages
+        for kind, argument in stages:
+            if kind == TAKE and argument <= 0:
+                return
+        counts = [0] * len(stages)
+        for value in self.source:
+            exhausted = False
+            position = 0
+            for kind, argument in stages:
+                if kind == MAP:
+                    value = argument(value)
+                elif kind == FILTER:
+                    if not argument(value):
+                        break
+                elif kind == ENUMERATE:
+                    value = (counts[position], value)
+                    counts[position] += 1
+                elif kind == TAKE:
+                    counts[position] += 1
+                    exhausted = exhausted or counts[position] >= argument
+                elif counts[position] < argument:
+                    counts[position] += 1
+                    break
+                position += 1
+            else:
+                yield value
+            if exhausted:
+                return
+
+    def to_list(self):
+        return list(self)
+
+    def __repr__(self):
+        return '<stream with {0} stages>'.format(len(self.stages))
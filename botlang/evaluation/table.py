@@ -0,0 +1,233 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+
+from botlang.evaluation.values import Nil
+
+
+NUMBER = 'number'
+STRING = 'string'
+BOOLEAN = 'boolean'
+ANY = 'any'
+
+ORDERED_TYPES = (NUMBER, STRING, BOOLEAN)
+
+
+def column_type(values):
+    """
+    :return: the type shared by all the values of a column, or ANY
+    """
+    if all(isinstance(value, bool) for value in values):
+        return BOOLEAN
+    if all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in values
+    ):
+        return NUMBER
+    if all(isinstance(value, str) for value in values):
+        return STRING
+    return ANY
+
+
+class Table(object):
+    """
+    Immutable table stored by columns, for reference data (branches,
+    catalogs) that a bot builds once and queries on every turn.
+
+    Equality lookups use a hash index and range filters a sorted index of
+    the column. Both are built the first time a column is queried and kept
+    with the table. Lookups, ranges, projections and sorts return new
+    tables; projections share the columns they keep. Rows are lists with
+    the values in column order.
+    """
+    @classmethod
+    def from_records(cls, columns, records):
+        """
+        :param columns: column names
+        :param records: lists with a value per column, or dicts (any
+            mapping) with a value per column name
+        """
+        columns = list(columns)
+        records = list(records)
+        by_name = bool(records) and isinstance(records[0], Mapping)
+        if not by_name:
+            for record in records:
+                if len(record) != len(columns):
+                    raise ValueError(
+                        'Record {0!r} does not have {1} columns'.format(
+                            record, len(columns)
+                        )
+                    )
+        return cls(columns, {
+            name: [record[name if by_name else position] for record in records]
+            for position, name in enumerate(columns)
+        })
+
+    def __init__(self, columns, data, types=None):
+        """
+        :param columns: column names
+        :param data: dict from column name to the list of its values
+        :param types: dict from column name to its type, inferred if None
+        """
+        self.columns = list(columns)
+        self.data = data
+        self.types = types if types is not None else {
+            name: column_type(data[name]) for name in self.columns
+        }
+        self.size = len(data[self.columns[0]]) if self.columns else 0
+        self.hash_indexes = {}
+        self.sorted_indexes = {}
+
+    def column(self, name):
+
+        try:
+            return self.data[name]
+        except KeyError:
+            raise ValueError('The table has no column {0!r}'.format(name))
+
+    def column_type(self, name):
+
+        self.column(name)
+        return self.types[name]
+
+    def ordered_column(self, name):
+        """
+        :return: the values of a column that can be sorted
+        """
+        values = self.column(name)
+        if self.types[name] not in ORDERED_TYPES:
+            raise ValueError(
+                'Column {0!r} mixes values of different types and can not '
+                'be sorted'.format(name)
+            )
+        return values
+
+    def hash_index(self, name):
+        """
+        :return: dict from each value of the column to its row numbers
+        """
+        index = self.hash_indexes.get(name)
+        if index is None:
+            index = {}
+            for row, value in enumerate(self.column(name)):
+                index.setdefault(value, []).append(row)
+            self.hash_indexes[name] = index
+        return index
+
+    def sorted_index(self, name):
+        """
+        :return: row numbers sorted by the column (stable), and the column
+            values in that order
+        """
+        index = self.sorted_indexes.get(name)
+        if index is None:
+            values = self.ordered_column(name)
+            rows = sorted(range(self.size), key=values.__getitem__)
+            index = (rows, [values[row] for row in rows])
+            self.sorted_indexes[name] = index
+        return index
+
+    def take_rows(self, rows):
+        """
+        :return: table with the given rows, in the given order
+        """
+        return Table(
+            self.columns,
+            {
+                name: [values[row] for row in rows]
+                for name, values in self.data.items()
+            },
+            self.types
+        )
+
+    def lookup(self, name, value):
+        """
+        :return: table with the rows where the column equals the value
+        """
+        return self.take_rows(self.hash_index(name).get(value, []))
+
+    def find(self, name, value):
+        """
+        :return: first row where the column equals the value, or nil
+        """
+        rows = self.hash_index(name).get(value)
+        return self.row(rows[0]) if rows else Nil
+
+    def range(self, name, low=Nil, high=Nil):
+        """
+        :return: table with the rows where low <= column value <= high,
+            in table order. A nil bound leaves that side open.
+        """
+        rows, values = self.sorted_index(name)
+        start = 0 if low is Nil else bisect_left(values, low)
+        end = len(values) if high is Nil else bisect_right(values, high)
+        return self.take_rows(sorted(rows[start:end]))
+
+    def select(self, names):
+        """
+        :return: table with only the given columns
+        """
+        return Table(
+            names,
+            {name: self.column(name) for name in names},
+            {name: self.types[name] for name in names}
+        )
+
+    def sort(self, name, descending=False):
+        """
+        :return: table sorted by the column. Rows with equal values keep
+            their order.
+        """
+        if not descending:
+            return self.take_rows(self.sorted_index(name)[0])
+        return self.take_rows(sorted(
+            range(self.size),
+            key=self.ordered_column(name).__getitem__,
+            reverse=True
+        ))
+
+    def row(self, row):
+        return [self.data[name][row] for name in self.columns]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+
+        if row < -self.size or row >= self.size:
+            raise IndexError('Table row {0} out of range'.format(row))
+        return self.row(row)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self):
+        """
+        :return: list of rows
+        """
+        return [
+            list(row)
+            for row in zip(*[self.data[name] for name in self.columns])
+        ]
+
+    __hash__ = None
+
+    def __eq__(self, other):
+
+        if not isinstance(other, Table):
+            return NotImplemented
+        return self.columns == other.columns and \
+            self.to_list() == other.to_list()
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __reduce__(self):
+        return Table.from_records, (self.columns, self.to_list())
+
+    def __repr__(self):
+        return '<table of {0} rows: {1}>'.format(
+            self.size,
+            ', '.join(str(name) for name in self.columns)
+        )
@@ -0,0 +1,80 @@
+import threading
+
+try:
+    from contextvars import ContextVar
+except ImportError:     # Python < 3.7
+    ContextVar = None
+
+
+class ThreadLocalVar(object):
+    """
+    ContextVar replacement for Pythons without contextvars. Each thread
+    sees its own value; asyncio tasks on the same thread share it.
+    """
+    def __init__(self, name, default=None):
+
+        self.name = name
+        self.default = default
+        self.local = threading.local()
+
+    def get(self):
+        return getattr(self.local, 'value', self.default)
+
+    def set(self, value):
+
+        token = self.get()
+        self.local.value = value
+        return token
+
+    def reset(self, token):
+        self.local.value = token
+
+
+class TurnContext(object):
+    """
+    State of the bot turn being evaluated: the incoming message and the
+    evaluator of the turn. The evaluator of a turn carries its context
+    explicitly; the current turn is also tracked per thread (and per
+    asyncio task) so that closures applied by primitives, and primitives
+    such as input-message, act on the turn that called them.
+    """
+    current_turn = ContextVar('botlang_turn', default=None) \
+        if ContextVar is not None \
+        else ThreadLocalVar('botlang_turn')
+
+    def __init__(self, input_message=None, evaluator=None):
+
+        self.input_message = input_message
+        self.evaluator = evaluator
+
+    def __enter__(self):
+
+        self.token = self.current_turn.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.current_turn.reset(self.token)
+
+    @classmethod
+    def current(cls):
+        """
+        :rtype: TurnContext
+        """
+        return cls.current_turn.get()
+
+    @classmethod
+    def current_evaluator(cls, default=None):
+
+        turn = cls.current_turn.get()
+        if turn is None or turn.evaluator is None:
+            return default
+        return turn.evaluator
+
+    @classmethod
+    def current_input_message(cls):
+
+        turn = cls.current_turn.get()
+        if turn is None:
+            return None
+        return turn.input_message
@@ -1,3 +1,10 @@
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+
+from botlang.evaluation.persistent import PersistentDict, to_host_value
+from botlang.evaluation.turn_context import TurnContext
+
+
 class Nil(object):
     pass
 
@@ -59,6 +66,39 @@ class ReflectivePrimitive(Primitive):
         return True
 
 
+class AsyncPrimitive(Primitive):
+    """
+    Primitive that performs blocking I/O. The evaluator calls it as a plain
+    primitive; the async evaluator awaits it instead: its coroutine
+    function if it has one, or else the blocking function in an executor.
+
+    The event loop's default executor only has min(32, cpus + 4) threads,
+    so at most that many blocking calls (e.g. HTTP requests and storage
+    without a coroutine function) run at once, however many turns are
+    awaiting them. Turns that do a lot of blocking I/O need an executor
+    sized for it (see CompiledBot.handle_async).
+    """
+    def __init__(self, proc, env, coroutine_function=None):
+        super(AsyncPrimitive, self).__init__(proc, env)
+        self.coroutine_function = coroutine_function
+
+    def apply_async(self, *args, executor=None):
+        """
+        :param executor: executor for the blocking function. By default,
+            the event loop's
+        :return: awaitable with the primitive's result
+        """
+        if self.coroutine_function is not None:
+            return self.coroutine_function(*args)
+
+        import asyncio
+        import functools
+        return asyncio.get_event_loop().run_in_executor(
+            executor,
+            functools.partial(self.proc, *args)
+        )
+
+
 class InvalidArgumentsException(Exception):
 
     def __init__(self, expected, given):
@@ -72,7 +112,8 @@ class InvalidArgumentsException(Exception):
 
 class Closure(FunVal):
     """
-    Lexical closure
+    Lexical closure. When applied by a primitive during a bot turn, its
+    body is evaluated by the evaluator of that turn.
     """
     def __init__(self, ast_node, env, evaluator):
         self.params = ast_node.params
@@ -86,14 +127,9 @@ class Closure(FunVal):
         if len(self.params) != len(values):
             raise InvalidArgumentsException(len(self.params), len(values))
 
-        from botlang import BotlangSystem
-        new_bindings = {
-            self.params[i]: v for i, v in enumerate(values)
-        }
-        return BotlangSystem.interpret(
-            [self.body],
-            self.evaluator,
-            self.env.new_environment(new_bindings)
+        return self.body.accept(
+            TurnContext.current_evaluator(self.evaluator),
+            self.env.new_local_environment(dict(zip(self.params, values)))
         )
 
     def __repr__(self):
@@ -138,8 +174,212 @@ class TerminalNode(object):
         return True
 
 
+class DataDelta(object):
+    """
+    Changes of a turn to its conversation data: the keys to write, with
+    their new values, and the keys to delete
+    """
+    def __init__(self, set_items, removed_keys):
+        self.set_items = set_items
+        self.removed_keys = removed_keys
+
+    def is_empty(self):
+        return not self.set_items and not self.removed_keys
+
+    def apply(self, data):
+
+        for key in self.removed_keys:
+            data.pop(key, None)
+        data.update(self.set_items)
+        return data
+
+
+MISSING = object()
+
+MUTABLE_CONTAINERS = (dict, list, PersistentDict)
+
+
+class TrackedDict(MutableMapping):
+    """
+    Conversation data that records which keys a turn changes. The dict
+    passed to the turn is never modified: the keys set and removed are
+    kept in PersistentDicts over it, so put returns a new TrackedDict in
+    O(log n) instead of copying the data.
+
+    Besides the keys set and removed, a key counts as changed when a dict
+    or list value is read from it, since put! may modify that value in
+    place.
+    """
+    __hash__ = None
+
+    @classmethod
+    def track(cls, data):
+        """
+        :return: tracked view of a dict, or data itself if it is not one
+        """
+        if not isinstance(data, dict):
+            return data
+        return cls(data)
+
+    def __init__(self, base=None, changes=None, removed=None, size=None):
+        """
+        :param base: dict passed to the turn
+        :param changes: PersistentDict of the keys set and their values
+        :param removed: PersistentDict whose keys are the removed keys
+        """
+        self.base = {} if base is None else base
+        self.changes = PersistentDict() if changes is None else changes
+        self.removed = PersistentDict() if removed is None else removed
+        self.size = len(self.base) if size is None else size
+
+    def __contains__(self, key):
+
+        return key in self.changes or (
+            key in self.base
+            and not (self.removed.size and key in self.removed)
+        )
+
+    def __getitem__(self, key):
+
+        value = self.changes.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        if self.removed.size and key in self.removed:
+            raise KeyError(key)
+        value = self.base[key]
+        if isinstance(value, MUTABLE_CONTAINERS):
+            self.changes = self.changes.put(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+
+        if key not in self:
+            self.size += 1
+        self.changes = self.changes.put(key, value)
+
+    def __delitem__(self, key):
+
+        if key not in self:
+            raise KeyError(key)
+        self.size -= 1
+        self.changes = self.changes.remove(key)
+        self.removed = self.removed.put(key, True)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.ordered())
+
+    def clear(self):
+
+        for key in self:
+            self.removed = self.removed.put(key, True)
+        self.changes = PersistentDict()
+        self.size = 0
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+
+        self.touch_containers()
+        return self.untracked_items()
+
+    def values(self):
+        return [value for key, value in self.items()]
+
+    def untracked_items(self):
+        """
+        :return: (key, value) list, without counting container values as
+            changed
+        """
+        return list(self.ordered().items())
+
+    def ordered(self):
+        """
+        :return: OrderedDict with the data after the turn's changes: the
+            keys of the turn's dict first, then those the turn added
+        """
+        data = OrderedDict(self.base)
+        for key in self.removed:
+            data.pop(key, None)
+        for key, value in self.changes.items():
+            data[key] = value
+        return data
+
+    def touch_containers(self):
+
+        changes = self.changes
+        for key, value in self.ordered().items():
+            if isinstance(value, MUTABLE_CONTAINERS) and key not in changes:
+                changes = changes.put(key, value)
+        self.changes = changes
+
+    def put(self, key, value):
+        """
+        Copy of this dict, with its changes, plus a new binding
+        """
+        return TrackedDict(
+            self.base,
+            self.changes.put(key, value),
+            self.removed,
+            self.size + (key not in self)
+        )
+
+    def to_dict(self):
+        """
+        :return: OrderedDict with the data after the turn's changes, as
+            host values
+        """
+        data = OrderedDict(self.base)
+        for key in self.removed:
+            data.pop(key, None)
+        for key, value in self.changes.items():
+            data[key] = to_host_value(value)
+        return data
+
+    def delta(self):
+        """
+        :rtype: DataDelta
+        """
+        changed_keys = set(self.changes.keys())
+        return DataDelta(
+            OrderedDict(
+                (key, to_host_value(value))
+                for key, value in self.ordered().items()
+                if key in changed_keys
+            ),
+            [key for key in self.removed if key not in self]
+        )
+
+    def __eq__(self, other):
+
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.ordered() == dict(other.items())
+
+    def __repr__(self):
+
+        data = self.untracked_items()
+        if isinstance(self.base, OrderedDict):
+            return repr(OrderedDict(data))
+        return repr(dict(data))
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+
 class BotResultValue(object):
+    """
+    Result of a turn. Its data and message are host values: the
+    PersistentDicts in them are converted to OrderedDicts.
 
+    A pickled result (e.g. returned by a worker process) carries its data
+    delta instead of the tracked data, which would repeat the data.
+    """
     BOT_WAITING_INPUT = 'WAITING_INPUT'
 
     def __init__(
@@ -148,8 +388,9 @@ class BotResultValue(object):
             message,
             next_node
     ):
-        self.data = data
-        self.message = message
+        self.tracked_data = data if isinstance(data, TrackedDict) else None
+        self.data = to_host_value(data)
+        self.message = to_host_value(message)
 
         if next_node.is_terminal():
             self.next_node = None
@@ -157,3 +398,22 @@ class BotResultValue(object):
         else:
             self.next_node = next_node.name()
             self.bot_state = self.BOT_WAITING_INPUT
+
+    @property
+    def data_delta(self):
+        """
+        Changes to the conversation data passed to the turn
+        :return: DataDelta, or None when the result's data is not the
+            turn's tracked data (e.g. a dict built by the bot), so it must
+            be written whole
+        """
+        if self.tracked_data is not None:
+            return self.tracked_data.delta()
+        return getattr(self, 'pickled_data_delta', None)
+
+    def __getstate__(self):
+
+        state = dict(self.__dict__)
+        state['pickled_data_delta'] = self.data_delta
+        state['tracked_data'] = None
+        return state
@@ -268,32 +268,6 @@ class ExampleBots(object):
     '("Rengo - Carlos Condell N° 57, local 1" 0 0 "Carlos Condell N° 57, local 1")
 )]
 
-[define PI 3.14159265359]
-[define EARTH_R_KM 6371]
-[defun deg-to-rad (deg) (/ (* deg PI) 180)]
-[define distance
-    (function (lat1 lon1 lat2 lon2)
-        [define dLat (deg-to-rad (- lat2 lat1))]
-        [define dLon (deg-to-rad (- lon2 lon1))]
-        [define radLat1 (deg-to-rad lat1)]
-        [define radLat2 (deg-to-rad lat2)]
-        [define a
-            (+
-                (*
-                    (sin (/ dLat 2))
-                    (sin (/ dLat 2))
-                )
-                (*
-                    (* [sin (/ dLon 2)] [sin (/ dLon 2)])
-                    (* [cos radLat1] [cos radLat2])
-                )
-            )
-        ]
-        [define c (* 2 (atan2 [sqrt a] [sqrt (- 1 a)]))]
-        (* EARTH_R_KM c)
-    )
-]
-
 [define log-nodes-trace
     (function (nodes-path)
         (list)
@@ -566,27 +540,11 @@ class ExampleBots(object):
     ) 
 ]
 
+[define cajeros-index (geo-index cajeros)]
+
 [define closest-atm
     (function (latitude longitude)
-        [define distances
-            (map
-                (function (p)
-                    (list
-                        (distance latitude longitude (get p 1) (get p 2))
-                        p
-                    )
-                )
-                cajeros
-            )
-        ]
-        [define min-distance (min (map (function (d) (get d 0)) distances))]
-        [define closest
-            (get
-                (filter (function (p) (= min-distance (get p 0))) distances)
-                0
-            )
-        ]
-        (format-location (get closest 1))
+        (format-location (geo-nearest cajeros-index latitude longitude))
     )
 ]
 
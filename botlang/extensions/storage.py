@@ -1,3 +1,4 @@
+from botlang.evaluation.persistent import to_host_value
 from botlang.evaluation.values import Nil
 
 
@@ -49,17 +50,40 @@ class StorageApi(object):
         raise NotImplementedError
 
 
+def host_put(implementation):
+    """
+    put primitive that stores host values (see to_host_value), so storage
+    backends get dicts and lists instead of Botlang's persistent ones
+    """
+    def put(key, value, expiration=None):
+        return implementation.put(key, to_host_value(value), expiration)
+    return put
+
+
+def host_get_or_else(implementation):
+
+    def get_or_else(key, else_function, expiration=None):
+        return implementation.get_or_else(
+            key,
+            lambda: to_host_value(else_function()),
+            expiration
+        )
+    return get_or_else
+
+
 class LocalStorageExtension(object):
 
     @classmethod
     def apply(cls, botlang_system, db_implementation):
 
-        botlang_system.environment.add_primitives({
-            'localdb-put': db_implementation.put,
+        botlang_system.environment.add_async_primitives({
+            'localdb-put': host_put(db_implementation),
             'localdb-get': db_implementation.get,
-            'localdb-get-or-else': db_implementation.get_or_else,
             'localdb-remove': db_implementation.remove
         })
+        botlang_system.environment.add_primitives({
+            'localdb-get-or-else': host_get_or_else(db_implementation)
+        })
         return botlang_system
 
 
@@ -68,12 +92,14 @@ class GlobalStorageExtension(object):
     @classmethod
     def apply(cls, botlang_system, db_implementation):
 
-        botlang_system.environment.add_primitives({
-            'globaldb-put': db_implementation.put,
+        botlang_system.environment.add_async_primitives({
+            'globaldb-put': host_put(db_implementation),
             'globaldb-get': db_implementation.get,
-            'globaldb-get-or-else': db_implementation.get_or_else,
             'globaldb-remove': db_implementation.remove
         })
+        botlang_system.environment.add_primitives({
+            'globaldb-get-or-else': host_get_or_else(db_implementation)
+        })
         return botlang_system
 
 
@@ -82,10 +108,12 @@ class CacheExtension(object):
     @classmethod
     def apply(cls, botlang_system, cache_implementation):
 
-        botlang_system.environment.add_primitives({
-            'cache-put': cache_implementation.put,
+        botlang_system.environment.add_async_primitives({
+            'cache-put': host_put(cache_implementation),
             'cache-get': cache_implementation.get,
-            'cache-get-or-else': cache_implementation.get_or_else,
             'cache-remove': cache_implementation.remove
         })
+        botlang_system.environment.add_primitives({
+            'cache-get-or-else': host_get_or_else(cache_implementation)
+        })
         return botlang_system
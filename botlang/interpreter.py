@@ -1,19 +1,39 @@
-import inspect
-import os
+from collections import OrderedDict
 
 from botlang.environment import *
+from botlang.evaluation.call_sites import CallSiteAnalyzer
+from botlang.evaluation.compiled_bot import CompiledBot, CompiledBotCache
 from botlang.evaluation.evaluator import Evaluator
-from botlang.evaluation.values import BotNodeValue
+from botlang.evaluation.persistent import to_host_value
+from botlang.evaluation.turn_context import TurnContext
+from botlang.evaluation.values import BotNodeValue, TrackedDict
 from botlang.exceptions.exceptions import *
 from botlang.extensions.storage import LocalStorageExtension, \
     GlobalStorageExtension, CacheExtension
 from botlang.macros.macro_expander import MacroExpander
+from botlang.modules.cache import ModuleCache
+from botlang.modules.linker import BotLinker
 from botlang.modules.resolver import ModuleResolver
 from botlang.parser import Parser
 
 
 class BotlangSystem(object):
-
+    """
+    Botlang runtime: an environment, its module resolver and its compiled
+    bots.
+
+    Thread safety: compiled bots may be shared by any number of threads
+    (and asyncio tasks). Every turn runs in its own evaluator and
+    TurnContext, so handle, handle_async, eval_bot_async and
+    eval_bot_batch can be called concurrently on the same system. Modules
+    are evaluated once, under a lock; the AST, module and compiled bot
+    caches are safe to use from many threads.
+
+    eval and eval_bot evaluate the bot's definitions in the system's own
+    environment, so concurrent calls of those on one system see each
+    other's definitions. Extensions (setup_*) update the system's
+    environment and must be set up before serving turns.
+    """
     def __init__(self, environment=None, module_resolver=None):
 
         if module_resolver:
@@ -27,6 +47,7 @@ class BotlangSystem(object):
 
         self.environment = environment
         self.module_resolver = module_resolver
+        self.compiled_bots = CompiledBotCache(self)
 
     @classmethod
     def base_environment(cls):
@@ -37,20 +58,24 @@ class BotlangSystem(object):
     @classmethod
     def bot_modules_resolver(cls, environment):
 
-        from botlang.modules import bot_helpers
-        helpers_path = os.path.dirname(inspect.getfile(bot_helpers))
+        from botlang.runtime_image import RuntimeImage
 
-        module_resolver = ModuleResolver(environment)
-        module_resolver.load_modules(helpers_path)
+        module_resolver = ModuleResolver(
+            environment,
+            module_cache=ModuleCache.get()
+        )
+        module_resolver.load_modules(RuntimeImage.bot_helpers_path())
         return module_resolver
 
     @classmethod
     def bot_instance(cls, module_resolver=None):
-
-        environment = cls.base_environment()
-
+        """
+        :param module_resolver: optional resolver. By default, the instance
+            is an overlay over the process-wide RuntimeImage
+        """
         if module_resolver is None:
-            module_resolver = cls.bot_modules_resolver(environment)
+            from botlang.runtime_image import RuntimeImage
+            return RuntimeImage.get().new_instance()
 
         return BotlangSystem(module_resolver=module_resolver)
 
@@ -66,13 +91,15 @@ class BotlangSystem(object):
 
         return GlobalStorageExtension.apply(self, db_implementation)
 
-    def parse(self, code_string, source_id):
+    @classmethod
+    def parse(cls, code_string, source_id):
 
         ast_seq = Parser.parse(code_string, source_id)
-        expanded_asts = self.expand_macros(ast_seq)
-        return expanded_asts
+        expanded_asts = cls.expand_macros(ast_seq)
+        return CallSiteAnalyzer.analyze(expanded_asts)
 
-    def expand_macros(self, ast_seq):
+    @classmethod
+    def expand_macros(cls, ast_seq):
 
         from botlang.macros.default_macros import DefaultMacros
         macro_environment = DefaultMacros.get_environment()
@@ -93,7 +120,31 @@ class BotlangSystem(object):
     def eval(self, code_string, source_id=None):
 
         evaluator = Evaluator(module_resolver=self.module_resolver)
-        return self.primitive_eval(code_string, evaluator, source_id)
+        return to_host_value(
+            self.primitive_eval(code_string, evaluator, source_id)
+        )
+
+    def compile_bot(self, bot_code, source_id=None):
+
+        return self.compile_bot_ast(self.parse(bot_code, source_id))
+
+    def compile_bot_ast(self, bot_ast):
+
+        return CompiledBot(self, bot_ast)
+
+    def reload_module(self, module_name, path=None):
+        """
+        Reloads a module and the modules that depend on it, and drops the
+        compiled bots that require any of them
+        :return: set of the dropped bot ids
+        """
+        return self.compiled_bots.reload_module(module_name, path)
+
+    def link_bot(self, bot_code, source_id=None):
+        """
+        :return: BotBundle with the bot and the module definitions it uses
+        """
+        return BotLinker(self.module_resolver).link(bot_code, source_id)
 
     def eval_bot(
             self,
@@ -106,6 +157,58 @@ class BotlangSystem(object):
         ast_seq = self.parse(bot_code, source_id)
         return self.eval_bot_ast(ast_seq, input_msg, next_node, data)
 
+    def eval_bot_async(
+            self,
+            bot_code,
+            input_msg,
+            next_node=None,
+            data=None,
+            source_id=None,
+            executor=None
+    ):
+        """
+        Asynchronous eval_bot (see CompiledBot.handle_async). The bot is
+        compiled through the compiled bots cache.
+        :return: coroutine with the BotResultValue
+        """
+        if source_id is None:
+            source_id = Parser.generate_string_hash(bot_code)
+        compiled_bot = self.compiled_bots.get(source_id, bot_code)
+        return compiled_bot.handle_async(input_msg, next_node, data, executor)
+
+    def eval_bot_batch(self, turns):
+        """
+        Evaluates many turns, grouped by bot. Each bot is compiled once
+        (see CompiledBotCache), so its top-level forms are not evaluated
+        again for every message.
+        :param turns: iterable of (bot_code, input_msg[, next_node[, data]])
+        :return: list with the result of each turn, in order. A turn that
+            fails has its exception in place of the result
+        """
+        turns = list(turns)
+        turns_by_bot = OrderedDict()
+        for index, turn in enumerate(turns):
+            turns_by_bot.setdefault(turn[0], []).append(index)
+
+        results = [None] * len(turns)
+        for bot_code, indexes in turns_by_bot.items():
+            try:
+                compiled_bot = self.compiled_bots.get(
+                    Parser.generate_string_hash(bot_code),
+                    bot_code
+                )
+            except Exception as e:
+                for index in indexes:
+                    results[index] = e
+                continue
+
+            for index in indexes:
+                try:
+                    results[index] = compiled_bot.handle(*turns[index][1:])
+                except Exception as e:
+                    results[index] = e
+        return results
+
     def eval_bot_ast(
             self,
             bot_ast,
@@ -113,18 +216,25 @@ class BotlangSystem(object):
             next_node=None,
             data=None
     ):
-        if data is None:
-            data = {}
-
-        self.environment.last_input_message = input_msg     # Legacy
+        data = TrackedDict.track({} if data is None else data)
         evaluator = Evaluator(module_resolver=self.module_resolver)
-        result = self.primitive_eval_ast(bot_ast, evaluator)
+        with TurnContext(input_msg, evaluator):
+            result = self.primitive_eval_ast(bot_ast, evaluator)
 
-        if next_node:
-            return self.environment.lookup(next_node).apply(data, input_msg)
-        if isinstance(result, BotNodeValue):
-            return result.apply(data, input_msg)
-        return result
+            if next_node:
+                node = self.environment.lookup(next_node)
+                return self.apply_node(node, data, input_msg, evaluator)
+            if isinstance(result, BotNodeValue):
+                return self.apply_node(result, data, input_msg, evaluator)
+            return to_host_value(result)
+
+    @classmethod
+    def apply_node(cls, node, data, input_msg, evaluator):
+
+        try:
+            return to_host_value(node.apply(data, input_msg))
+        except Exception as e:
+            raise cls.wrap_exception(e, evaluator)
 
     @classmethod
     def interpret(cls, ast_seq, evaluator, environment):
@@ -133,13 +243,18 @@ class BotlangSystem(object):
             for ast in ast_seq[0:-1]:
                 ast.accept(evaluator, environment)
             return ast_seq[-1].accept(evaluator, environment)
-        except BotlangAssertionException as failed_assert:
-            raise failed_assert
         except Exception as e:
-            raise BotlangErrorException(
-                e,
-                evaluator.execution_stack
-            )
+            raise cls.wrap_exception(e, evaluator)
+
+    @classmethod
+    def wrap_exception(cls, exception, evaluator):
+        """
+        Errors are wrapped once, at the turn boundary. Botlang exceptions
+        raised by nested evaluations are propagated as they are.
+        """
+        if isinstance(exception, BotlangException):
+            return exception
+        return BotlangErrorException(exception, evaluator.execution_stack)
 
     @classmethod
     def run(
@@ -0,0 +1,137 @@
+import threading
+
+from botlang.evaluation.values import Primitive, TerminalNode
+from botlang.modules.dependencies import CyclicModuleDependencyException
+
+
+def same_binding(value, base_value):
+    """
+    Whether a binding of a fresh base environment is the same as the
+    cache's: primitives are new wrappers over the same functions
+    """
+    if value is base_value:
+        return True
+    if type(value) is not type(base_value):
+        return False
+    if isinstance(value, Primitive):
+        return value.proc is base_value.proc
+    if isinstance(value, TerminalNode):
+        return value.state == base_value.state
+    return False
+
+
+class ModuleCache(object):
+    """
+    Process-wide cache of evaluated modules. A module is identified by the
+    hash of its source and by the identities of the modules it requires, so
+    resolvers that define the same module share a single evaluation and its
+    (read-only) exports.
+
+    Cached modules are evaluated in a frozen base environment: they only
+    see the primitives and the modules they require. A module that refers
+    to a name the requesting resolver's environment binds differently
+    (e.g. an extension primitive such as cache-get) is not shared: it is
+    evaluated in that environment, as without a cache.
+    """
+    lock = threading.RLock()
+    shared_cache = None
+
+    def __init__(self):
+
+        from botlang import BotlangSystem
+
+        self.environment = BotlangSystem.base_environment().freeze()
+        self.modules = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_bindings(self, module, resolver):
+        """
+        :param module: BotlangModule defined in resolver
+        :param resolver: ModuleResolver that resolves the module's requires
+        """
+        from botlang.evaluation.evaluator import Evaluator
+
+        key = self.module_key(module, resolver)
+        if key is module:
+            return module.get_bindings(Evaluator(module_resolver=resolver))
+
+        # The lock only guards the table: the module is evaluated outside
+        # of it, under its own lock, so threads that need it wait for that
+        # evaluation while other modules are evaluated concurrently.
+        with self.lock:
+            cached_module = self.modules.get(key)
+            if cached_module is None:
+                self.misses += 1
+                self.modules[key] = cached_module = module
+            elif cached_module is not module:
+                self.hits += 1
+
+        try:
+            cached_module.get_bindings(
+                Evaluator(module_resolver=resolver),
+                self.environment
+            )
+        except Exception:
+            with self.lock:
+                if self.modules.get(key) is cached_module:
+                    del self.modules[key]
+            raise
+        if cached_module is not module:
+            module.share_bindings(cached_module)
+        return module.bindings
+
+    def module_key(self, module, resolver, visiting=()):
+
+        if module.name in visiting:
+            cycle = list(visiting[visiting.index(module.name):])
+            raise CyclicModuleDependencyException(cycle + [module.name])
+
+        if module.source_hash is None or None in module.required_modules \
+                or not module.identifiers.isdisjoint(
+                    self.environment_extensions(resolver.environment)
+                ):
+            return module
+
+        visiting = visiting + (module.name,)
+        return (
+            module.name,
+            module.source_hash,
+            tuple(
+                resolver.module_key(module_name, visiting)
+                for module_name in sorted(module.required_modules)
+            )
+        )
+
+    def environment_extensions(self, environment):
+        """
+        :return: names that an environment binds to something else than
+            the base environment does
+        """
+        base_bindings = self.environment.bindings
+        names = set()
+        seen = set()
+        while environment is not None and environment is not self.environment:
+            for name, value in environment.bindings.items():
+                if name not in seen:
+                    seen.add(name)
+                    if not same_binding(value, base_bindings.get(name)):
+                        names.add(name)
+            environment = environment.previous
+        return names
+
+    def clear(self):
+
+        with self.lock:
+            self.modules = {}
+            self.hits = 0
+            self.misses = 0
+
+    @classmethod
+    def get(cls):
+
+        if cls.shared_cache is None:
+            with cls.lock:
+                if cls.shared_cache is None:
+                    cls.shared_cache = ModuleCache()
+        return cls.shared_cache
@@ -0,0 +1,118 @@
+import time
+
+from botlang.ast.ast import Val
+from botlang.ast.ast_visitor import ASTVisitor
+
+
+class CyclicModuleDependencyException(Exception):
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super(CyclicModuleDependencyException, self).__init__(
+            'Cyclic module dependency: {0}'.format(' -> '.join(cycle))
+        )
+
+
+def parse_module_file(path):
+    """
+    Reads and parses a module file. It is a module level function so that
+    it can be sent to a process pool.
+    :return: (path, list[ASTNode], parse time in seconds)
+    """
+    from botlang import BotlangSystem
+
+    start = time.time()
+    with open(path, 'r') as module_file:
+        code = module_file.read()
+    ast_seq = BotlangSystem.parse(code, path)
+    return path, ast_seq, time.time() - start
+
+
+class ModuleDependencyFinder(ASTVisitor):
+    """
+    Collects the names of the modules required by an AST, and of the
+    modules it defines with their own requirements
+    """
+    def __init__(self):
+        self.required_modules = set()
+        self.module_dependencies = {}
+
+    def visit_module_definition(self, module_node, env):
+
+        if isinstance(module_node.name, Val):
+            self.module_dependencies[module_node.name.value] = \
+                self.required_by(module_node.body)
+        return module_node
+
+    def visit_module_import(self, require_node, env):
+
+        if isinstance(require_node.module_name, Val):
+            self.required_modules.add(require_node.module_name.value)
+        else:
+            self.required_modules.add(None)
+        return require_node
+
+    @classmethod
+    def required_by(cls, ast):
+        """
+        :return: set of the module names required by an AST. None stands
+            for a module name that is only known at runtime
+        """
+        finder = cls()
+        ast.accept(finder, None)
+        return finder.required_modules
+
+    @classmethod
+    def defined_in(cls, ast_seq):
+        """
+        :return: dict of the module names defined in an AST sequence to the
+            set of module names each of them requires
+        """
+        finder = cls()
+        for ast in ast_seq:
+            ast.accept(finder, None)
+        return finder.module_dependencies
+
+
+class ModuleDependencyGraph(object):
+    """
+    Module name -> names of the modules it requires. Requirements outside of
+    the graph (e.g. external modules or modules of a parent resolver) are
+    ignored.
+    """
+    def __init__(self, dependencies):
+
+        self.dependencies = {
+            name: set(required) for name, required in dependencies.items()
+        }
+
+    def topological_order(self):
+        """
+        :return: module names, each one after the modules it requires
+        :raises CyclicModuleDependencyException:
+        """
+        order = []
+        visited = set()
+        for module_name in sorted(self.dependencies):
+            self.visit(module_name, [], visited, order)
+        return order
+
+    def visit(self, module_name, path, visited, order):
+
+        if module_name in path:
+            cycle = path[path.index(module_name):] + [module_name]
+            raise CyclicModuleDependencyException(cycle)
+        if module_name in visited or module_name not in self.dependencies:
+            return
+
+        path.append(module_name)
+        required_modules = [
+            required for required in self.dependencies[module_name]
+            if required in self.dependencies
+        ]
+        for required in sorted(required_modules):
+            self.visit(required, path, visited, order)
+        path.pop()
+
+        visited.add(module_name)
+        order.append(module_name)
@@ -0,0 +1,271 @@
+import time
+
+from botlang.ast.ast import Definition, ModuleFunctionExport, ModuleImport
+from botlang.macros.macro_expander import IdentifierFinder
+from botlang.modules.dependencies import ModuleDependencyFinder, \
+    ModuleDependencyGraph
+from botlang.modules.module import BotlangModule
+
+
+class UnlinkableModuleException(Exception):
+
+    def __init__(self, module_name, reason):
+        super(UnlinkableModuleException, self).__init__(
+            'Module "{0}" can\'t be linked: {1}'.format(module_name, reason)
+        )
+
+
+class LinkedModule(object):
+    """
+    Top-level forms of a module, and the ones a bundle keeps
+    """
+    def __init__(self, module):
+
+        self.name = module.name
+        self.source = module.body_ast.s_expr.code
+        self.forms = list(zip(
+            module.body_ast.expressions,
+            module.body_ast.s_expr.children[2:]
+        ))
+        self.definitions = {
+            form.name: form for form, s_expr in self.forms
+            if isinstance(form, Definition)
+        }
+        self.exports = set()
+        self.required_modules = []
+        for form, s_expr in self.forms:
+            if isinstance(form, ModuleFunctionExport):
+                self.exports.update(
+                    identifier.identifier
+                    for identifier in form.identifiers_to_export
+                )
+            elif isinstance(form, ModuleImport):
+                self.required_modules.extend(
+                    ModuleDependencyFinder.required_by(form)
+                )
+
+        self.kept_definitions = set()
+        self.kept_exports = set()
+        self.pending_names = set(
+            name for form, s_expr in self.forms
+            if not isinstance(
+                form,
+                (Definition, ModuleFunctionExport, ModuleImport)
+            )
+            for name in identifiers(form)
+        )
+
+    def require(self, names):
+        """
+        Marks exported names as used by a dependent module or the bot
+        """
+        used_exports = self.exports.intersection(names)
+        self.kept_exports.update(used_exports)
+        self.pending_names.update(used_exports)
+
+    def shake(self):
+        """
+        Keeps the definitions reachable from the pending names
+        :return: names that are not defined in this module
+        """
+        free_names = set()
+        while self.pending_names:
+            name = self.pending_names.pop()
+            definition = self.definitions.get(name)
+            if definition is None:
+                free_names.add(name)
+            elif name not in self.kept_definitions:
+                self.kept_definitions.add(name)
+                self.pending_names.update(
+                    identifiers(definition.expr).difference(
+                        self.kept_definitions
+                    )
+                )
+        return free_names
+
+    def keeps(self, form, dropped_modules):
+
+        if isinstance(form, Definition):
+            return form.name in self.kept_definitions
+        if isinstance(form, ModuleImport):
+            return not ModuleDependencyFinder.required_by(form).issubset(
+                dropped_modules
+            )
+        return not isinstance(form, ModuleFunctionExport)
+
+    def is_unused(self, dropped_modules):
+        """
+        :return: whether the module keeps no definitions nor other forms
+        """
+        return not self.kept_definitions and not any(
+            self.keeps(form, dropped_modules) for form, s_expr in self.forms
+        )
+
+    def linked_source(self, dropped_modules):
+
+        forms = [
+            s_expr.code for form, s_expr in self.forms
+            if self.keeps(form, dropped_modules)
+        ]
+        forms.append('(provide {0})'.format(
+            ' '.join(sorted(self.kept_exports))
+        ))
+        return '(module "{0}"\n    {1}\n)'.format(
+            self.name,
+            '\n    '.join(forms)
+        )
+
+
+def identifiers(ast):
+
+    finder = IdentifierFinder()
+    ast.accept(finder, None)
+    return finder.identifiers
+
+
+class BotLinker(object):
+    """
+    Resolves the requires of a bot at link time, and bundles the bot with
+    the definitions it transitively uses from each module. Identifier
+    references are over-approximated: names shadowed by local bindings
+    keep the module definitions of the same name.
+    """
+    def __init__(self, module_resolver):
+
+        self.module_resolver = module_resolver
+
+    def link(self, bot_code, source_id=None):
+        """
+        :rtype: BotBundle
+        """
+        from botlang import BotlangSystem
+
+        bot_ast = BotlangSystem.parse(bot_code, source_id)
+        bot_names = set()
+        required_modules = set()
+        for ast in bot_ast:
+            bot_names.update(identifiers(ast))
+            required_modules.update(ModuleDependencyFinder.required_by(ast))
+        # Modules defined in the bot are kept in it, and their own
+        # requirements are linked as the bot's
+        inline_modules = ModuleDependencyFinder.defined_in(bot_ast)
+        for inline_requirements in inline_modules.values():
+            required_modules.update(inline_requirements)
+        required_modules.difference_update(inline_modules)
+
+        linked_modules = {}
+        requirements = [(name, bot_names) for name in required_modules]
+        while requirements:
+            module_name, names = requirements.pop()
+            linked_module = linked_modules.get(module_name)
+            if linked_module is None:
+                linked_module = LinkedModule(self.find_module(module_name))
+                linked_modules[module_name] = linked_module
+            linked_module.require(names)
+            free_names = linked_module.shake()
+            requirements.extend(
+                (required_module, free_names)
+                for required_module in linked_module.required_modules
+            )
+
+        order = ModuleDependencyGraph({
+            name: linked_module.required_modules
+            for name, linked_module in linked_modules.items()
+        }).topological_order()
+
+        dropped_modules = set()
+        for module_name in order:
+            if module_name not in required_modules and \
+                    linked_modules[module_name].is_unused(dropped_modules):
+                dropped_modules.add(module_name)
+
+        return BotBundle(
+            [linked_modules[name] for name in order],
+            dropped_modules,
+            bot_code
+        )
+
+    def find_module(self, module_name):
+
+        if module_name is None:
+            raise UnlinkableModuleException(
+                '<unknown>',
+                'its name is computed at runtime'
+            )
+
+        module = self.module_resolver.find_module(module_name)
+        if module is None:
+            raise UnlinkableModuleException(module_name, 'module not found')
+        if not isinstance(module, BotlangModule):
+            raise UnlinkableModuleException(
+                module_name,
+                'it is not a Botlang module'
+            )
+        return module
+
+
+class BotBundle(object):
+    """
+    Self-contained bot source: the linked modules followed by the bot
+    """
+    def __init__(self, linked_modules, dropped_modules, bot_code):
+
+        linked_sources = {
+            linked_module.name: linked_module.linked_source(dropped_modules)
+            for linked_module in linked_modules
+            if linked_module.name not in dropped_modules
+        }
+        self.modules_source = '\n\n'.join(
+            linked_sources[linked_module.name]
+            for linked_module in linked_modules
+            if linked_module.name in linked_sources
+        )
+        self.source = '{0}\n\n{1}'.format(self.modules_source, bot_code)
+        self.modules_report = {
+            linked_module.name: {
+                'source_size': len(linked_module.source.encode('utf-8')),
+                'linked_size': len(
+                    linked_sources.get(linked_module.name, '').encode('utf-8')
+                ),
+                'definitions': len(linked_module.definitions),
+                'kept_definitions': len(linked_module.kept_definitions)
+            }
+            for linked_module in linked_modules
+        }
+        self.load_time = None
+
+    def load(self, source_id=None):
+        """
+        Compiles the bundle with a module resolver of its own, without
+        loading any module from disk
+        :rtype: CompiledBot
+        """
+        from botlang import BotlangSystem
+        from botlang.modules.cache import ModuleCache
+        from botlang.modules.resolver import ModuleResolver
+
+        start = time.time()
+        module_resolver = ModuleResolver(
+            BotlangSystem.base_environment(),
+            module_cache=ModuleCache.get()
+        )
+        compiled_bot = BotlangSystem(module_resolver=module_resolver)\
+            .compile_bot(self.source, source_id)
+        self.load_time = time.time() - start
+        return compiled_bot
+
+    def save(self, path):
+
+        with open(path, 'w') as bundle_file:
+            bundle_file.write(self.source)
+
+    def report(self):
+        """
+        :return: dict with the bundle size, the size of each linked module
+            against its source and the time of the last load (seconds)
+        """
+        return {
+            'size': len(self.source.encode('utf-8')),
+            'modules': self.modules_report,
+            'load_time': self.load_time
+        }
@@ -1,5 +1,12 @@
+import threading
+import time
+from types import MappingProxyType
+
 from botlang.ast.ast_visitor import ASTVisitor
 from botlang.evaluation.values import Nil, Primitive
+from botlang.modules.dependencies import CyclicModuleDependencyException, \
+    ModuleDependencyFinder
+from botlang.parser import Parser
 
 
 class Module(object):
@@ -12,28 +19,111 @@ class Module(object):
 
 
 class BotlangModule(Module):
+    """
+    Module written in Botlang. It is evaluated once, on first use; threads
+    that need it meanwhile wait for that evaluation to finish. Each module
+    has its own lock, so evaluating a module never waits for unrelated
+    ones.
+    """
+    required_modules_by_source = {}
+    identifiers_by_source = {}
 
     def __init__(self, name, body_ast):
 
         super(BotlangModule, self).__init__(name)
         self.body_ast = body_ast
         self.evaluated = False
+        self.evaluating = False
+        self.evaluation_time = None
         self.bindings = {}
-
-    def get_bindings(self, evaluator):
-
+        self.required_modules_cache = None
+        self.identifiers_cache = None
+        self.evaluation_lock = threading.RLock()
+
+        s_expr = getattr(body_ast, 's_expr', None)
+        self.source_hash = None if s_expr is None \
+            else Parser.generate_string_hash(s_expr.code)
+
+    @property
+    def required_modules(self):
+        """
+        Names of the modules required by this module's body (None stands
+        for a module name that is computed at runtime)
+        """
+        if self.required_modules_cache is None:
+            required_modules = self.required_modules_by_source.get(
+                self.source_hash
+            )
+            if required_modules is None:
+                required_modules = frozenset(
+                    ModuleDependencyFinder.required_by(self.body_ast)
+                )
+                if self.source_hash is not None:
+                    self.required_modules_by_source[self.source_hash] = \
+                        required_modules
+            self.required_modules_cache = required_modules
+        return self.required_modules_cache
+
+    @property
+    def identifiers(self):
+        """
+        Every identifier referenced in the module's body: an
+        over-approximation of the names it takes from its environment
+        """
+        if self.identifiers_cache is None:
+            identifiers = self.identifiers_by_source.get(self.source_hash)
+            if identifiers is None:
+                from botlang.macros.macro_expander import IdentifierFinder
+
+                finder = IdentifierFinder()
+                self.body_ast.accept(finder, None)
+                identifiers = frozenset(finder.identifiers)
+                if self.source_hash is not None:
+                    self.identifiers_by_source[self.source_hash] = \
+                        identifiers
+            self.identifiers_cache = identifiers
+        return self.identifiers_cache
+
+    def get_bindings(self, evaluator, environment=None):
+        """
+        :param environment: environment to evaluate the module in. By
+            default, the environment of the evaluator's module resolver
+        """
         if not self.evaluated:
-            self.evaluate_module_code(evaluator)
-            self.evaluated = True
+            with self.evaluation_lock:
+                self.evaluate_once(evaluator, environment)
         return self.bindings
 
-    def evaluate_module_code(self, evaluator):
+    def evaluate_once(self, evaluator, environment):
+
+        if self.evaluated:
+            return
+        if self.evaluating:
+            raise CyclicModuleDependencyException([self.name])
+        self.evaluating = True
+        try:
+            start = time.time()
+            self.evaluate_module_code(evaluator, environment)
+            self.evaluation_time = time.time() - start
+            self.bindings = MappingProxyType(self.bindings)
+            self.evaluated = True
+        finally:
+            self.evaluating = False
+
+    def share_bindings(self, module):
+        """
+        Takes the exports of an evaluated module with the same source
+        """
+        self.bindings = module.bindings
+        self.evaluation_time = 0.0
+        self.evaluated = True
 
+    def evaluate_module_code(self, evaluator, environment=None):
+
+        if environment is None:
+            environment = evaluator.module_resolver.environment
         module_evaluator = ModuleEvaluator(evaluator, self)
-        self.body_ast.accept(
-            module_evaluator,
-            evaluator.module_resolver.environment
-        )
+        self.body_ast.accept(module_evaluator, environment.new_environment())
 
     def add_binding(self, id, closure):
 
@@ -46,13 +136,16 @@ class ExternalModule(Module):
 
         super(ExternalModule, self).__init__(name)
         self.function_bindings = function_bindings
+        self.bindings = None
 
     def get_bindings(self, evaluator):
 
-        return {
-            key: Primitive(primitive, None)
-            for key, primitive in self.function_bindings.items()
-        }
+        if self.bindings is None:
+            self.bindings = MappingProxyType({
+                key: Primitive(primitive, None)
+                for key, primitive in self.function_bindings.items()
+            })
+        return self.bindings
 
 
 class ModuleEvaluator(ASTVisitor):
@@ -1,4 +1,11 @@
 import os
+import re
+import threading
+import time
+
+from botlang.modules.dependencies import ModuleDependencyFinder, \
+    ModuleDependencyGraph, parse_module_file
+from botlang.modules.module import BotlangModule
 
 
 class DuplicateModuleException(Exception):
@@ -18,11 +25,30 @@ class ModuleNotFoundException(Exception):
 
 
 class ModuleResolver(object):
+    """
+    Module registry. Modules are evaluated in a child of the resolver's
+    environment. Modules not found in a resolver are searched in its
+    parent, which evaluates them in its own environment.
+
+    Module files are indexed by the names in the '(module "name" ...)'
+    headers of their top-level forms, and only parsed and evaluated when
+    one of their modules is first required. Files with other top-level
+    forms are run when loaded.
+
+    With a ModuleCache, modules are evaluated once per process and their
+    exports are shared with every resolver that defines the same module.
+    """
+    MODULE_HEADER_REGEX = re.compile(r'[(\[]\s*module\s+"([^"]+)"')
 
-    def __init__(self, environment):
+    def __init__(self, environment, parent=None, module_cache=None):
 
         self.environment = environment
+        self.parent = parent
+        self.module_cache = module_cache
         self.modules = {}
+        self.module_paths = {}
+        self.load_times = {}
+        self.lock = threading.RLock()
 
     def add_module(self, module):
 
@@ -30,29 +56,283 @@ class ModuleResolver(object):
             raise DuplicateModuleException(module.name)
         self.modules[module.name] = module
 
-    def get_bindings(self, evaluator, module_name):
+    def get_module(self, module_name):
 
         module = self.modules.get(module_name)
+        if module is None and module_name in self.module_paths:
+            module = self.load_indexed_module(module_name)
+        return module
+
+    def get_bindings(self, evaluator, module_name):
+
+        module = self.get_module(module_name)
         if module is None:
+            if self.parent is not None:
+                return self.parent.get_bindings(evaluator, module_name)
             raise ModuleNotFoundException(module_name)
+
+        if isinstance(module, BotlangModule) and not module.evaluated:
+            if self.module_cache is not None:
+                return self.module_cache.get_bindings(module, self)
+            if evaluator.module_resolver is not self:
+                from botlang.evaluation.evaluator import Evaluator
+                evaluator = Evaluator(module_resolver=self)
         return module.get_bindings(evaluator)
 
+    def module_key(self, module_name, visiting=()):
+        """
+        :return: hashable identity of a module, for ModuleCache
+        """
+        module = self.get_module(module_name)
+        if module is None:
+            if self.parent is not None:
+                return self.parent.module_key(module_name, visiting)
+            raise ModuleNotFoundException(module_name)
+
+        if isinstance(module, BotlangModule) and self.module_cache is not None:
+            return self.module_cache.module_key(module, self, visiting)
+        return module
+
+    def find_module(self, module_name):
+        """
+        :return: the module with that name in this resolver or its parents,
+            or None
+        """
+        resolver = self
+        while resolver is not None:
+            module = resolver.get_module(module_name)
+            if module is not None:
+                return module
+            resolver = resolver.parent
+        return None
+
+    def module_closure(self, module_names):
+        """
+        :return: dict of module name -> module, for the given modules and
+            the modules they transitively require
+        """
+        closure = {}
+        pending = [name for name in module_names if name is not None]
+        while pending:
+            module_name = pending.pop()
+            if module_name in closure:
+                continue
+            module = self.find_module(module_name)
+            if module is None:
+                continue
+            closure[module_name] = module
+            if isinstance(module, BotlangModule):
+                pending.extend(
+                    name for name in module.required_modules
+                    if name is not None
+                )
+        return closure
+
+    def dependent_modules(self, module_name):
+        """
+        :return: names of this resolver's modules that transitively
+            require a module
+        """
+        dependents = set()
+        pending = [module_name]
+        while pending:
+            required_name = pending.pop()
+            for name, module in self.modules.items():
+                if name not in dependents \
+                        and isinstance(module, BotlangModule) \
+                        and required_name in module.required_modules:
+                    dependents.add(name)
+                    pending.append(name)
+        dependents.discard(module_name)
+        return dependents
+
+    def reload_module(self, module_name, path=None):
+        """
+        Reloads a module from its file, and evaluates it again with the
+        modules that transitively require it. They all replace the old ones
+        at once, when every one of them was evaluated; values taken from
+        the old modules (e.g. by compiled bots) are not affected.
+
+        The resolver is only locked to stage the modules and to swap them
+        in: they are evaluated meanwhile, while live turns keep requiring
+        (and lazily loading) the current ones.
+        :param path: module file. By default, the indexed one
+        :return: set of the reloaded module names
+        """
+        if path is None:
+            path = self.module_paths.get(module_name)
+        if path is None:
+            if module_name not in self.modules and self.parent is not None:
+                return self.parent.reload_module(module_name)
+            raise ModuleNotFoundException(module_name)
+
+        with self.lock:
+            staging_resolver = ModuleResolver(
+                self.environment,
+                parent=self,
+                module_cache=self.module_cache
+            )
+            staging_resolver.load_module(path)
+            if module_name not in staging_resolver.modules:
+                raise ModuleNotFoundException(module_name)
+            for name in self.dependent_modules(module_name):
+                if name not in staging_resolver.modules:
+                    staging_resolver.add_module(
+                        BotlangModule(name, self.modules[name].body_ast)
+                    )
+
+        staging_resolver.preload()
+
+        with self.lock:
+            modules = dict(self.modules)
+            modules.update(staging_resolver.modules)
+            self.modules = modules
+            self.module_paths[module_name] = path
+            self.load_times.update(staging_resolver.load_times)
+        return set(staging_resolver.modules)
+
+    def module_names(self):
+
+        return set(self.modules.keys()).union(self.module_paths.keys())
+
+    def preload(self, executor=None):
+        """
+        Loads and evaluates every module, each one after the modules it
+        requires. Dependency cycles are detected before any evaluation.
+        :param executor: optional concurrent.futures executor used to parse
+            the module files that are not loaded yet in parallel
+        """
+        from botlang.evaluation.evaluator import Evaluator
+
+        with self.lock:
+            paths = sorted(set(
+                path for module_name, path in self.module_paths.items()
+                if module_name not in self.modules
+            ))
+            if executor is None:
+                parsed_files = list(map(parse_module_file, paths))
+            else:
+                parsed_files = list(executor.map(
+                    parse_module_file,
+                    paths,
+                    chunksize=max(1, len(paths) // 32)
+                ))
+
+            dependencies = {
+                module.name: module.required_modules
+                for module in self.modules.values()
+                if isinstance(module, BotlangModule)
+            }
+            for path, ast_seq, parse_time in parsed_files:
+                dependencies.update(ModuleDependencyFinder.defined_in(ast_seq))
+            order = ModuleDependencyGraph(dependencies).topological_order()
+
+            for path, ast_seq, parse_time in parsed_files:
+                self.define_modules(ast_seq, parse_time)
+            unordered_modules = sorted(self.module_names() - set(order))
+
+        # Evaluation takes the lock of each module, and lazy requires from
+        # live turns take this resolver's lock while holding one: modules
+        # are evaluated without holding it, so both orders never mix
+        evaluator = Evaluator(module_resolver=self)
+        for module_name in order + unordered_modules:
+            self.get_bindings(evaluator, module_name)
+        return self
+
     def load_modules(self, root_path):
 
         for root, subdirs, files in os.walk(root_path):
             for file in files:
                 if file.endswith('.botlang'):
                     path = os.path.join(root, file)
-                    self.load_module(path)
+                    module_names = self.read_module_names(path)
+                    if module_names is None:
+                        self.load_module(path)
+                    else:
+                        for module_name in module_names:
+                            self.module_paths[module_name] = path
+
+    @classmethod
+    def read_module_names(cls, path):
+        """
+        Scans a module file for the headers of its top-level forms,
+        without parsing it.
+        :return: the declared module names, or None if some top-level form
+            is not a module definition (the file must then be run eagerly)
+        """
+        with open(path, 'r') as module_file:
+            code = module_file.read()
+
+        module_names = []
+        depth = 0
+        position = 0
+        while position < len(code):
+            char = code[position]
+            if char == ';':
+                end = code.find('\n', position)
+                position = len(code) if end < 0 else end
+            elif char == '"':
+                position += 1
+                while position < len(code) and code[position] != '"':
+                    position += 2 if code[position] == '\\' else 1
+            elif char in '([':
+                if depth == 0:
+                    match = cls.MODULE_HEADER_REGEX.match(code, position)
+                    if match is None:
+                        return None
+                    module_names.append(match.group(1))
+                depth += 1
+            elif char in ')]':
+                depth -= 1
+            elif depth == 0 and not char.isspace():
+                return None
+            position += 1
+        return module_names
+
+    def load_indexed_module(self, module_name):
+
+        with self.lock:
+            module = self.modules.get(module_name)
+            if module is None:
+                self.load_module(self.module_paths[module_name])
+                module = self.modules.get(module_name)
+            return module
 
     def load_module(self, path):
 
+        path, ast_seq, parse_time = parse_module_file(path)
+        self.define_modules(ast_seq, parse_time)
+
+    def define_modules(self, ast_seq, parse_time=0.0):
+        """
+        Runs a parsed module file, which defines (without evaluating) the
+        modules it contains
+        """
         from botlang import BotlangSystem
-        module_file = open(path, 'r')
-        module_str = module_file.read()
-        module_file.close()
-        BotlangSystem.run(
-            module_str,
-            module_resolver=self,
-            source_id=path
+        from botlang.evaluation.evaluator import Evaluator
+
+        start = time.time()
+        defined_modules = set(self.modules.keys())
+        BotlangSystem(module_resolver=self).primitive_eval_ast(
+            ast_seq,
+            Evaluator(module_resolver=self)
         )
+        load_time = parse_time + time.time() - start
+        for module_name in set(self.modules.keys()) - defined_modules:
+            self.load_times[module_name] = load_time
+
+    def load_statistics(self):
+        """
+        :return: dict of module name -> path, whether it was loaded, its
+            parse and definition time and its evaluation time (seconds)
+        """
+        statistics = {}
+        for module_name in self.module_names():
+            module = self.modules.get(module_name)
+            statistics[module_name] = {
+                'path': self.module_paths.get(module_name),
+                'loaded': module is not None,
+                'load_time': self.load_times.get(module_name),
+                'evaluation_time': getattr(module, 'evaluation_time', None)
+            }
+        return statistics
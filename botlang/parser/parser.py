@@ -14,7 +14,12 @@ class BotLangSyntaxError(Exception):
 
 
 class Parser(object):
-
+    """
+    Parses Botlang code into ASTs. Parsed code is cached by its hash in a
+    process-wide dict. Concurrent misses may parse the same code twice, and
+    either result is kept. Once built, cached ASTs only get idempotent
+    annotations (call site marks, inline caches).
+    """
     asts_cache = {}
 
     @classmethod
@@ -0,0 +1,68 @@
+import inspect
+import os
+import threading
+
+from botlang.modules.cache import ModuleCache
+from botlang.modules.resolver import ModuleResolver
+
+
+class RuntimeImage(object):
+    """
+    Process-wide runtime shared by every bot instance: the primitives
+    environment and the bot helper modules. The environment is built once
+    and frozen, modules are evaluated once, on their first require (or on
+    preload). Each instance gets a copy-on-write overlay on top of them.
+    """
+    lock = threading.Lock()
+    shared_image = None
+
+    def __init__(self, module_paths):
+
+        from botlang import BotlangSystem
+
+        self.environment = BotlangSystem.base_environment()
+        self.module_resolver = ModuleResolver(
+            self.environment,
+            module_cache=ModuleCache.get()
+        )
+        for path in module_paths:
+            self.module_resolver.load_modules(path)
+        self.environment.freeze()
+
+    def preload(self, executor=None):
+        """
+        Loads and evaluates every module, in dependency order
+        :param executor: optional executor to parse module files in parallel
+        """
+        self.module_resolver.preload(executor)
+        return self
+
+    def new_instance(self):
+        """
+        :return: a BotlangSystem whose definitions and modules are written
+            to its own overlay, while reading through to this image
+        """
+        from botlang import BotlangSystem
+
+        overlay = self.environment.new_environment()
+        return BotlangSystem(
+            module_resolver=ModuleResolver(
+                overlay,
+                parent=self.module_resolver
+            )
+        )
+
+    @classmethod
+    def bot_helpers_path(cls):
+
+        from botlang.modules import bot_helpers
+        return os.path.dirname(inspect.getfile(bot_helpers))
+
+    @classmethod
+    def get(cls):
+
+        if cls.shared_image is None:
+            with cls.lock:
+                if cls.shared_image is None:
+                    cls.shared_image = RuntimeImage([cls.bot_helpers_path()])
+        return cls.shared_image
@@ -0,0 +1,318 @@
+import gc
+import itertools
+import multiprocessing
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from botlang.parser import Parser
+from botlang.runtime_image import RuntimeImage
+from botlang.workers.sharding import ConsistentHashRouter
+
+try:
+    import resource
+except ImportError:     # Not available on Windows
+    resource = None
+
+
+class RemoteTurnException(Exception):
+    """
+    Error raised by a turn in a worker process
+    """
+    def __init__(self, bot_id, error_type, message, stack_trace):
+
+        super(RemoteTurnException, self).__init__(
+            bot_id,
+            error_type,
+            message,
+            stack_trace
+        )
+        self.bot_id = bot_id
+        self.error_type = error_type
+        self.message = message
+        self.stack_trace = stack_trace
+
+    def __str__(self):
+        return '{0} in bot "{1}": {2}'.format(
+            self.error_type,
+            self.bot_id,
+            self.message
+        )
+
+
+worker_sources = None
+worker_hashes = None
+worker_system = None
+
+
+def init_worker(bot_sources):
+    """
+    Keeps the bot sources, and a system whose compiled bots cache holds
+    the bots routed to this worker
+    """
+    global worker_sources, worker_hashes, worker_system
+    worker_sources = bot_sources
+    worker_hashes = {
+        bot_id: Parser.generate_string_hash(code)
+        for bot_id, code in bot_sources.items()
+    }
+    worker_system = RuntimeImage.get().new_instance()
+
+
+def worker_bot(bot_id):
+    """
+    :rtype: CompiledBot
+    """
+    return worker_system.compiled_bots.get(
+        bot_id,
+        worker_sources[bot_id],
+        worker_hashes[bot_id]
+    )
+
+
+def compile_worker_bots(bot_ids):
+
+    for bot_id in bot_ids:
+        worker_bot(bot_id)
+    return len(worker_system.compiled_bots.bots)
+
+
+def worker_statistics():
+    """
+    :return: dict with the worker's compiled bots, cache hits and misses,
+        and peak resident memory (KiB, None where unknown)
+    """
+    compiled_bots = worker_system.compiled_bots
+    return {
+        'bots': sorted(compiled_bots.bots.keys()),
+        'hits': compiled_bots.hits,
+        'misses': compiled_bots.misses,
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if resource is not None else None
+    }
+
+
+def handle_turns(turns):
+    """
+    Runs turns in a worker process
+    :param turns: list of (bot_id, input_msg, next_node, data)
+    :return: list with the result of each turn, or its RemoteTurnException
+    """
+    results = []
+    for bot_id, input_msg, next_node, data in turns:
+        try:
+            results.append(
+                worker_bot(bot_id).handle(input_msg, next_node, data)
+            )
+        except Exception as e:
+            stack_trace = e.print_stack_trace() \
+                if hasattr(e, 'print_stack_trace') \
+                else traceback.format_exc()
+            results.append(RemoteTurnException(
+                bot_id,
+                type(e).__name__,
+                str(e),
+                stack_trace
+            ))
+    return results
+
+
+class BotlangPool(object):
+    """
+    Runs bot turns in worker processes, so CPU-bound bots are not limited
+    to one core by the GIL.
+
+    A router maps each turn's key (its conversation id, or else its bot
+    id) to a worker. With the default consistent hashing router, the turns
+    of a bot always go to the same worker, so each worker only compiles
+    and caches the bots of its shard, and adding or removing a worker only
+    moves about 1/N of the bots.
+
+    Where fork is available, the runtime image is loaded once in the
+    parent and the workers share those memory pages (see
+    WorkerSupervisor). Workers added after start are forked from the
+    parent's unfrozen heap, so they share fewer pages.
+    """
+    def __init__(self, bot_sources, worker_count=None, router=None):
+        """
+        :param bot_sources: dict of bot id -> bot code
+        :param worker_count: number of worker processes (default: one per
+            CPU)
+        :param router: ConsistentHashRouter (default) or RoundRobinRouter
+        """
+        self.bot_sources = dict(bot_sources)
+        self.worker_count = worker_count or multiprocessing.cpu_count()
+        self.router = router if router is not None \
+            else ConsistentHashRouter()
+        self.executors = {}
+        self.worker_ids = itertools.count()
+        self.mp_context = None
+
+    def start(self):
+        """
+        Starts the workers, each with the bots of its shard compiled
+        """
+        if 'fork' in multiprocessing.get_all_start_methods():
+            self.mp_context = multiprocessing.get_context('fork')
+            gc.disable()
+            try:
+                RuntimeImage.get().preload()
+            finally:
+                gc.collect()
+                if hasattr(gc, 'freeze'):
+                    gc.freeze()
+                gc.enable()
+
+        for _ in range(self.worker_count):
+            self.start_worker()
+        # Executors fork their process on the first submitted task
+        self.warm_up(self.executors.keys())
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        return self
+
+    def start_worker(self):
+
+        worker_id = next(self.worker_ids)
+        self.executors[worker_id] = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self.mp_context,
+            initializer=init_worker,
+            initargs=(self.bot_sources,)
+        )
+        self.router.add_worker(worker_id)
+        return worker_id
+
+    def warm_up(self, worker_ids):
+        """
+        Compiles, in the given workers, the bots their shards own
+        """
+        shards = self.shards()
+        for future in [
+            self.executors[worker_id].submit(
+                compile_worker_bots,
+                shards.get(worker_id, [])
+            )
+            for worker_id in worker_ids
+        ]:
+            future.result()
+
+    def shards(self):
+        """
+        :return: dict of worker id -> ids of the bots routed to it by bot
+            id (meaningless with a round-robin router)
+        """
+        shards = {}
+        for bot_id in self.bot_sources:
+            shards.setdefault(self.router.worker_for(bot_id), []).append(
+                bot_id
+            )
+        return shards
+
+    def add_worker(self):
+        """
+        Starts one more worker. It takes over part of the other workers'
+        shards and compiles those bots before the first turn.
+        :return: worker id
+        """
+        worker_id = self.start_worker()
+        self.warm_up([worker_id])
+        return worker_id
+
+    def remove_worker(self, worker_id):
+        """
+        Stops a worker. Its bots move to the workers that follow it in the
+        ring, which compile them on their first turn.
+        """
+        self.router.remove_worker(worker_id)
+        self.executors.pop(worker_id).shutdown()
+
+    def shutdown(self):
+
+        for executor in self.executors.values():
+            executor.shutdown()
+        self.executors = {}
+        for worker_id in list(self.router.workers()):
+            self.router.remove_worker(worker_id)
+
+    def __enter__(self):
+
+        if not self.executors:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.shutdown()
+
+    def statistics(self):
+        """
+        :return: dict of worker id -> worker statistics (compiled bots,
+            cache hits and misses, peak memory)
+        """
+        futures = {
+            worker_id: executor.submit(worker_statistics)
+            for worker_id, executor in self.executors.items()
+        }
+        return {
+            worker_id: future.result() for worker_id, future in futures.items()
+        }
+
+    def worker_for(self, bot_id, conversation_id=None):
+
+        return self.router.worker_for(
+            bot_id if conversation_id is None else conversation_id
+        )
+
+    def handle(
+            self,
+            bot_id,
+            input_msg,
+            next_node=None,
+            data=None,
+            conversation_id=None
+    ):
+        """
+        :rtype: BotResultValue
+        """
+        future = self.executors[self.worker_for(bot_id, conversation_id)]\
+            .submit(handle_turns, [(bot_id, input_msg, next_node, data)])
+        result = future.result()[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def handle_batch(self, turns, chunk_size=64):
+        """
+        Runs turns concurrently across the workers, in chunks of turns of
+        the same worker
+        :param turns: iterable of
+            (bot_id, input_msg[, next_node[, data[, conversation_id]]])
+        :return: list with the result of each turn, in order. A turn that
+            fails has its RemoteTurnException in place of the result
+        """
+        turns = list(turns)
+        indexes_by_worker = {}
+        turns_by_worker = {}
+        for index, turn in enumerate(turns):
+            turn = tuple(turn) + (None,) * (5 - len(turn))
+            worker_id = self.worker_for(turn[0], turn[4])
+            indexes_by_worker.setdefault(worker_id, []).append(index)
+            turns_by_worker.setdefault(worker_id, []).append(turn[:4])
+
+        chunks = []
+        for worker_id, worker_turns in turns_by_worker.items():
+            worker_indexes = indexes_by_worker[worker_id]
+            for start in range(0, len(worker_turns), chunk_size):
+                chunks.append((
+                    worker_indexes[start:start + chunk_size],
+                    self.executors[worker_id].submit(
+                        handle_turns,
+                        worker_turns[start:start + chunk_size]
+                    )
+                ))
+
+        results = [None] * len(turns)
+        for chunk_indexes, future in chunks:
+            for index, result in zip(chunk_indexes, future.result()):
+                results[index] = result
+        return results
@@ -0,0 +1,79 @@
+import bisect
+import hashlib
+import itertools
+
+
+def stable_hash(key):
+    """
+    Hash of a string that does not change across processes and runs
+    """
+    return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+
+class ConsistentHashRouter(object):
+    """
+    Consistent hashing ring. Each worker owns many points (replicas) of the
+    ring, and a key belongs to the worker of the first point that follows
+    its hash. Adding or removing a worker only moves the keys of the ring
+    arcs it gains or loses, about 1/N of them.
+    """
+    def __init__(self, workers=(), replicas=64):
+
+        self.replicas = replicas
+        self.points = []
+        self.owners = {}
+        for worker in workers:
+            self.add_worker(worker)
+
+    def add_worker(self, worker):
+
+        for replica in range(self.replicas):
+            point = stable_hash('{0}#{1}'.format(worker, replica))
+            if point not in self.owners:
+                bisect.insort(self.points, point)
+                self.owners[point] = worker
+
+    def remove_worker(self, worker):
+
+        self.points = [
+            point for point in self.points if self.owners[point] != worker
+        ]
+        self.owners = {
+            point: owner for point, owner in self.owners.items()
+            if owner != worker
+        }
+
+    def workers(self):
+        return set(self.owners.values())
+
+    def worker_for(self, key):
+
+        if not self.points:
+            raise LookupError('No workers to route to')
+        index = bisect.bisect(self.points, stable_hash(key))
+        return self.owners[self.points[index % len(self.points)]]
+
+
+class RoundRobinRouter(object):
+    """
+    Routes each turn to the next worker, regardless of its key
+    """
+    def __init__(self, workers=()):
+
+        self.worker_list = list(workers)
+        self.counter = itertools.count()
+
+    def add_worker(self, worker):
+        self.worker_list.append(worker)
+
+    def remove_worker(self, worker):
+        self.worker_list.remove(worker)
+
+    def workers(self):
+        return set(self.worker_list)
+
+    def worker_for(self, key):
+
+        if not self.worker_list:
+            raise LookupError('No workers to route to')
+        return self.worker_list[next(self.counter) % len(self.worker_list)]
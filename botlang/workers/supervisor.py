@@ -0,0 +1,94 @@
+import gc
+import os
+import signal
+import traceback
+
+from botlang.runtime_image import RuntimeImage
+
+
+class WorkerSupervisor(object):
+    """
+    Pre-forking supervisor. The runtime image and the compiled bots are
+    loaded in the parent process and moved to the garbage collector's
+    permanent generation before forking, so the workers share those memory
+    pages instead of copying them on the first collection. The parent
+    unfreezes its own heap once the workers are forked.
+    """
+    def __init__(self, bot_sources, worker_count, worker_main):
+        """
+        :param bot_sources: dict of bot id -> bot code
+        :param worker_count: number of workers to fork
+        :param worker_main: function(worker_index, compiled_bots) run by
+            each worker. Its return value is the worker's exit status.
+        """
+        self.bot_sources = bot_sources
+        self.worker_count = worker_count
+        self.worker_main = worker_main
+        self.compiled_bots = None
+        self.worker_pids = []
+
+    def preload(self):
+
+        gc.disable()
+        try:
+            RuntimeImage.get().preload()
+            self.compiled_bots = {
+                bot_id: RuntimeImage.get().new_instance().compile_bot(
+                    code,
+                    source_id=bot_id
+                )
+                for bot_id, code in self.bot_sources.items()
+            }
+        finally:
+            gc.collect()
+            if hasattr(gc, 'freeze'):
+                gc.freeze()
+            gc.enable()
+        return self.compiled_bots
+
+    def start(self):
+
+        if self.compiled_bots is None:
+            self.preload()
+
+        for worker_index in range(self.worker_count):
+            pid = os.fork()
+            if pid == 0:
+                self.run_worker(worker_index)
+            self.worker_pids.append(pid)
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        return self.worker_pids
+
+    def run_worker(self, worker_index):
+
+        exit_status = 1
+        try:
+            exit_status = self.worker_main(worker_index, self.compiled_bots)
+            if exit_status is None:
+                exit_status = 0
+        except Exception:
+            traceback.print_exc()
+        finally:
+            os._exit(exit_status)
+
+    def wait(self):
+        """
+        :return: dict of worker pid -> exit status
+        """
+        statuses = {}
+        for pid in self.worker_pids:
+            _, status = os.waitpid(pid, 0)
+            statuses[pid] = os.WEXITSTATUS(status) \
+                if os.WIFEXITED(status) else -1
+        self.worker_pids = []
+        return statuses
+
+    def stop(self):
+
+        for pid in self.worker_pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        return self.wait()
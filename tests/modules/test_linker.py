@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from botlang import BotlangSystem
+from botlang.modules.linker import UnlinkableModuleException
+from botlang.modules.module import ExternalModule
+
+
+class LinkerTestCase(TestCase):
+
+    rut_bot_code = """
+    (require "bot-helpers")
+    (bot-node (data)
+        (node-result
+            data
+            (if (validate-rut (input-message)) "valid" "invalid")
+            end-node
+        )
+    )
+    """
+
+    options_bot_code = """
+    (require "bot-helpers")
+    (bot-node (data)
+        (node-result
+            data
+            (format-options data "Pick one" (list (option "a" "A" "n")))
+            end-node
+        )
+    )
+    """
+
+    def test_tree_shaking(self):
+
+        bundle = BotlangSystem.bot_instance().link_bot(self.rut_bot_code)
+        self.assertIn('validate-rut', bundle.modules_source)
+        self.assertNotIn('format-options', bundle.modules_source)
+        self.assertNotIn('"plain-formatter"', bundle.modules_source)
+        self.assertNotIn('"facebook-formatter"', bundle.modules_source)
+
+        report = bundle.report()
+        modules_report = report['modules']
+        self.assertEqual(report['size'], len(bundle.source))
+        self.assertEqual(modules_report['bot-helpers']['kept_definitions'], 1)
+        self.assertEqual(modules_report['plain-formatter']['linked_size'], 0)
+        self.assertIsNone(report['load_time'])
+
+        compiled_bot = bundle.load()
+        self.assertEqual(compiled_bot.handle('16926695-6').message, 'valid')
+        self.assertEqual(compiled_bot.handle('16926695-5').message, 'invalid')
+        self.assertTrue(bundle.report()['load_time'] > 0)
+
+    def test_transitive_definitions(self):
+
+        system = BotlangSystem.bot_instance()
+        bundle = system.link_bot(self.options_bot_code)
+        self.assertIn('"plain-formatter"', bundle.modules_source)
+        self.assertIn('"facebook-formatter"', bundle.modules_source)
+        self.assertNotIn('validate-rut', bundle.modules_source)
+
+        linked_bot = bundle.load()
+        compiled_bot = system.compile_bot(self.options_bot_code)
+        for data in [{}, {'social_network': 'facebook'}]:
+            self.assertEqual(
+                linked_bot.handle('hi', data=dict(data)).message,
+                compiled_bot.handle('hi', data=dict(data)).message
+            )
+
+    def test_inline_module_requirements(self):
+
+        bot_code = """
+        (module "rut-checker"
+            (require "bot-helpers")
+            [define check (fun (rut) (if (validate-rut rut) "valid" "no"))]
+            (provide check)
+        )
+        (require "rut-checker")
+        (bot-node (data)
+            (node-result data (check (input-message)) end-node)
+        )
+        """
+        bundle = BotlangSystem.bot_instance().link_bot(bot_code)
+        self.assertIn('bot-helpers', bundle.report()['modules'])
+        self.assertNotIn('rut-checker', bundle.report()['modules'])
+        self.assertIn('validate-rut', bundle.modules_source)
+
+        compiled_bot = bundle.load()
+        self.assertEqual(compiled_bot.handle('16926695-6').message, 'valid')
+        self.assertEqual(compiled_bot.handle('16926695-5').message, 'no')
+
+    def test_saved_bundle(self):
+
+        bundle_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bundle_path)
+        bundle_file = os.path.join(bundle_path, 'bot.botlang')
+
+        BotlangSystem.bot_instance().link_bot(self.rut_bot_code)\
+            .save(bundle_file)
+        with open(bundle_file) as saved_bundle:
+            compiled_bot = BotlangSystem().compile_bot(saved_bundle.read())
+        self.assertEqual(compiled_bot.handle('16926695-6').message, 'valid')
+
+    def test_unlinkable_modules(self):
+
+        system = BotlangSystem()
+        system.module_resolver.add_module(
+            ExternalModule('external', {'moo': lambda: 'moo'})
+        )
+        with self.assertRaises(UnlinkableModuleException):
+            system.link_bot('(require "external") (moo)')
+        with self.assertRaises(UnlinkableModuleException):
+            system.link_bot('(require "missing") 1')
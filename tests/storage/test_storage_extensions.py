@@ -1,3 +1,4 @@
+import json
 import unittest
 
 from botlang import BotlangSystem
@@ -19,6 +20,18 @@ class DummyStore(StorageApi):
         del self.backend[key]
 
 
+class JsonStore(DummyStore):
+    """
+    Store that serializes its values, like a remote backend would
+    """
+    def put(self, key, value, expiration=None):
+        self.backend[key] = json.dumps(value)
+
+    def get(self, key):
+        value = self.backend.get(key)
+        return None if value is None else json.loads(value)
+
+
 class StorageExtensionTestCase(unittest.TestCase):
 
     def test_local_storage(self):
@@ -91,4 +104,34 @@ class StorageExtensionTestCase(unittest.TestCase):
         self.assertEqual(results['test1'], 444)
         self.assertEqual(results['test2'], None)
         self.assertEqual(results['got1'], ':3')
-        self.assertEqual(results['got2'], ':3')
\ No newline at end of file
+        self.assertEqual(results['got2'], ':3')
+
+    def test_serializing_storage(self):
+
+        runtime = BotlangSystem.bot_instance()
+        runtime.setup_local_storage(JsonStore())
+        runtime.setup_global_storage(JsonStore())
+        runtime.setup_cache_extension(JsonStore())
+        results = runtime.eval("""
+        [define value
+            (put (make-dict (list (list "tags" (list "a" "b")))) "n" 1)
+        ]
+        (localdb-put "local" value)
+        (globaldb-put "global" (list value (cons 0 (list 1 2))))
+        (cache-put "cache" (map (fun (x) (* x 2)) (list 1 2)))
+        (list
+            (localdb-get "local")
+            (globaldb-get "global")
+            (cache-get "cache")
+            (cache-get-or-else "computed" (fun () (list value)))
+            (cache-get "computed")
+        )
+        """)
+        value = {'tags': ['a', 'b'], 'n': 1}
+        self.assertEqual(results, [
+            value,
+            [value, [0, 1, 2]],
+            [2, 4],
+            [value],
+            [value]
+        ])
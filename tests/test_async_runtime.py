@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from botlang.evaluation.async_evaluator import SuspensionAnalyzer
+from botlang.evaluation.values import AsyncPrimitive
+from botlang.examples.example_bots import ExampleBots
+from botlang.interpreter import BotlangSystem
+from tests.storage.test_storage_extensions import DummyStore
+
+
+class AsyncRuntimeTestCase(unittest.TestCase):
+
+    lookup_bot_code = """
+    [define lookup-node
+        (bot-node (data message)
+            (node-result
+                data
+                (append "found: " (slow-lookup message))
+                lookup-node
+            )
+        )
+    ]
+    lookup-node
+    """
+
+    @classmethod
+    def slow_lookup_system(cls, delay):
+
+        async def slow_lookup(key):
+            await asyncio.sleep(delay)
+            return key.upper()
+
+        system = BotlangSystem.bot_instance()
+        system.environment.update({
+            'slow-lookup': AsyncPrimitive(
+                lambda key: key.upper(),
+                system.environment,
+                coroutine_function=slow_lookup
+            )
+        })
+        return system
+
+    def test_same_results_as_sync(self):
+
+        system = BotlangSystem.bot_instance()
+        bank_bot = ExampleBots.bank_bot_code
+        first = system.eval_bot(bank_bot, 'hola')
+        async_first = asyncio.run(system.eval_bot_async(bank_bot, 'hola'))
+        self.assertEqual(async_first.message, first.message)
+        self.assertEqual(async_first.next_node, first.next_node)
+
+        second = system.eval_bot(
+            bank_bot,
+            'tengo una emergencia',
+            first.next_node,
+            first.data
+        )
+        async_second = asyncio.run(system.eval_bot_async(
+            bank_bot,
+            'tengo una emergencia',
+            first.next_node,
+            first.data
+        ))
+        self.assertEqual(async_second.message, second.message)
+        self.assertEqual(async_second.data, second.data)
+
+    def test_concurrent_turns(self):
+
+        system = self.slow_lookup_system(0.2)
+
+        async def turns():
+            return await asyncio.gather(*[
+                system.eval_bot_async(self.lookup_bot_code, 'key{0}'.format(i))
+                for i in range(20)
+            ])
+
+        start = time.time()
+        results = asyncio.run(turns())
+        self.assertTrue(time.time() - start < 2)
+        self.assertEqual(
+            [result.message for result in results],
+            ['found: KEY{0}'.format(i) for i in range(20)]
+        )
+
+    def test_executor(self):
+
+        thread_names = []
+
+        def blocking_lookup(key):
+            thread_names.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return key.upper()
+
+        system = BotlangSystem.bot_instance()
+        system.environment.update({
+            'slow-lookup': AsyncPrimitive(blocking_lookup, system.environment)
+        })
+        executor = ThreadPoolExecutor(40, thread_name_prefix='lookups')
+        self.addCleanup(executor.shutdown)
+
+        async def turns():
+            return await asyncio.gather(*[
+                system.eval_bot_async(
+                    self.lookup_bot_code,
+                    'key{0}'.format(i),
+                    executor=executor
+                )
+                for i in range(40)
+            ])
+
+        start = time.time()
+        results = asyncio.run(turns())
+        self.assertTrue(time.time() - start < 2)
+        self.assertEqual(results[-1].message, 'found: KEY39')
+        self.assertTrue(all(
+            name.startswith('lookups') for name in thread_names
+        ))
+
+    def test_unresolved_callees_may_suspend(self):
+
+        analyzer = SuspensionAnalyzer(BotlangSystem.base_environment())
+        unresolved_call, primitive_call = BotlangSystem.parse(
+            '(later-helper 1) (+ 1 2)',
+            None
+        )
+        self.assertTrue(unresolved_call.accept(analyzer, None))
+        self.assertFalse(primitive_call.accept(analyzer, None))
+
+    def test_async_primitive_in_sync_turn(self):
+
+        system = self.slow_lookup_system(0)
+        result = system.eval_bot(self.lookup_bot_code, 'key')
+        self.assertEqual(result.message, 'found: KEY')
+
+    def test_async_storage(self):
+
+        db = DummyStore()
+        system = BotlangSystem.bot_instance().setup_local_storage(db)
+        result = asyncio.run(system.eval_bot_async(
+            """
+            (bot-node (data)
+                (begin
+                    (localdb-put "key" (input-message))
+                    (node-result data (localdb-get "key") end-node)
+                )
+            )
+            """,
+            'stored'
+        ))
+        self.assertEqual(result.message, 'stored')
+        self.assertEqual(db.backend, {'key': 'stored'})
+
+    def test_errors(self):
+
+        system = BotlangSystem.bot_instance()
+        with self.assertRaises(Exception) as context:
+            asyncio.run(system.eval_bot_async(
+                '(bot-node (data) (node-result data (undefined) end-node))',
+                'hi'
+            ))
+        self.assertIn('undefined', str(context.exception))
@@ -184,3 +184,100 @@ class TestBots(unittest.TestCase):
             )
 
         self.assertEqual(r.message, 13)
+
+    def test_compiled_bot(self):
+
+        runtime = BotlangSystem.bot_instance()
+        evaluations = []
+
+        def count_evaluation():
+            evaluations.append(1)
+            return len(evaluations)
+
+        runtime.environment.add_primitives({
+            'count-evaluation': count_evaluation
+        })
+        compiled_bot = runtime.compile_bot("""
+            [define evaluation-number (count-evaluation)]
+            [define echo-node
+                (bot-node (data message)
+                    (node-result
+                        (put data "count" evaluation-number)
+                        (append "echo: " message)
+                        echo-node
+                    )
+                )
+            ]
+            echo-node
+        """)
+        first = compiled_bot.handle('hola')
+        second = compiled_bot.handle('chao', first.next_node, first.data)
+        self.assertEqual(first.message, 'echo: hola')
+        self.assertEqual(second.message, 'echo: chao')
+        self.assertEqual(second.next_node, 'echo-node')
+        self.assertEqual(second.data, {'count': 1})
+        self.assertEqual(len(evaluations), 1)
+
+    def test_compiled_example_bot(self):
+
+        compiled_bot = BotlangSystem.bot_instance().compile_bot(
+            ExampleBots.bank_bot_code
+        )
+        first = compiled_bot.handle('hola')
+        self.assertEqual(first.message[0], 'ENTRY_MESSAGE')
+
+        second = compiled_bot.handle(
+            'tengo una emergencia',
+            first.next_node,
+            first.data
+        )
+        self.assertEqual(second.message[0], 'EMERGENCIAS_CABECERA')
+        self.assertSequenceEqual(
+            second.data.get('nodes-path'),
+            ['EMERGENCIA']
+        )
+        repeated = compiled_bot.handle(
+            'tengo una emergencia',
+            first.next_node,
+            first.data
+        )
+        self.assertEqual(repeated.message, second.message)
+        self.assertEqual(repeated.data, second.data)
+
+    def test_eval_bot_batch(self):
+
+        echo_bot = """
+            [define echo-node
+                (bot-node (data message)
+                    (node-result data (append "echo: " message) echo-node)
+                )
+            ]
+            echo-node
+        """
+        bank_bot = ExampleBots.bank_bot_code
+        runtime = BotlangSystem.bot_instance()
+        first = runtime.eval_bot(bank_bot, 'hola')
+
+        results = runtime.eval_bot_batch([
+            (echo_bot, 'one'),
+            (bank_bot, 'tengo una emergencia', first.next_node, first.data),
+            (echo_bot, 'two', 'missing-node'),
+            ('(bot-node (data) ', 'three'),
+            (echo_bot, 'four', 'echo-node', {'key': 'value'})
+        ])
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0].message, 'echo: one')
+        self.assertEqual(
+            results[1].message,
+            runtime.eval_bot(
+                bank_bot,
+                'tengo una emergencia',
+                first.next_node,
+                first.data
+            ).message
+        )
+        self.assertIsInstance(results[2], Exception)
+        self.assertIsInstance(results[3], Exception)
+        self.assertEqual(results[4].message, 'echo: four')
+        self.assertEqual(results[4].data, {'key': 'value'})
+        self.assertEqual(runtime.compiled_bots.misses, 3)
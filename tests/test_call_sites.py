@@ -0,0 +1,110 @@
+import unittest
+
+from botlang.evaluation.call_sites import CallSiteProfiler
+from botlang.interpreter import BotlangSystem
+
+
+class CallSitesTestCase(unittest.TestCase):
+
+    def test_cacheable_call_sites(self):
+
+        code = """
+        [define g (fun (x) (* x 2))]
+        [define f
+            (fun (h x)
+                [define k (fun (y) y)]
+                (list (g x) (h x) (k x) (local ([g (fun (y) y)]) (g x)))
+            )
+        ]
+        (f g 3)
+        """
+        ast_seq = BotlangSystem().parse(code, 'test')
+        cacheable = sorted(
+            site['code'] for site in
+            CallSiteProfiler.report(ast_seq)['call_sites']
+        )
+        self.assertEqual(
+            cacheable,
+            [
+                '(* x 2)',
+                '(f g 3)',
+                '(g x)',
+                '(list (g x) (h x) (k x) (local ([g (fun (y) y)]) (g x)))'
+            ]
+        )
+
+    def test_inline_cache_hits(self):
+
+        code = """
+        [define double (fun (x) (* x 2))]
+        (map (fun (x) (double x)) (list 1 2 3 4))
+        """
+        runtime = BotlangSystem()
+        self.assertEqual(runtime.eval(code), [2, 4, 6, 8])
+
+        report = CallSiteProfiler.report(runtime.parse(code, None))
+        double_site = [
+            site for site in report['call_sites']
+            if site['code'] == '(double x)'
+        ][0]
+        self.assertEqual(double_site['misses'], 1)
+        self.assertEqual(double_site['hits'], 3)
+        self.assertEqual(double_site['hit_rate'], 0.75)
+
+    def test_inline_cache_invalidation(self):
+
+        runtime = BotlangSystem()
+        runtime.eval("""
+        [define g (fun (x) (* x 2))]
+        [define f (fun (x) (g x))]
+        """)
+        self.assertEqual(runtime.eval('(f 3)'), 6)
+        self.assertEqual(runtime.eval('(f 3)'), 6)
+
+        runtime.eval('[define g (fun (x) (* x 3))]')
+        self.assertEqual(runtime.eval('(f 3)'), 9)
+
+        other_runtime = BotlangSystem()
+        other_runtime.eval("""
+        [define g (fun (x) (* x 4))]
+        [define f (fun (x) (g x))]
+        """)
+        self.assertEqual(other_runtime.eval('(f 3)'), 12)
+        self.assertEqual(runtime.eval('(f 3)'), 9)
+
+        shadowing_env = runtime.environment.new_environment(
+            {'g': runtime.eval('(fun (x) (* x 5))')}
+        )
+        self.assertEqual(BotlangSystem.run('(g 3)', shadowing_env), 15)
+        self.assertEqual(runtime.eval('(g 3)'), 9)
+
+    def test_inline_caches_of_unrelated_environments(self):
+
+        bot_code = """
+        [define double (fun (x) (* x 2))]
+        (bot-node (data)
+            (node-result data (double (input-message)) end-node)
+        )
+        """
+        compiled_bot = BotlangSystem.bot_instance().compile_bot(bot_code)
+
+        def double_site():
+            return [
+                site for site in compiled_bot.inline_cache_report()[
+                    'call_sites'
+                ]
+                if site['code'] == '(double (input-message))'
+            ][0]
+
+        compiled_bot.handle(2)
+        misses = double_site()['misses']
+        BotlangSystem().eval('[define double (fun (x) x)]')
+        self.assertEqual(compiled_bot.handle(3).message, 6)
+        self.assertEqual(double_site()['misses'], misses)
+
+        runtime = BotlangSystem()
+        runtime.eval('[define g (fun (x) (* x 2))]')
+        inner_env = runtime.environment.new_environment()
+        self.assertEqual(BotlangSystem.run('(g 3)', inner_env), 6)
+        runtime.eval('[define g (fun (x) (* x 3))]')
+        self.assertEqual(BotlangSystem.run('(g 3)', inner_env), 9)
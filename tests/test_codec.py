@@ -0,0 +1,97 @@
+import unittest
+from collections import OrderedDict
+
+from botlang.evaluation.codec import BotlangCodec, CodecException
+from botlang.evaluation.values import NativeException, Nil, TerminalNode
+from botlang.examples.example_bots import ExampleBots
+from botlang.interpreter import BotlangSystem
+
+
+class BotlangCodecTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+
+        value = OrderedDict([
+            ('name', 'Juan'),
+            ('age', -37),
+            ('big', 2 ** 80),
+            ('score', 0.25),
+            ('flags', [True, False, None, Nil]),
+            ('point', (1, 2)),
+            ('raw', b'\x00\xff'),
+            ('nested', {'name': 'Pedro', 'empty': OrderedDict()}),
+            ('unicode', u'ñandú'),
+            ('error', NativeException('timeout', 'too slow'))
+        ])
+        decoded = BotlangCodec.decode(BotlangCodec.encode(value))
+
+        self.assertIsInstance(decoded, OrderedDict)
+        self.assertEqual(list(decoded.keys()), list(value.keys()))
+        self.assertIsInstance(decoded['nested']['empty'], OrderedDict)
+        self.assertIs(decoded['flags'][3], Nil)
+        self.assertEqual(decoded['point'], (1, 2))
+        self.assertEqual(decoded['error'].name, 'timeout')
+        self.assertEqual(decoded['error'].description, 'too slow')
+        del decoded['error']
+        del value['error']
+        self.assertEqual(decoded, value)
+
+    def test_bot_results(self):
+
+        system = BotlangSystem.bot_instance()
+        first = system.eval_bot(ExampleBots.bank_bot_code, 'hola')
+        decoded = BotlangCodec.decode(BotlangCodec.encode(first))
+        self.assertEqual(decoded.data, first.data)
+        self.assertEqual(decoded.message, first.message)
+        self.assertEqual(decoded.next_node, first.next_node)
+        self.assertEqual(decoded.bot_state, first.bot_state)
+
+        terminal = BotlangCodec.decode(
+            BotlangCodec.encode(TerminalNode('BOT_ENDED'))
+        )
+        self.assertTrue(terminal.is_terminal())
+        self.assertEqual(terminal.state, 'BOT_ENDED')
+
+    def test_compression(self):
+
+        states = [
+            {'nodes-path': ['MENU', 'EMERGENCIA'], 'turn': turn}
+            for turn in range(200)
+        ]
+        uncompressed = BotlangCodec.encode(states, compression_threshold=None)
+        compressed = BotlangCodec.encode(states)
+        self.assertTrue(len(compressed) < len(uncompressed))
+        self.assertEqual(BotlangCodec.decode(compressed), states)
+        self.assertEqual(BotlangCodec.decode(uncompressed), states)
+
+        small = BotlangCodec.encode({'a': 1})
+        self.assertEqual(bytearray(small)[1], 0)
+
+    def test_errors(self):
+
+        closure = BotlangSystem().eval('(function (x) x)')
+        with self.assertRaises(CodecException):
+            BotlangCodec.encode({'f': closure})
+        with self.assertRaises(CodecException):
+            BotlangCodec.decode(b'{"a": 1}')
+        with self.assertRaises(CodecException):
+            BotlangCodec.decode(BotlangCodec.encode([1, 2]) + b'\x00')
+
+    def test_truncated_and_corrupt_input(self):
+
+        value = {'name': 'Ana', 'scores': [1.5, 2], 'tags': ['a', 'a']}
+        encoded = BotlangCodec.encode(value)
+        for end in range(3, len(encoded)):
+            with self.assertRaises(CodecException):
+                BotlangCodec.decode(encoded[:end])
+
+        string = BotlangCodec.encode('ab')
+        with self.assertRaises(CodecException):
+            BotlangCodec.decode(string[:-2] + b'\xff\xfe')
+
+        compressed = BotlangCodec.encode(
+            ['x' * 100 + str(index) for index in range(20)]
+        )
+        self.assertTrue(bytearray(compressed)[1])
+        with self.assertRaises(CodecException):
+            BotlangCodec.decode(compressed[:2] + b'not zlib')
@@ -0,0 +1,159 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from botlang import BotlangSystem
+from botlang.modules.cache import ModuleCache
+from botlang.modules.resolver import ModuleResolver
+from botlang.runtime_image import RuntimeImage
+
+
+class ConcurrentTurnsTestCase(unittest.TestCase):
+
+    echo_bot_code = """
+    [define shout
+        (function (suffix) (append (uppercase (input-message)) suffix))
+    ]
+    [define echo-node
+        (bot-node (data message)
+            (node-result
+                data
+                (list message (map shout (list "!" "?")))
+                echo-node
+            )
+        )
+    ]
+    echo-node
+    """
+
+    def setUp(self):
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+
+    def test_shared_compiled_bot(self):
+
+        compiled_bot = BotlangSystem.bot_instance().compile_bot(
+            self.echo_bot_code
+        )
+
+        def turn(index):
+            message = 'message {0}'.format(index)
+            result = compiled_bot.handle(message, 'echo-node', {})
+            return result.message == [
+                message,
+                [message.upper() + '!', message.upper() + '?']
+            ]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(turn, range(400)))
+        self.assertTrue(all(results))
+
+    def test_concurrent_module_evaluation(self):
+
+        bot_code = """
+        (require "bot-helpers")
+        (bot-node (data)
+            (node-result
+                data
+                (if (validate-rut (input-message)) "valid" "invalid")
+                end-node
+            )
+        )
+        """
+        module_resolver = ModuleResolver(BotlangSystem.base_environment())
+        module_resolver.load_modules(RuntimeImage.bot_helpers_path())
+        system = BotlangSystem(module_resolver=module_resolver)
+        barrier = threading.Barrier(4)
+
+        def turn(index):
+            barrier.wait()
+            return system.eval_bot_batch([
+                (bot_code, '16926695-6'),
+                (bot_code, '16926695-5')
+            ])
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(turn, range(4)))
+        for batch_results in results:
+            self.assertEqual(
+                [result.message for result in batch_results],
+                ['valid', 'invalid']
+            )
+
+    def test_modules_required_from_two_threads(self):
+
+        helpers_code = """
+        (require "bot-helpers")
+        (validate-rut "16926695-6")
+        """
+        module_code = """
+        (module "mine"
+            (require "bot-helpers")
+            [define valid? (fun (rut) (validate-rut rut))]
+            (provide valid?)
+        )
+        (require "mine")
+        (valid? "16926695-6")
+        """
+        for _ in range(20):
+            parent = ModuleResolver(
+                BotlangSystem.base_environment(),
+                module_cache=ModuleCache()
+            )
+            parent.load_modules(RuntimeImage.bot_helpers_path())
+            results = []
+
+            def run(code):
+                system = BotlangSystem(module_resolver=ModuleResolver(
+                    parent.environment.new_environment(),
+                    parent=parent
+                ))
+                results.append(system.eval(code))
+
+            threads = [
+                threading.Thread(target=run, args=(code,))
+                for code in (helpers_code, module_code)
+            ]
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+                self.assertFalse(thread.is_alive(), 'module evaluation hung')
+            self.assertEqual(results, [True, True])
+
+    def test_modules_evaluated_without_resolver_lock(self):
+
+        modules_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, modules_path)
+        with open(os.path.join(modules_path, 'free.botlang'), 'w') as f:
+            f.write('(module "free" [define free (resolver-free?)] '
+                    '(provide free))')
+        resolver = ModuleResolver(BotlangSystem.base_environment())
+
+        def lock_resolver(acquired):
+            if resolver.lock.acquire(True, 2):
+                resolver.lock.release()
+                acquired.append(True)
+
+        def resolver_free():
+            # Lazy requires of live turns lock the resolver from other
+            # threads
+            acquired = []
+            thread = threading.Thread(target=lock_resolver, args=(acquired,))
+            thread.start()
+            thread.join()
+            return bool(acquired)
+
+        resolver.environment.add_primitives({'resolver-free?': resolver_free})
+        resolver.load_modules(modules_path)
+        resolver.preload()
+        self.assertTrue(resolver.get_module('free').bindings['free'])
+        resolver.reload_module('free')
+        self.assertTrue(resolver.get_module('free').bindings['free'])
@@ -0,0 +1,98 @@
+import pickle
+import unittest
+from collections import OrderedDict
+
+from botlang.evaluation.codec import BotlangCodec
+from botlang.evaluation.values import TrackedDict
+from botlang.interpreter import BotlangSystem
+
+
+class DataDeltaTestCase(unittest.TestCase):
+
+    bot_code = """
+    [define counter-node
+        (bot-node (data message)
+            (put! data "turns" (+ 1 (get data "turns")))
+            (remove! data "pending")
+            (put! (get data "profile") "last-message" message)
+            (node-result
+                (put data "last-node" "counter-node")
+                message
+                counter-node
+            )
+        )
+    ]
+    counter-node
+    """
+
+    def test_delta(self):
+
+        data = OrderedDict([
+            ('turns', 1),
+            ('pending', 'confirmation'),
+            ('profile', {'name': 'Ana'}),
+            ('history', ['hola'] * 100)
+        ])
+        compiled_bot = BotlangSystem.bot_instance().compile_bot(self.bot_code)
+        result = compiled_bot.handle('chao', 'counter-node', data)
+
+        delta = result.data_delta
+        self.assertEqual(
+            delta.set_items,
+            OrderedDict([
+                ('turns', 2),
+                ('profile', {'name': 'Ana', 'last-message': 'chao'}),
+                ('last-node', 'counter-node')
+            ])
+        )
+        self.assertEqual(delta.removed_keys, ['pending'])
+        self.assertEqual(delta.apply(OrderedDict(data)), result.data)
+        self.assertEqual(data['turns'], 1)
+
+        decoded = BotlangCodec.decode(BotlangCodec.encode(result.data))
+        self.assertEqual(decoded, result.data)
+        self.assertEqual(len(result.data_delta.set_items), 3)
+
+    def test_pickled_result(self):
+
+        compiled_bot = BotlangSystem.bot_instance().compile_bot(self.bot_code)
+        result = compiled_bot.handle(
+            'chao',
+            'counter-node',
+            OrderedDict([('turns', 1), ('profile', {})])
+        )
+        restored = pickle.loads(pickle.dumps(result))
+        self.assertIsNone(restored.tracked_data)
+        self.assertEqual(restored.data, result.data)
+        self.assertEqual(
+            restored.data_delta.set_items,
+            result.data_delta.set_items
+        )
+        self.assertIsNotNone(result.tracked_data)
+
+    def test_untracked_data(self):
+
+        result = BotlangSystem.bot_instance().eval_bot(
+            '(bot-node (data) (node-result (make-dict (list)) "" end-node))',
+            'hi',
+            data={'key': 'value'}
+        )
+        self.assertIsNone(result.data_delta)
+
+    def test_tracked_dict(self):
+
+        tracked = TrackedDict.track({'a': 1, 'b': [1], 'c': 3})
+        self.assertTrue(tracked.delta().is_empty())
+        self.assertEqual(tracked.pop('c'), 3)
+        self.assertEqual(tracked.pop('missing', None), None)
+        tracked.setdefault('d', 4)
+        self.assertEqual(tracked.delta().removed_keys, ['c'])
+        self.assertEqual(list(tracked.delta().set_items.keys()), ['d'])
+
+        list(tracked.values())
+        self.assertEqual(list(tracked.delta().set_items.keys()), ['b', 'd'])
+        tracked.clear()
+        self.assertEqual(
+            sorted(tracked.delta().removed_keys),
+            ['a', 'b', 'c', 'd']
+        )
@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from botlang.evaluation.geo import GeoIndex, haversine_km
+from botlang.evaluation.values import Nil
+from botlang.interpreter import BotlangSystem
+
+
+class GeoIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        points = random.Random(0)
+        self.records = [
+            ['point-{0}'.format(index),
+             points.uniform(-56, -17), points.uniform(-76, -66)]
+            for index in range(500)
+        ]
+        # Same place as the first record: ties go to the first one
+        self.records.append(['copy', self.records[0][1], self.records[0][2]])
+        self.index = GeoIndex(self.records)
+        self.queries = [
+            (points.uniform(-60, -15), points.uniform(-80, -60))
+            for _ in range(50)
+        ] + [(self.records[0][1], self.records[0][2]), (10.0, 100.0)]
+
+    def by_distance(self, latitude, longitude):
+
+        return sorted(
+            self.records,
+            key=lambda record: haversine_km(
+                latitude, longitude, record[1], record[2]
+            )
+        )
+
+    def test_same_results_as_brute_force(self):
+
+        for latitude, longitude in self.queries:
+            expected = self.by_distance(latitude, longitude)
+            self.assertEqual(
+                self.index.nearest(latitude, longitude),
+                expected[0]
+            )
+            self.assertEqual(
+                self.index.k_nearest(latitude, longitude, 5),
+                expected[:5]
+            )
+            self.assertEqual(
+                self.index.within_radius(latitude, longitude, 300),
+                [
+                    record for record in expected
+                    if haversine_km(latitude, longitude, record[1],
+                                    record[2]) <= 300
+                ]
+            )
+
+    def test_edge_cases(self):
+
+        empty = GeoIndex([])
+        self.assertIs(empty.nearest(0, 0), Nil)
+        self.assertEqual(empty.within_radius(0, 0, 10), [])
+        self.assertEqual(self.index.k_nearest(0, 0, 0), [])
+        self.assertEqual(len(self.index.k_nearest(0, 0, 1000)), 501)
+        with self.assertRaises(ValueError):
+            self.index.within_radius(0, 0, -5)
+
+        places = GeoIndex(
+            [{'name': 'a', 'lat': 0, 'lon': 179.9},
+             {'name': 'b', 'lat': 0, 'lon': 170}],
+            'lat',
+            'lon'
+        )
+        self.assertEqual(places.nearest(0, -179.9)['name'], 'a')
+        self.assertAlmostEqual(
+            haversine_km(0, 179.9, 0, -179.9),
+            22.24,
+            places=2
+        )
+
+    def test_botlang_primitives(self):
+
+        result = BotlangSystem.run("""
+        [define places (list
+            '("Santiago" -33.45 -70.66)
+            '("Valparaíso" -33.05 -71.62)
+            '("Concepción" -36.82 -73.05)
+        )]
+        [define index (geo-index places)]
+        (list
+            (head (geo-nearest index -33.5 -70.7))
+            (map head (geo-k-nearest index -33.0 -71.5 2))
+            (map head (geo-within-radius index -33.45 -70.66 150))
+            (geo-index? index)
+            (round (geo-distance -33.45 -70.66 -36.82 -73.05))
+        )
+        """)
+        self.assertEqual(
+            result,
+            ['Santiago', ['Valparaíso', 'Santiago'],
+             ['Santiago', 'Valparaíso'], True, 433]
+        )
@@ -0,0 +1,75 @@
+import pickle
+import unittest
+from collections import OrderedDict
+
+from botlang.evaluation.hash_set import HashSet
+from botlang.interpreter import BotlangSystem
+
+
+class HashSetTestCase(unittest.TestCase):
+
+    def test_set_operations(self):
+
+        numbers = HashSet.from_iterable([3, 1, 2, 1])
+        self.assertEqual(numbers.to_list(), [3, 1, 2])
+        self.assertEqual(numbers.union([5, 1, 5]).to_list(), [3, 1, 2, 5])
+        self.assertEqual(numbers.intersection([2, 3, 9]).to_list(), [3, 2])
+        self.assertEqual(numbers.difference([1]).to_list(), [3, 2])
+        self.assertEqual((numbers | HashSet([4])).to_list(), [3, 1, 2, 4])
+        self.assertEqual(numbers.add(4).remove(3).to_list(), [1, 2, 4])
+        self.assertIs(numbers.add(1), numbers)
+        self.assertIs(numbers.union([1, 2]), numbers)
+        self.assertEqual(numbers, {1, 2, 3})
+        self.assertEqual(numbers, HashSet.from_iterable([1, 2, 3]))
+        self.assertIn(2, numbers)
+        self.assertNotIn([2], numbers)
+        self.assertEqual(pickle.loads(pickle.dumps(numbers)), numbers)
+
+    def test_botlang_sets(self):
+
+        result = BotlangSystem.run("""
+        [define keywords (make-set '("saldo" "cuenta" "tarjeta" "saldo"))]
+        (list
+            (set-member? keywords "cuenta")
+            (member? keywords "hola")
+            (set-union keywords '("hola"))
+            (set-intersection '("hola" "saldo") keywords)
+            (set-difference keywords (make-set '("cuenta")))
+            (set->list (set-remove (set-add keywords "clave") "saldo"))
+            (length keywords)
+            (set? keywords)
+        )
+        """)
+        self.assertEqual(
+            result,
+            [True, False, ['saldo', 'cuenta', 'tarjeta', 'hola'], ['saldo'],
+             ['saldo', 'tarjeta'], ['cuenta', 'tarjeta', 'clave'], 3, True]
+        )
+
+    def test_index_and_group_by(self):
+
+        result = BotlangSystem.run("""
+        [define accounts (list
+            '(10 "ana" "corriente")
+            '(11 "bob" "vista")
+            '(12 "eva" "corriente")
+            '(10 "old" "vista")
+        )]
+        [define by-id (index-by head accounts)]
+        (list
+            (get by-id 10)
+            (keys by-id)
+            (group-by (fun (account) (get account 2)) accounts)
+        )
+        """)
+        self.assertEqual(result[0], [10, 'ana', 'corriente'])
+        self.assertEqual(result[1], [10, 11, 12])
+        self.assertEqual(
+            result[2],
+            OrderedDict([
+                ('corriente', [[10, 'ana', 'corriente'],
+                               [12, 'eva', 'corriente']]),
+                ('vista', [[11, 'bob', 'vista'], [10, 'old', 'vista']])
+            ])
+        )
+        self.assertEqual(list(result[2]), ['corriente', 'vista'])
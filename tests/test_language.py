@@ -238,6 +238,45 @@ class BotlangTestCase(unittest.TestCase):
             '((fun (x y) (+ (* x x) (* y y))) 3 4)'
         ), 25)
 
+    def test_function_names(self):
+
+        runtime = BotlangSystem()
+        runtime.eval('[define square (fun (x) (* x x))]')
+        square = runtime.environment.lookup('square')
+        local_environment = runtime.environment.new_local_environment()
+        self.assertIsNone(local_environment.function_names)
+        self.assertEqual(
+            local_environment.get_function_name(square),
+            'square'
+        )
+        runtime.eval('[define cube (fun (x) (* x x x))]')
+        self.assertEqual(
+            runtime.environment.get_function_name(
+                runtime.environment.lookup('cube')
+            ),
+            'cube'
+        )
+
+    def test_application_arities(self):
+
+        runtime = BotlangSystem()
+        runtime.environment.add_primitives({
+            'args': lambda *args: list(args)
+        })
+        self.assertEqual(runtime.eval('(args)'), [])
+        self.assertEqual(runtime.eval('(args 1 2 3 4 5)'), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            runtime.eval('((fun () 1))'),
+            1
+        )
+        self.assertEqual(
+            runtime.eval('((fun (a b c d) (list a b c d)) 1 2 3 4)'),
+            [1, 2, 3, 4]
+        )
+        with self.assertRaises(BotlangErrorException) as e:
+            runtime.eval('((fun (a b) a) 1)')
+        self.assertTrue('expects 2 arguments, 1 given' in str(e.exception))
+
     def test_environment(self):
 
         runtime = BotlangSystem()
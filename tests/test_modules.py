@@ -1,7 +1,13 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 from botlang import Evaluator
 from botlang.interpreter import BotlangSystem
+from botlang.extensions.storage import StorageApi
+from botlang.modules.cache import ModuleCache
+from botlang.modules.dependencies import CyclicModuleDependencyException
 from botlang.modules.module import ExternalModule
 from botlang.modules.resolver import ModuleResolver
 
@@ -80,3 +86,322 @@ class ModulesTestCase(unittest.TestCase):
             module_resolver=resolver
         )
         self.assertEqual(meow, 'mew')
+
+    def make_modules_dir(self, modules):
+
+        modules_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, modules_path)
+        for name, code in modules.items():
+            file_name = os.path.join(modules_path, name + '.botlang')
+            with open(file_name, 'w') as module_file:
+                module_file.write(code)
+        return modules_path
+
+    def test_lazy_module_loading(self):
+
+        modules_path = self.make_modules_dir({
+            'greet': """
+            ; Greetings
+            (module "greet"
+                [define greet (fun (name) (append "hi " name))]
+                (provide greet)
+            )
+            """,
+            'broken': '(module "broken" [define x (fun (y) y)'
+        })
+
+        resolver = ModuleResolver(BotlangSystem.base_environment())
+        resolver.load_modules(modules_path)
+        self.assertEqual(resolver.modules, {})
+        self.assertEqual(resolver.module_names(), {'greet', 'broken'})
+
+        greeting = BotlangSystem.run(
+            '(require "greet") (greet "bob")',
+            module_resolver=resolver
+        )
+        self.assertEqual(greeting, 'hi bob')
+
+        statistics = resolver.load_statistics()
+        self.assertTrue(statistics['greet']['loaded'])
+        self.assertTrue(statistics['greet']['load_time'] >= 0)
+        self.assertTrue(statistics['greet']['evaluation_time'] >= 0)
+        self.assertFalse(statistics['broken']['loaded'])
+        self.assertIsNone(statistics['broken']['load_time'])
+        self.assertTrue(
+            statistics['broken']['path'].endswith('broken.botlang')
+        )
+
+    def test_several_modules_in_one_file(self):
+
+        modules_path = self.make_modules_dir({
+            'shapes': """
+            ; Two modules: "(module \"fake\")" in a string is not one
+            (module "squares"
+                [define square (fun (x) (* x x))]
+                (provide square)
+            )
+            [module "cubes"
+                (require "squares")
+                [define cube (fun (x) (* x (square x)))]
+                (provide cube)
+            ]
+            """,
+            'script': """
+            (module "scripted" [define one (fun () 1)] (provide one))
+            (define loaded #t)
+            """
+        })
+
+        resolver = ModuleResolver(BotlangSystem.base_environment())
+        resolver.load_modules(modules_path)
+        self.assertEqual(set(resolver.modules), {'scripted'})
+        self.assertEqual(
+            resolver.module_names(),
+            {'squares', 'cubes', 'scripted'}
+        )
+        self.assertEqual(
+            BotlangSystem.run(
+                '(require "cubes") (require "squares") '
+                '(+ (cube 2) (square 3))',
+                module_resolver=resolver
+            ),
+            17
+        )
+
+    def test_preload_in_dependency_order(self):
+
+        modules_path = self.make_modules_dir({
+            'a': """
+            (module "a"
+                (require "b")
+                [define a (fun () (append "a" (b)))]
+                (provide a)
+            )
+            """,
+            'b': """
+            (module "b"
+                (require "c")
+                [define b (fun () (append "b" (c)))]
+                (provide b)
+            )
+            """,
+            'c': """
+            (module "c"
+                [define c (fun () "c")]
+                (provide c)
+            )
+            """
+        })
+        resolver = ModuleResolver(BotlangSystem.base_environment())
+        resolver.load_modules(modules_path)
+        resolver.preload()
+
+        statistics = resolver.load_statistics()
+        self.assertTrue(all(stats['loaded'] for stats in statistics.values()))
+        self.assertTrue(all(
+            module.evaluated for module in resolver.modules.values()
+        ))
+        result = BotlangSystem.run(
+            '(require "a") (a)',
+            module_resolver=resolver
+        )
+        self.assertEqual(result, 'abc')
+
+    def test_cyclic_module_dependencies(self):
+
+        modules = {
+            'ping': """
+            (module "ping"
+                (require "pong")
+                [define ping (fun () "ping")]
+                (provide ping)
+            )
+            """,
+            'pong': """
+            (module "pong"
+                (require "ping")
+                [define pong (fun () "pong")]
+                (provide pong)
+            )
+            """
+        }
+        resolver = ModuleResolver(BotlangSystem.base_environment())
+        resolver.load_modules(self.make_modules_dir(modules))
+        with self.assertRaises(CyclicModuleDependencyException) as context:
+            resolver.preload()
+        self.assertEqual(context.exception.cycle, ['ping', 'pong', 'ping'])
+        self.assertFalse(any(
+            module.evaluated for module in resolver.modules.values()
+        ))
+
+        resolver = ModuleResolver(BotlangSystem.base_environment())
+        resolver.load_modules(self.make_modules_dir(modules))
+        with self.assertRaises(Exception) as context:
+            BotlangSystem.run('(require "ping")', module_resolver=resolver)
+        self.assertIn('Cyclic module dependency', str(context.exception))
+
+    def test_module_cache(self):
+
+        module_code = """
+        (module "%s"
+            [define version (fun () %d)]
+            (provide version)
+        )
+        """
+        module_cache = ModuleCache()
+
+        def module_resolver(version):
+            resolver = ModuleResolver(
+                BotlangSystem.base_environment(),
+                module_cache=module_cache
+            )
+            BotlangSystem.run(
+                module_code % ('versioned', version),
+                module_resolver=resolver
+            )
+            return resolver
+
+        resolvers = [module_resolver(1), module_resolver(1)]
+        results = [
+            BotlangSystem.run(
+                '(require "versioned") (version)',
+                module_resolver=resolver
+            )
+            for resolver in resolvers
+        ]
+        self.assertEqual(results, [1, 1])
+        self.assertEqual(module_cache.misses, 1)
+        self.assertEqual(module_cache.hits, 1)
+
+        bindings = [
+            resolver.get_bindings(
+                Evaluator(module_resolver=resolver),
+                'versioned'
+            )
+            for resolver in resolvers
+        ]
+        self.assertIs(bindings[0], bindings[1])
+        with self.assertRaises(TypeError):
+            bindings[0]['version'] = None
+
+        changed_version = BotlangSystem.run(
+            '(require "versioned") (version)',
+            module_resolver=module_resolver(2)
+        )
+        self.assertEqual(changed_version, 2)
+        self.assertEqual(module_cache.misses, 2)
+
+    def test_cached_module_sees_extension_primitives(self):
+
+        class DictCache(StorageApi):
+
+            def __init__(self):
+                self.backend = {'k': 'v'}
+
+            def put(self, key, value, expiration=None):
+                self.backend[key] = value
+
+            def get(self, key):
+                return self.backend.get(key)
+
+            def remove(self, key):
+                del self.backend[key]
+
+        module_code = """
+        (module "cached-value"
+            [define cached (fun () (cache-get "k"))]
+            (provide cached)
+        )
+        """
+        module_cache = ModuleCache()
+        resolver = BotlangSystem.bot_modules_resolver(
+            BotlangSystem.base_environment()
+        )
+        resolver.module_cache = module_cache
+        system = BotlangSystem(module_resolver=resolver)
+        system.setup_cache_extension(DictCache())
+        system.eval(module_code)
+        self.assertEqual(
+            system.eval('(require "cached-value") (cached)'),
+            'v'
+        )
+        self.assertEqual(module_cache.misses, 0)
+        # Modules that do not use the extension are still shared
+        self.assertEqual(
+            system.eval('(require "bot-helpers") (validate-rut "1-9")'),
+            True
+        )
+        self.assertGreater(module_cache.misses, 0)
+
+        plain_resolver = ModuleResolver(
+            BotlangSystem.base_environment(),
+            module_cache=module_cache
+        )
+        BotlangSystem.run(module_code, module_resolver=plain_resolver)
+        with self.assertRaises(Exception) as context:
+            BotlangSystem.run(
+                '(require "cached-value") (cached)',
+                module_resolver=plain_resolver
+            )
+        self.assertIn('cache-get', str(context.exception))
+
+    def test_external_module_bindings_are_shared(self):
+
+        external_module = ExternalModule('cool-module', {'moo': lambda: 1})
+        evaluator = Evaluator(
+            module_resolver=ModuleResolver(BotlangSystem.base_environment())
+        )
+        bindings = external_module.get_bindings(evaluator)
+        self.assertIs(external_module.get_bindings(evaluator), bindings)
+        with self.assertRaises(TypeError):
+            bindings['moo'] = None
+
+    def test_module_reload(self):
+
+        module_code = """
+        (module "%s"
+            %s
+            [define %s (fun () %s)]
+            (provide %s)
+        )
+        """
+        modules_path = self.make_modules_dir({
+            'a': module_code % ('a', '(require "b")', 'a', '(b)', 'a'),
+            'b': module_code % ('b', '', 'b', '1', 'b'),
+            'c': module_code % ('c', '', 'c', '"c"', 'c')
+        })
+        resolver = ModuleResolver(
+            BotlangSystem.base_environment(),
+            module_cache=ModuleCache()
+        )
+        resolver.load_modules(modules_path)
+        system = BotlangSystem(module_resolver=resolver)
+
+        a_bot = system.compiled_bots.get('a-bot', '(require "a") (a)')
+        c_bot = system.compiled_bots.get('c-bot', '(require "c") (c)')
+        self.assertEqual(a_bot.result, 1)
+        self.assertEqual(set(a_bot.modules), {'a', 'b'})
+        old_c_module = resolver.get_module('c')
+
+        with open(os.path.join(modules_path, 'b.botlang'), 'w') as f:
+            f.write(module_code % ('b', '', 'b', '2', 'b'))
+        self.assertEqual(resolver.dependent_modules('b'), {'a'})
+        self.assertEqual(system.reload_module('b'), {'a-bot'})
+
+        self.assertIs(resolver.get_module('c'), old_c_module)
+        self.assertTrue(resolver.get_module('a').evaluated)
+        self.assertIs(
+            system.compiled_bots.get('c-bot', '(require "c") (c)'),
+            c_bot
+        )
+        new_a_bot = system.compiled_bots.get('a-bot', '(require "a") (a)')
+        self.assertEqual(new_a_bot.result, 2)
+        self.assertEqual(a_bot.result, 1)
+        self.assertFalse(a_bot.is_current())
+        self.assertTrue(c_bot.is_current())
+
+        with open(os.path.join(modules_path, 'b.botlang'), 'w') as f:
+            f.write('(module "b" [define b (fun () 3)')
+        with self.assertRaises(Exception):
+            system.reload_module('b')
+        self.assertTrue(new_a_bot.is_current())
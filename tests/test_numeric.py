@@ -0,0 +1,139 @@
+import math
+import pickle
+import unittest
+
+from botlang.evaluation.codec import BotlangCodec
+from botlang.evaluation.numeric import ArrayBackend, NumericArray, \
+    NumpyBackend, numpy
+from botlang.evaluation.values import Nil
+from botlang.exceptions.exceptions import BotlangErrorException
+from botlang.interpreter import BotlangSystem
+
+
+class NumericArrayTestCase(unittest.TestCase):
+
+    code = """
+    [define xs (array (list 1 4 9 -16))]
+    [define positive (array> xs 0)]
+    (list
+        (array-sqrt (array-abs xs))
+        (+ xs 1)
+        (- 10 xs)
+        (* xs (array (list 1 0 1 0)))
+        (/ xs 2)
+        positive
+        (array-select xs positive)
+        (array-count (array-and positive (array< xs 5)))
+        (array-not positive)
+        (array-sum xs)
+        (array-min xs)
+        (array-argmin xs)
+        (array-argmax xs)
+        (get xs 1)
+        (length xs)
+        (array-argmin (array (list)))
+        (array-sin (array (list 0)))
+        (array-atan2 (array (list 1)) 1)
+    )
+    """
+
+    def backends(self):
+        return [ArrayBackend] + ([NumpyBackend] if numpy is not None else [])
+
+    def test_array_primitives(self):
+
+        default_backend = NumericArray.backend
+        try:
+            for backend in self.backends():
+                NumericArray.backend = backend
+                result = BotlangSystem.run(self.code)
+                self.assertEqual(result[:10], [
+                    [1.0, 2.0, 3.0, 4.0],
+                    [2.0, 5.0, 10.0, -15.0],
+                    [9.0, 6.0, 1.0, 26.0],
+                    [1.0, 0.0, 9.0, -0.0],
+                    [0.5, 2.0, 4.5, -8.0],
+                    [True, True, True, False],
+                    [1.0, 4.0, 9.0],
+                    2,
+                    [False, False, False, True],
+                    -2.0
+                ])
+                self.assertEqual(result[10:15], [-16.0, 3, 2, 4.0, 4])
+                self.assertIs(result[15], Nil)
+                self.assertEqual(result[16], [0.0])
+                self.assertAlmostEqual(result[17][0], 0.7853981633974483)
+                self.assertIs(type(result[0]), list)
+        finally:
+            NumericArray.backend = default_backend
+
+    edge_cases_code = """
+    [define nan (- 1e400 1e400)]
+    [define xs (array (list 1 -1 0))]
+    (list
+        (/ xs 0)
+        (array-sqrt xs)
+        (array-pow (array (list 0 -8 -2 1e300)) (array (list -1 0.5 1025 2)))
+        (array-sin (array (list 1e400)))
+        (array-sum (array (list 1e400 -1e400)))
+        (array-sum (array (list 1e308 1e308)))
+        (array-argmin (array (list 2 nan 1)))
+        (array-max (array (list nan 1)))
+    )
+    """
+
+    def assertSameFloats(self, values, expected):
+
+        self.assertEqual(len(values), len(expected))
+        for value, expected_value in zip(values, expected):
+            if math.isnan(expected_value):
+                self.assertTrue(math.isnan(value), value)
+            else:
+                self.assertEqual(value, expected_value)
+
+    def test_edge_cases(self):
+
+        nan = float('nan')
+        inf = float('inf')
+        default_backend = NumericArray.backend
+        try:
+            for backend in self.backends():
+                NumericArray.backend = backend
+                result = BotlangSystem.run(self.edge_cases_code)
+                self.assertSameFloats(result[0], [inf, -inf, nan])
+                self.assertSameFloats(result[1], [1.0, nan, 0.0])
+                self.assertSameFloats(result[2], [inf, nan, -inf, inf])
+                self.assertSameFloats(result[3], [nan])
+                self.assertSameFloats(result[4:6], [nan, inf])
+                self.assertEqual(result[6], 1)
+                self.assertTrue(math.isnan(result[7]))
+        finally:
+            NumericArray.backend = default_backend
+
+    def test_length_mismatch(self):
+
+        default_backend = NumericArray.backend
+        try:
+            for backend in self.backends():
+                NumericArray.backend = backend
+                for code in [
+                    '(array-select (array (list 1 2 3)) (list #t #f))',
+                    '(+ (array (list 1 2 3)) (array (list 1)))',
+                    '(array< (array (list 1 2)) (list 1 2 3))'
+                ]:
+                    with self.assertRaises(BotlangErrorException) as e:
+                        BotlangSystem.run(code)
+                    self.assertIn('length', str(e.exception))
+        finally:
+            NumericArray.backend = default_backend
+
+    def test_serialization(self):
+
+        values = NumericArray.from_iterable([1.5, 2])
+        mask = NumericArray.from_iterable([True, False], True)
+        self.assertEqual(pickle.loads(pickle.dumps(values)), values)
+        self.assertEqual(pickle.loads(pickle.dumps(mask)), [True, False])
+        self.assertEqual(
+            BotlangCodec.decode(BotlangCodec.encode(values)),
+            [1.5, 2.0]
+        )
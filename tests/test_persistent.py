@@ -0,0 +1,222 @@
+import pickle
+import random
+import unittest
+from collections import OrderedDict
+
+from botlang.evaluation.persistent import PersistentDict, PersistentList, \
+    to_host_value
+from botlang.evaluation.values import TrackedDict
+from botlang.interpreter import BotlangSystem
+
+
+class CollidingKey(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 7
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+    def __repr__(self):
+        return 'CollidingKey({0!r})'.format(self.name)
+
+
+class PersistentDictTestCase(unittest.TestCase):
+
+    def test_same_behaviour_as_ordered_dict(self):
+
+        operations = random.Random(0)
+        keys = ['key-{0}'.format(index) for index in range(300)] + \
+            list(range(-50, 50)) + [CollidingKey(name) for name in 'abcd']
+        persistent_dict = PersistentDict()
+        expected = OrderedDict()
+        for step in range(5000):
+            key = operations.choice(keys)
+            if operations.random() < 0.7:
+                persistent_dict = persistent_dict.put(key, step)
+                expected[key] = step
+            else:
+                persistent_dict = persistent_dict.remove(key)
+                expected.pop(key, None)
+            self.assertEqual(len(persistent_dict), len(expected))
+
+        self.assertEqual(persistent_dict.items(), list(expected.items()))
+        for key in keys:
+            self.assertEqual(key in persistent_dict, key in expected)
+            self.assertEqual(persistent_dict.get(key), expected.get(key))
+
+    def test_structural_sharing(self):
+
+        first = PersistentDict.from_items([('a', 1), ('b', 2)])
+        second = first.put('c', 3).put('a', 10)
+        third = second.remove('b')
+
+        self.assertEqual(first.items(), [('a', 1), ('b', 2)])
+        self.assertEqual(second.items(), [('a', 10), ('b', 2), ('c', 3)])
+        self.assertEqual(third.items(), [('a', 10), ('c', 3)])
+        self.assertIs(third.remove('missing'), third)
+
+        second['d'] = 4
+        del second['a']
+        self.assertEqual(second.keys(), ['b', 'c', 'd'])
+        self.assertEqual(third.keys(), ['a', 'c'])
+        with self.assertRaises(KeyError):
+            del second['a']
+
+    def test_host_values(self):
+
+        persistent_dict = PersistentDict.from_items([
+            ('name', 'Ana'),
+            ('tags', [PersistentDict.from_items([('id', 1)])])
+        ])
+        self.assertEqual(persistent_dict, {'name': 'Ana', 'tags': [{'id': 1}]})
+        self.assertEqual(
+            pickle.loads(pickle.dumps(persistent_dict)),
+            persistent_dict
+        )
+
+        host_value = to_host_value(persistent_dict)
+        self.assertIsInstance(host_value, OrderedDict)
+        self.assertIsInstance(host_value['tags'][0], OrderedDict)
+        plain = {'list': [1, 2]}
+        self.assertIs(to_host_value(plain), plain)
+
+    def test_botlang_dicts(self):
+
+        result = BotlangSystem.run("""
+        [define data (make-dict (list (list "a" 1)))]
+        [define other (put data "b" 2)]
+        (list data other (keys other) (values other) (associations other))
+        """)
+        self.assertEqual(
+            result,
+            [{'a': 1}, {'a': 1, 'b': 2}, ['a', 'b'], [1, 2],
+             [('a', 1), ('b', 2)]]
+        )
+        self.assertIsInstance(result[1], OrderedDict)
+
+    def test_repr_as_host_values(self):
+
+        result = BotlangSystem.run("""
+        (str (put (make-dict (list (list "a" (list 1 2)))) "b" "c"))
+        """)
+        self.assertEqual(result, str(OrderedDict([('a', [1, 2]), ('b', 'c')])))
+        self.assertEqual(
+            repr(TrackedDict.track({'a': 1}).put('b', [2])),
+            repr({'a': 1, 'b': [2]})
+        )
+
+    def test_tracked_dict_put(self):
+
+        base = OrderedDict([('a', 1), ('b', 2)])
+        tracked = TrackedDict.track(base)
+        for index in range(100):
+            tracked = tracked.put('key-{0}'.format(index), index)
+        tracked = tracked.put('a', 0)
+
+        self.assertEqual(len(tracked), 102)
+        self.assertEqual(list(tracked)[:3], ['a', 'b', 'key-0'])
+        self.assertEqual(tracked.to_dict()['a'], 0)
+        self.assertEqual(len(tracked.delta().set_items), 101)
+        self.assertEqual(base, OrderedDict([('a', 1), ('b', 2)]))
+
+
+class PersistentListTestCase(unittest.TestCase):
+
+    def test_cons_head_tail(self):
+
+        numbers = PersistentList.from_iterable([2, 3])
+        first = numbers.cons(1)
+        second = numbers.cons(10)
+        third = first.tail().cons(20)
+
+        self.assertEqual(numbers, [2, 3])
+        self.assertEqual(first, [1, 2, 3])
+        self.assertEqual(second, [10, 2, 3])
+        self.assertEqual(third, [20, 2, 3])
+        self.assertIs(first.tail().items, numbers.items)
+        self.assertEqual(first.head(), 1)
+        self.assertEqual([first[0], first[2], first[-1]], [1, 3, 3])
+        self.assertEqual(first[1:], [2, 3])
+        self.assertEqual(first[::-1], [3, 2, 1])
+        self.assertEqual(PersistentList().tail(), [])
+        with self.assertRaises(IndexError):
+            first[3]
+
+    def test_list_operations(self):
+
+        numbers = PersistentList.from_iterable([1, 2])
+        self.assertEqual(numbers + [3], [1, 2, 3])
+        self.assertEqual([0] + numbers, [0, 1, 2])
+        self.assertIsInstance([0] + numbers, PersistentList)
+        self.assertIn(2, numbers)
+        self.assertEqual(
+            pickle.loads(pickle.dumps(numbers.cons(0))),
+            [0, 1, 2]
+        )
+        host_value = to_host_value(
+            PersistentList.from_iterable([numbers, {'a': numbers}])
+        )
+        self.assertIs(type(host_value), list)
+        self.assertIs(type(host_value[0]), list)
+        self.assertIs(type(host_value[1]['a']), list)
+
+    def test_botlang_lists(self):
+
+        result = BotlangSystem.run("""
+        [define my-map
+            (fun (f lst)
+                (if (equal? (length lst) 0)
+                    (list)
+                    (cons (f (head lst)) (my-map f (tail lst)))
+                )
+            )
+        ]
+        [define numbers (list 1 2 3)]
+        (list
+            (my-map (fun (x) (* x x)) numbers)
+            (my-map (fun (x) x) '(4 5))
+            (tail '(6 7))
+            (list? (tail numbers))
+            (equal? (cons 0 numbers) '(0 1 2 3))
+            (extend numbers 4)
+            (append numbers '(5))
+            (get numbers 1)
+        )
+        """)
+        self.assertEqual(
+            result,
+            [[1, 4, 9], [4, 5], [7], True, True, [1, 2, 3, 4], [1, 2, 3, 5],
+             2]
+        )
+        self.assertIs(type(result[0]), list)
+
+    def test_ordering(self):
+
+        numbers = PersistentList.from_iterable([1, 2])
+        self.assertLess(numbers, PersistentList.from_iterable([1, 3]))
+        self.assertLess(numbers, [1, 2, 0])
+        self.assertGreater([1, 3], numbers)
+        self.assertLessEqual(numbers, (1, 2))
+        self.assertGreaterEqual(numbers, [1])
+
+        result = BotlangSystem.run("""
+        [define pairs (list (list 3 "a") (list 1 "b") (list 1 "a"))]
+        (list
+            (< (list 1 2) (list 1 3))
+            (max pairs)
+            (min pairs)
+            (sort pairs)
+            (sort (fun (a b) (> a b)) pairs)
+        )
+        """)
+        self.assertEqual(result, [
+            True,
+            [3, 'a'],
+            [1, 'a'],
+            [[1, 'a'], [1, 'b'], [3, 'a']],
+            [[3, 'a'], [1, 'b'], [1, 'a']]
+        ])
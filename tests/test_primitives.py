@@ -2,6 +2,7 @@ import unittest
 
 import math
 
+from botlang import BotlangErrorException
 from botlang.environment.primitives.strings import divide_text
 from botlang.interpreter import BotlangSystem
 
@@ -57,6 +58,54 @@ class BotlangTestCase(unittest.TestCase):
             [["shao", 4], ["holi", 1], ["bla", -3], ["lala", -8]]
         )
 
+        native_sorts = BotlangSystem.run("""
+            (list
+                (sort (list 5 3 0 4))
+                (sort (list "b" "c" "a"))
+                (sort > (list 5 3 0 4))
+                (sort <= (list 2 1 2))
+            )
+        """)
+        self.assertEqual(
+            native_sorts,
+            [[0, 3, 4, 5], ["a", "b", "c"], [5, 4, 3, 0], [1, 2, 2]]
+        )
+
+    def test_sort_by(self):
+
+        sorted_lists = BotlangSystem.run("""
+            [define objs-list
+                (list
+                    (list "holi" 1)
+                    (list "shao" 4)
+                    (list "bla" 1)
+                    (list "lala" -8)
+                )
+            ]
+            [define value (function (obj) (get obj 1))]
+            (list
+                (sort-by value objs-list)
+                (sort-by value objs-list #t)
+                (sort-by (list value head) objs-list (list #t #f))
+                (sort-by (function (obj) (list (get obj 1) (head obj)))
+                         objs-list)
+                (sort-by head (list))
+            )
+        """)
+        self.assertEqual(sorted_lists, [
+            [["lala", -8], ["holi", 1], ["bla", 1], ["shao", 4]],
+            [["shao", 4], ["holi", 1], ["bla", 1], ["lala", -8]],
+            [["shao", 4], ["bla", 1], ["holi", 1], ["lala", -8]],
+            [["lala", -8], ["bla", 1], ["holi", 1], ["shao", 4]],
+            []
+        ])
+
+        with self.assertRaises(BotlangErrorException) as context:
+            BotlangSystem.run(
+                '(sort-by (list head last) (list (list 1 2)) (list #t))'
+            )
+        self.assertIn('1 sort orders for 2 keys', str(context.exception))
+
     def test_type_conversion(self):
 
         str_to_num = BotlangSystem.run('(num "666")')
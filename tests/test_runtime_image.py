@@ -0,0 +1,50 @@
+import unittest
+
+from botlang import BotlangSystem, BotlangErrorException
+from botlang.environment.environment import FrozenEnvironmentException
+from botlang.runtime_image import RuntimeImage
+
+
+class RuntimeImageTestCase(unittest.TestCase):
+
+    def test_shared_image(self):
+
+        image = RuntimeImage.get()
+        first = BotlangSystem.bot_instance()
+        second = BotlangSystem.bot_instance()
+
+        self.assertIs(first.environment.previous, image.environment)
+        self.assertIs(second.environment.previous, image.environment)
+        self.assertIs(first.module_resolver.parent, image.module_resolver)
+
+        with self.assertRaises(FrozenEnvironmentException):
+            image.environment.update({'x': 1})
+
+    def test_overlay_isolation(self):
+
+        first = BotlangSystem.bot_instance()
+        second = BotlangSystem.bot_instance()
+
+        first.eval('[define max (fun (l) "overridden")]')
+        first.environment.add_primitives({'only-first': lambda: 1})
+
+        self.assertEqual(first.eval('(max (list 1 2))'), 'overridden')
+        self.assertEqual(second.eval('(max (list 1 2))'), 2)
+        self.assertEqual(first.eval('(only-first)'), 1)
+        with self.assertRaises(BotlangErrorException):
+            second.eval('(only-first)')
+
+    def test_shared_modules(self):
+
+        first = BotlangSystem.bot_instance()
+        second = BotlangSystem.bot_instance()
+
+        self.assertTrue(
+            first.eval('(require "bot-helpers") (validate-rut "16926695-6")')
+        )
+        self.assertFalse(
+            second.eval('(require "bot-helpers") (validate-rut "7015383-0")')
+        )
+        with self.assertRaises(BotlangErrorException) as cm:
+            first.eval('(from-facebook? (make-dict (list)))')
+        self.assertTrue('is not defined' in str(cm.exception))
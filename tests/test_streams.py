@@ -0,0 +1,53 @@
+import unittest
+
+from botlang.evaluation.stream import Stream, MAP, FILTER, TAKE
+from botlang.evaluation.values import Nil
+from botlang.interpreter import BotlangSystem
+
+
+class StreamsTestCase(unittest.TestCase):
+
+    def test_fused_stages(self):
+
+        calls = []
+
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        stream = Stream([1, 2, 3, 4, 5]).with_stage(MAP, double)
+        chained = Stream(stream).with_stage(FILTER, lambda x: x > 2)\
+            .with_stage(TAKE, 2)
+
+        self.assertIs(chained.source, stream.source)
+        self.assertEqual(len(chained.stages), 3)
+        self.assertEqual(calls, [])
+        self.assertEqual(chained.to_list(), [4, 6])
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(list(chained), [4, 6])
+
+    def test_stream_primitives(self):
+
+        result = BotlangSystem.run("""
+        [define numbers (list 5 3 8 1 9 2)]
+        [define evens (stream-filter (fun (x) (equal? (mod x 2) 0)) numbers)]
+        (list
+            (stream->list (stream-map (fun (x) (* x 10)) evens))
+            (min (stream-map (fun (x) (- x 1)) numbers))
+            (stream->list (take 2 (drop 1 numbers)))
+            (stream->list (take 0 numbers))
+            (stream->list (stream-enumerate (take 2 numbers)))
+            (first-where (fun (x) (> x 6)) (stream-map (fun (x) x) numbers))
+            (fold 0 + (take 3 numbers))
+            (min-by (fun (x) (* x x)) (list -3 2 -2))
+            (max-by (fun (x) (get x 1)) (list (list "a" 1) (list "b" 2)))
+            (take 2 numbers)
+        )
+        """)
+        self.assertEqual(
+            result,
+            [[80, 20], 0, [3, 8], [], [(0, 5), (1, 3)], 8, 16, 2, ['b', 2],
+             [5, 3]]
+        )
+        self.assertIs(BotlangSystem.run('(first-where nil? (list 1))'), Nil)
+        self.assertIs(BotlangSystem.run('(min-by abs (list))'), Nil)
@@ -0,0 +1,115 @@
+import pickle
+import random
+import unittest
+
+from botlang.evaluation.table import Table, NUMBER, STRING, ANY
+from botlang.evaluation.values import Nil
+from botlang.interpreter import BotlangSystem
+
+
+class TableTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        values = random.Random(0)
+        self.records = [
+            ['sku-{0}'.format(index),
+             values.choice(['food', 'toys', 'books']),
+             values.randint(1, 50)]
+            for index in range(300)
+        ]
+        self.table = Table.from_records(
+            ['sku', 'category', 'price'],
+            self.records
+        )
+
+    def test_same_results_as_list_operations(self):
+
+        table = self.table
+        records = self.records
+        self.assertEqual(
+            table.lookup('category', 'toys'),
+            Table.from_records(
+                table.columns,
+                [record for record in records if record[1] == 'toys']
+            )
+        )
+        self.assertEqual(table.find('sku', 'sku-7'), records[7])
+        self.assertIs(table.find('sku', 'sku-1000'), Nil)
+        self.assertEqual(
+            table.range('price', 10, 20).to_list(),
+            [record for record in records if 10 <= record[2] <= 20]
+        )
+        self.assertEqual(
+            table.range('price', Nil, 3).to_list(),
+            [record for record in records if record[2] <= 3]
+        )
+        self.assertEqual(
+            table.sort('price').to_list(),
+            sorted(records, key=lambda record: record[2])
+        )
+        self.assertEqual(
+            table.sort('price', True).to_list(),
+            sorted(records, key=lambda record: record[2], reverse=True)
+        )
+        self.assertEqual(
+            table.select(['price', 'sku']).to_list(),
+            [[record[2], record[0]] for record in records]
+        )
+
+    def test_columns(self):
+
+        table = Table.from_records(
+            ['name', 'value'],
+            [{'name': 'a', 'value': 1}, {'name': 'b', 'value': 'x'}]
+        )
+        self.assertEqual(table.column_type('name'), STRING)
+        self.assertEqual(table.column_type('value'), ANY)
+        self.assertEqual(self.table.column_type('price'), NUMBER)
+        self.assertEqual(table[-1], ['b', 'x'])
+        self.assertEqual(pickle.loads(pickle.dumps(table)), table)
+        with self.assertRaises(ValueError):
+            table.sort('value')
+        with self.assertRaises(ValueError):
+            table.column('missing')
+        with self.assertRaises(ValueError):
+            Table.from_records(['a', 'b'], [[1, 2], [3]])
+        with self.assertRaises(IndexError):
+            table[2]
+
+    def test_botlang_primitives(self):
+
+        result = BotlangSystem.run("""
+        [define branches (make-table
+            (list "name" "city" "open")
+            '(("Centro" "Santiago" 9) ("Costanera" "Santiago" 10)
+              ("Plaza" "Concepción" 8))
+        )]
+        (list
+            (table-find branches "city" "Concepción")
+            (map head (table-lookup branches "city" "Santiago"))
+            (table-rows (table-select (table-range branches "open" 9 nil)
+                                      "name"))
+            (table-column (table-sort branches "open" #t) "name")
+            (table-columns branches)
+            (table-type branches "open")
+            (length branches)
+            (table? branches)
+        )
+        """)
+        self.assertEqual(
+            result,
+            [['Plaza', 'Concepción', 8], ['Centro', 'Costanera'],
+             [['Centro'], ['Costanera']], ['Costanera', 'Centro', 'Plaza'],
+             ['name', 'city', 'open'], 'number', 3, True]
+        )
+
+    def test_botlang_dict_records(self):
+
+        rows = BotlangSystem.run("""
+        (make-table
+            (list "a" "b")
+            (list (make-dict (list (list "a" 1) (list "b" 2)))
+                  (make-dict (list (list "b" 4) (list "a" 3)))))
+        """)
+        self.assertEqual(rows, [[1, 2], [3, 4]])
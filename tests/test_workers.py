@@ -0,0 +1,157 @@
+import gc
+import os
+import unittest
+
+from botlang.examples.example_bots import ExampleBots
+from botlang.interpreter import BotlangSystem
+from botlang.workers.pool import BotlangPool, RemoteTurnException
+from botlang.workers.sharding import ConsistentHashRouter, RoundRobinRouter
+from botlang.workers.supervisor import WorkerSupervisor
+
+
+ECHO_BOT = """
+    [define echo-node
+        (bot-node (data message)
+            (node-result data (append "echo: " message) echo-node)
+        )
+    ]
+    echo-node
+"""
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+class WorkerSupervisorTestCase(unittest.TestCase):
+
+    def tearDown(self):
+
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+    def test_preforked_workers(self):
+
+        def worker_main(worker_index, compiled_bots):
+            result = compiled_bots['echo'].handle(str(worker_index))
+            return 0 if result.message == 'echo: {0}'.format(
+                worker_index
+            ) else 1
+
+        supervisor = WorkerSupervisor({'echo': ECHO_BOT}, 3, worker_main)
+        compiled_bots = supervisor.preload()
+        self.assertEqual(list(compiled_bots.keys()), ['echo'])
+
+        pids = supervisor.start()
+        self.assertEqual(len(pids), 3)
+        if hasattr(gc, 'get_freeze_count'):
+            self.assertEqual(gc.get_freeze_count(), 0)
+        self.assertEqual(list(supervisor.wait().values()), [0, 0, 0])
+
+    def test_failing_worker(self):
+
+        def worker_main(worker_index, compiled_bots):
+            raise Exception('Boom!')
+
+        supervisor = WorkerSupervisor({}, 1, worker_main)
+        supervisor.start()
+        self.assertEqual(list(supervisor.wait().values()), [1])
+
+
+class BotlangPoolTestCase(unittest.TestCase):
+
+    def test_pool_turns(self):
+
+        bank_bot = ExampleBots.bank_bot_code
+        first = BotlangSystem.bot_instance().eval_bot(bank_bot, 'hola')
+        emergency = BotlangSystem.bot_instance().eval_bot(
+            bank_bot,
+            'tengo una emergencia',
+            first.next_node,
+            first.data
+        )
+
+        with BotlangPool({'echo': ECHO_BOT, 'bank': bank_bot}, 2) as pool:
+            if hasattr(gc, 'get_freeze_count'):
+                self.assertEqual(gc.get_freeze_count(), 0)
+            self.assertEqual(pool.handle('echo', 'hi').message, 'echo: hi')
+            results = pool.handle_batch([
+                ('bank', 'tengo una emergencia', first.next_node, first.data),
+                ('echo', 'one'),
+                ('missing', 'two'),
+                ('echo', 'three', 'echo-node', {'key': 'value'})
+            ])
+            with self.assertRaises(RemoteTurnException):
+                pool.handle('echo', 'four', 'missing-node')
+
+        self.assertEqual(results[0].message, emergency.message)
+        self.assertEqual(results[0].data, emergency.data)
+        self.assertEqual(results[1].message, 'echo: one')
+        self.assertIsInstance(results[2], RemoteTurnException)
+        self.assertEqual(results[3].data, {'key': 'value'})
+        self.assertIsNone(results[3].tracked_data)
+        self.assertTrue(results[3].data_delta.is_empty())
+
+    def test_sharded_pool(self):
+
+        bots = {'echo-{0}'.format(i): ECHO_BOT for i in range(8)}
+        with BotlangPool(bots, 2) as pool:
+            shards = pool.shards()
+            for turn in range(3):
+                for bot_id in bots:
+                    pool.handle(bot_id, 'hi')
+            statistics = pool.statistics()
+            self.assertEqual(
+                {worker_id: stats['bots']
+                 for worker_id, stats in statistics.items()},
+                {worker_id: sorted(bot_ids)
+                 for worker_id, bot_ids in shards.items()}
+            )
+            self.assertEqual(
+                sum(stats['hits'] for stats in statistics.values()),
+                24
+            )
+
+            new_worker = pool.add_worker()
+            self.assertEqual(
+                pool.statistics()[new_worker]['bots'],
+                sorted(pool.shards().get(new_worker, []))
+            )
+            pool.remove_worker(new_worker)
+            self.assertEqual(
+                pool.handle('echo-0', 'again').message,
+                'echo: again'
+            )
+
+
+class RouterTestCase(unittest.TestCase):
+
+    def test_consistent_hashing(self):
+
+        keys = ['bot-{0}'.format(i) for i in range(1000)]
+        router = ConsistentHashRouter(range(4))
+        owners = {key: router.worker_for(key) for key in keys}
+        self.assertEqual(set(owners.values()), {0, 1, 2, 3})
+        self.assertEqual(
+            owners,
+            {key: ConsistentHashRouter(range(4)).worker_for(key)
+             for key in keys}
+        )
+
+        router.add_worker(4)
+        moved = [key for key in keys if router.worker_for(key) != owners[key]]
+        self.assertTrue(0 < len(moved) < 400)
+        self.assertTrue(all(router.worker_for(key) == 4 for key in moved))
+
+        router.remove_worker(4)
+        self.assertEqual(
+            owners,
+            {key: router.worker_for(key) for key in keys}
+        )
+
+    def test_round_robin(self):
+
+        router = RoundRobinRouter([0, 1, 2])
+        self.assertEqual(
+            [router.worker_for('bot') for _ in range(4)],
+            [0, 1, 2, 0]
+        )
+        with self.assertRaises(LookupError):
+            RoundRobinRouter().worker_for('bot')